@@ -4,7 +4,7 @@ import matplotlib.pyplot as plt
 import datetime
 
 from src.helpers.prism import create_clustering_df, run_clustering
-from src.helpers.crm import create_api_client, test_api_connection
+from src.helpers.crm import create_api_client, test_api_connection, assign_cluster_tags, format_duration
 from src.components.credentials import render_database_credential, render_api_key_credential, get_credential_manager
 from src.helpers.prism import validate_login
 
@@ -220,9 +220,18 @@ if "clustering_df" in st.session_state.data:
     This will:
     1. Create tags in Poool CRM for each cluster
     2. Assign the appropriate tag to each company based on their cluster
-    3. Enable segmentation and targeted analysis in Poool
+    3. Replace cluster tags from earlier runs, so each company carries exactly one cluster tag
+    4. Enable segmentation and targeted analysis in Poool
+
+    Current tags are fetched once for all companies; only companies whose tags change are updated.
     """)
 
+    clear_unassigned = st.checkbox(
+        "Remove cluster tags from companies not in this analysis",
+        value=False,
+        help="Companies outside the selected date range or data set keep old cluster tags unless this is enabled"
+    )
+
     if st.button("📤 Send Cluster Tags to Poool", type="primary"):
         # Get CRM credentials
         crm_creds = manager.get_credentials("poool_crm")
@@ -235,90 +244,61 @@ if "clustering_df" in st.session_state.data:
         )
 
         # Progress tracking
-        total_companies = df_clustered.index.nunique()
-        progress_text = "Creating cluster tags and assigning to companies..."
-        progress_bar = st.progress(0, text=progress_text)
-        progress_counter = 0
-
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        # Process each cluster
-        for i in range(st.session_state.options["num_clusters"]):
-            cluster_name = cluster_names[i]
-
-            # Create tag in Poool (won't duplicate if exists)
-            tag_id, error = client.create_tag_if_missing(
-                tag_name=f"Cluster: {cluster_name}",
-                color="#000000",
-                color_background="#f3f3f3"
+        progress_bar = st.progress(0, text="Fetching current tags and computing changes...")
+
+        def render_progress(event):
+            progress_bar.progress(
+                event.fraction,
+                text=f"Updating company {event.completed}/{event.total} "
+                     f"({event.rows_per_second:.1f}/s, ~{format_duration(event.eta_seconds)} remaining)..."
             )
 
-            if error:
-                st.error(f"❌ Failed to create tag '{cluster_name}': {error}")
-                error_count += 1
-                continue
-
-            st.info(f"✅ Created/found tag: '{cluster_name}' (ID: {tag_id})")
-
-            # Get all client IDs in this cluster
-            cluster_client_ids = df_clustered[df_clustered["cluster"] == i].index.tolist()
-
-            # Add tag to each company in the cluster
-            for client_id in cluster_client_ids:
-                progress_counter += 1
-                progress_bar.progress(
-                    progress_counter / total_companies,
-                    text=f"Processing company {progress_counter}/{total_companies}..."
-                )
-
-                try:
-                    # Fetch company
-                    company, error = client.get_company_by_id(int(client_id))
-
-                    if error:
-                        errors.append(f"Company {client_id}: {error}")
-                        error_count += 1
-                        continue
-
-                    # Add tag to tags array (if not already present)
-                    tags = company.get('tags', [])
-                    if not any(t.get('id') == tag_id for t in tags):
-                        tags.append({"id": tag_id})
-
-                        # Update company
-                        _, error = client.update_company(int(client_id), {"tags": tags})
-
-                        if error:
-                            errors.append(f"Company {client_id}: Failed to update tags - {error}")
-                            error_count += 1
-                        else:
-                            success_count += 1
-                    else:
-                        # Tag already exists
-                        success_count += 1
-
-                except Exception as e:
-                    errors.append(f"Company {client_id}: Unexpected error - {str(e)}")
-                    error_count += 1
+        assignments = {int(client_id): int(cluster) for client_id, cluster in df_clustered["cluster"].items()}
+
+        with st.spinner("Assigning cluster tags..."):
+            summary, error = assign_cluster_tags(
+                client,
+                assignments,
+                cluster_names,
+                clear_unassigned=clear_unassigned,
+                progress_callback=render_progress
+            )
 
         # Clear progress bar
         progress_bar.empty()
 
+        if error:
+            st.error(f"❌ Failed to assign cluster tags: {error}")
+            st.stop()
+
+        for i, tag_id in summary['tag_ids'].items():
+            st.info(f"✅ Created/found tag: '{cluster_names[i]}' (ID: {tag_id})")
+
+        errors = summary['errors']
+        success_count = summary['updated'] + summary['unchanged']
+        error_count = summary['failed']
+        total_companies = summary['total']
+
         # Show results
         st.markdown("---")
         st.subheader("📊 Results Summary")
 
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("✅ Successful", success_count)
+            st.metric("✅ Updated", summary['updated'])
         with col2:
-            st.metric("❌ Errors", error_count)
+            st.metric("⏭️ Already tagged", summary['unchanged'])
         with col3:
+            st.metric("❌ Errors", error_count)
+        with col4:
             success_rate = (success_count / total_companies * 100) if total_companies > 0 else 0
             st.metric("Success Rate", f"{success_rate:.1f}%")
 
+        if summary['stale_removed']:
+            st.caption(f"🧹 Removed {summary['stale_removed']} outdated cluster tags")
+        if summary['cleared']:
+            st.caption(f"🧹 Cleared cluster tags from {summary['cleared']} companies outside this analysis")
+
         if success_count > 0:
             st.success(f"🎉 Successfully tagged {success_count} companies with cluster segments!")
 
@@ -32,7 +32,8 @@ from src.components.cost_calculator import (
     create_revenue_vs_cost_chart,
     create_personnel_breakdown_chart,
     create_sensitivity_analysis_chart,
-    render_apportion_mapping
+    render_apportion_mapping,
+    render_personio_absence_import
 )
 from src.components.credentials import render_database_credential, get_credential_manager
 from src.helpers.prism.queries import get_overhead_costs_by_apportion, get_productivity_metrics
@@ -347,6 +348,12 @@ with tab1:
 
         st.markdown("---")
 
+    # Personio absence import section (optional)
+    with st.expander("🧑‍💻 Urlaubs- und Krankheitstage aus Personio übernehmen (Optional)", expanded=False):
+        st.markdown("Berechnet Ø Urlaubs- und Krankheitstage pro Abteilung/Position aus den auf der Personio-Seite "
+                    "geladenen Abwesenheiten und legt daraus Mitarbeitergruppen an.")
+        render_personio_absence_import()
+
     # Employee groups (outside form because it has buttons)
     employee_groups = render_employee_groups_form()
 
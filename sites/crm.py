@@ -6,14 +6,32 @@ from src.helpers.crm import (
     get_required_company_fields, get_optional_company_fields,
     get_required_person_fields, get_optional_person_fields,
     validate_import_data,
-    detect_tag_columns, bulk_import_companies, bulk_import_persons
+    detect_tag_columns, bulk_import_companies, bulk_import_persons,
+    detect_crm_duplicates, bulk_upsert,
+    COMPANY_UPSERT_IDENTIFIERS, PERSON_UPSERT_IDENTIFIERS, UPSERT_CREATE, UPSERT_UPDATE, UPSERT_SKIP,
+    estimate_request_budget, collapse_duplicate_rows,
+    COLLAPSE_FIRST, COLLAPSE_LAST, COLLAPSE_FAIL, COLLAPSE_POLICIES,
+    ERROR_CLASS_TRANSIENT, ERROR_CLASS_UNCERTAIN
 )
+from src.helpers.jobs import get_job_manager
+from src.helpers.export_utils import generate_filename
+from src.helpers.data_profiling import dataframe_fingerprint
 from src.helpers.mapping_utils import (
     get_current_mapping_for_field,
     export_mapping_to_json,
     import_mapping_from_json
 )
-from src.components.crm import render_environment_selector, render_api_configuration, render_wip_warning
+from src.components.crm import (
+    render_environment_selector, current_base_url, render_api_configuration, render_wip_warning,
+    get_result_store, render_result_downloads, render_retry_transient_failures, render_request_budget
+)
+from src.components.common import current_job_owner, render_job_monitor, render_job_history
+
+# Failure classes as shown in the failure table (everything else needs data fixes)
+ERROR_CLASS_LABELS = {
+    ERROR_CLASS_TRANSIENT: "Vorübergehend",
+    ERROR_CLASS_UNCERTAIN: "Unklar (im CRM prüfen)",
+}
 
 st.set_page_config(
     page_title="CRM Import",
@@ -40,6 +58,10 @@ if 'import_type' not in st.session_state:
     st.session_state.import_type = 'companies'
 if 'import_results' not in st.session_state:
     st.session_state.import_results = None
+if 'import_job_id' not in st.session_state:
+    st.session_state.import_job_id = None
+if 'crm_duplicate_candidates' not in st.session_state:
+    st.session_state.crm_duplicate_candidates = None
 if 'final_tag_mappings' not in st.session_state:
     st.session_state.final_tag_mappings = {}
 if 'mapping_file_processed' not in st.session_state:
@@ -325,81 +347,121 @@ def _render_field_mapping_section(required_fields: list, optional_fields: list,
                 st.markdown("**☑️ One-Hot-Codiert**")
                 st.code('Tag_VIP,Tag_Enterprise\n1,0\n0,1')
 
-def _execute_import_with_progress(import_type: str, row_count: int):
-    """Execute the import process with progress tracking."""
-    import time
-    start_time = time.time()
+def _submit_import_job(import_type: str, row_count: int, spill_payloads: bool = False,
+                       collapse_duplicates: bool = False, conflict_policy: str = COLLAPSE_FIRST):
+    """Submit the import as background job so it survives reruns."""
+    bulk_function = bulk_import_companies if import_type == 'companies' else bulk_import_persons
+    type_label = "Firmen" if import_type == 'companies' else "Personen"
 
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    # Show realistic progress estimates based on file size
-    if row_count > 5000:
-        status_text.text(f"🚀 Starting import of {row_count:,} rows... This may take several minutes.")
-    elif row_count > 1000:
-        status_text.text(f"🚀 Starting import of {row_count:,} rows... Estimated time: 1-2 minutes.")
-    else:
-        status_text.text(f"🚀 Starting import of {row_count:,} rows...")
+    # Only company imports merge in-file duplicates
+    collapse_settings = {}
+    if import_type == 'companies' and collapse_duplicates:
+        collapse_settings = {'collapse_duplicates': True, 'conflict_policy': conflict_policy}
 
     try:
-        status_text.text("Validating data and preparing import...")
-        progress_bar.progress(10)
-
-        if import_type == 'companies':
-            status_text.text(f"Creating {row_count} companies...")
-            progress_bar.progress(20)
-            successful, failed = bulk_import_companies(
-                st.session_state.crm_api_key,
-                st.session_state.uploaded_data,
-                st.session_state.field_mapping,
-                st.session_state.get('crm_environment', 'production'),
-                st.session_state.get('crm_custom_url'),
-                st.session_state.get('final_tag_mappings', {})
-            )
-        else:
-            status_text.text(f"Creating {row_count} persons...")
-            progress_bar.progress(20)
-            successful, failed = bulk_import_persons(
-                st.session_state.crm_api_key,
-                st.session_state.uploaded_data,
-                st.session_state.field_mapping,
-                st.session_state.get('crm_environment', 'production'),
-                st.session_state.get('crm_custom_url'),
-                st.session_state.get('final_tag_mappings', {})
-            )
-
-        progress_bar.progress(90)
-        status_text.text("Processing results...")
-
-        st.session_state.import_results = {
-            'successful': successful,
-            'failed': failed,
-            'import_type': import_type
-        }
-
-        progress_bar.progress(100)
+        # Inputs are copied so later edits on the page cannot affect the running job
+        job_id = get_job_manager().submit(
+            job_type='crm_import',
+            label=f"{type_label}-Import ({row_count:,} Zeilen)",
+            func=bulk_function,
+            kwargs={
+                'api_key': st.session_state.crm_api_key,
+                'df': st.session_state.uploaded_data.copy(),
+                'field_mapping': dict(st.session_state.field_mapping),
+                'environment': st.session_state.get('crm_environment', 'production'),
+                'custom_url': st.session_state.get('crm_custom_url'),
+                'tag_mappings': dict(st.session_state.get('final_tag_mappings', {})),
+                **collapse_settings
+            },
+            total=row_count,
+            operation_type="import",
+            entity_type=import_type,
+            spill_payloads=spill_payloads,
+            owner=current_job_owner(),
+            # Settings (without API key) and input fingerprint needed to retry failed rows later
+            metadata={
+                'bulk_settings': {
+                    'field_mapping': dict(st.session_state.field_mapping),
+                    'environment': st.session_state.get('crm_environment', 'production'),
+                    'custom_url': st.session_state.get('crm_custom_url'),
+                    'tag_mappings': dict(st.session_state.get('final_tag_mappings', {})),
+                    **collapse_settings
+                },
+                'input_fingerprint': dataframe_fingerprint(st.session_state.uploaded_data)
+            }
+        )
+    except Exception as e:
+        st.error(f"Import konnte nicht gestartet werden: {str(e)}")
+        return
 
-        # Calculate and display completion time
-        end_time = time.time()
-        duration = end_time - start_time
-        if duration > 60:
-            duration_text = f"{duration/60:.1f} minutes"
-        else:
-            duration_text = f"{duration:.1f} seconds"
+    st.session_state.import_job_id = job_id
+    st.session_state.import_results = None
+    st.rerun()
+
+
+def _run_upsert_job(**kwargs):
+    """Job wrapper around bulk_upsert that fails the job on setup errors."""
+    counts, error = bulk_upsert(**kwargs)
+    if error:
+        raise RuntimeError(error)
+    return counts
+
+
+def _submit_upsert_job(import_type: str, row_count: int, identifier_field: str,
+                       skip_unchanged: bool, dry_run: bool):
+    """Submit a create-or-update run as background job."""
+    type_label = "Firmen" if import_type == 'companies' else "Personen"
+    settings = {
+        'field_mapping': dict(st.session_state.field_mapping),
+        'identifier_field': identifier_field,
+        'entity_type': import_type,
+        'environment': st.session_state.get('crm_environment', 'production'),
+        'custom_url': st.session_state.get('crm_custom_url'),
+        'tag_mappings': dict(st.session_state.get('final_tag_mappings', {})),
+        'skip_unchanged': skip_unchanged,
+        'dry_run': dry_run
+    }
 
-        status_text.text(f"✅ Import complete! ({duration_text})")
+    try:
+        job_id = get_job_manager().submit(
+            job_type='crm_import',
+            label=f"{'Test-' if dry_run else ''}{type_label}-Upsert ({row_count:,} Zeilen)",
+            func=_run_upsert_job,
+            kwargs={
+                **settings,
+                'api_key': st.session_state.crm_api_key,
+                'df': st.session_state.uploaded_data.copy()
+            },
+            total=row_count,
+            operation_type="upsert",
+            entity_type=import_type,
+            dry_run=dry_run,
+            owner=current_job_owner(),
+            metadata={
+                'bulk_settings': settings,
+                'input_fingerprint': dataframe_fingerprint(st.session_state.uploaded_data)
+            }
+        )
+    except Exception as e:
+        st.error(f"Upsert konnte nicht gestartet werden: {str(e)}")
+        return
 
-        # Clear progress indicators after a brief pause
-        time.sleep(2)
-        progress_bar.empty()
-        status_text.empty()
+    st.session_state.import_job_id = job_id
+    st.session_state.import_results = None
+    st.rerun()
 
-        st.rerun()
 
-    except Exception as e:
-        st.error(f"Import failed: {str(e)}")
-        progress_bar.empty()
-        status_text.empty()
+def _load_import_job_results(job):
+    """Store the results of a finished import job in session state."""
+    st.session_state.import_results = {
+        'store': get_job_manager().get_result_store(job.job_id, current_job_owner()),
+        'import_type': job.entity_type,
+        'error': job.error,
+        'bulk_settings': job.metadata.get('bulk_settings'),
+        'input_fingerprint': job.metadata.get('input_fingerprint')
+    }
+    if st.session_state.get('import_job_id') == job.job_id:
+        st.session_state.import_job_id = None
 
 def _check_for_internal_duplicates(df, field_mapping: dict, import_type: str) -> list:
     """Check for potential duplicates within the uploaded data."""
@@ -453,6 +515,80 @@ def _check_for_internal_duplicates(df, field_mapping: dict, import_type: str) ->
 
     return warnings
 
+def _render_crm_duplicate_check():
+    """Match the uploaded companies against the CRM company base and show ranked candidates."""
+    with st.expander("🔎 Duplikate im CRM prüfen", expanded=st.session_state.crm_duplicate_candidates is not None):
+        st.markdown(
+            "Gleicht alle Zeilen der Datei in einem Durchgang mit den bestehenden Firmen im CRM ab "
+            "(Namensähnlichkeit, PLZ und Stadt). Alle Firmen werden dafür einmalig geladen."
+        )
+
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            threshold = st.slider(
+                "Mindest-Namensähnlichkeit",
+                min_value=0.5,
+                max_value=1.0,
+                value=0.75,
+                step=0.05,
+                help="Kosinus-Ähnlichkeit der Firmennamen (Zeichen-N-Gramme, ohne Rechtsformen wie GmbH)"
+            )
+        with col2:
+            top_k = st.number_input("Kandidaten pro Zeile", min_value=1, max_value=10, value=3)
+
+        if st.button("🔎 Mit CRM abgleichen", disabled=not st.session_state.crm_api_key):
+            with st.spinner("Lade Firmen aus dem CRM und gleiche ab..."):
+                candidates, error = detect_crm_duplicates(
+                    st.session_state.crm_api_key,
+                    st.session_state.uploaded_data,
+                    st.session_state.field_mapping,
+                    st.session_state.get('crm_environment', 'production'),
+                    st.session_state.get('crm_custom_url'),
+                    threshold=threshold,
+                    top_k=int(top_k)
+                )
+
+            if error:
+                st.error(f"❌ {error}")
+            else:
+                st.session_state.crm_duplicate_candidates = candidates
+
+        candidates = st.session_state.crm_duplicate_candidates
+        if candidates is not None:
+            if candidates.empty:
+                st.success("✅ Keine möglichen Duplikate im CRM gefunden")
+            else:
+                affected_rows = candidates['row'].nunique()
+                st.warning(f"⚠️ {affected_rows:,} Zeilen haben mögliche Duplikate im CRM ({len(candidates):,} Kandidaten)")
+
+                st.dataframe(
+                    candidates.rename(columns={
+                        'row': "Zeile",
+                        'import_name': "Name (Datei)",
+                        'import_zip': "PLZ (Datei)",
+                        'import_city': "Stadt (Datei)",
+                        'crm_id': "CRM-ID",
+                        'crm_name': "Name (CRM)",
+                        'crm_zip': "PLZ (CRM)",
+                        'crm_city': "Stadt (CRM)",
+                        'name_similarity': "Namensähnlichkeit",
+                        'zip_match': "PLZ gleich",
+                        'city_match': "Stadt gleich",
+                        'score': "Score",
+                        'rank': "Rang"
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+                st.download_button(
+                    label="📥 Kandidaten als CSV",
+                    data=candidates.to_csv(index=False),
+                    file_name=generate_filename("crm_duplicate_candidates", "csv"),
+                    mime="text/csv"
+                )
+
+
 def _display_validation_messages(validation_errors: list):
     """Display validation warnings and errors."""
     warnings = [msg for msg in validation_errors if msg.startswith("Warning:")]
@@ -672,82 +808,216 @@ if st.session_state.uploaded_data is not None:
         # Show validation warnings and errors
         _display_validation_messages(validation_errors)
 
+        # Check for potential duplicates against the CRM
+        if st.session_state.import_type == 'companies':
+            _render_crm_duplicate_check()
+
         # Only show import button if validation passes
         if is_valid:
             row_count = len(st.session_state.uploaded_data)
 
             # Show performance warning for large files
             if row_count > 5000:
-                st.warning(f"⏳ Sehr große Datei ({row_count:,} Zeilen). Import kann mehrere Minuten dauern. Bitte haben Sie Geduld und aktualisieren Sie die Seite nicht.")
+                st.warning(f"⏳ Sehr große Datei ({row_count:,} Zeilen). Import kann mehrere Minuten dauern und läuft im Hintergrund weiter.")
             elif row_count > 1000:
                 st.info(f"📊 Große Datei ({row_count:,} Zeilen). Import kann 1-2 Minuten dauern.")
             elif row_count > 500:
                 st.info(f"📊 Mittlere Datei ({row_count:,} Zeilen). Sollte in unter einer Minute fertig sein.")
 
-            if st.button(f"🚀 {st.session_state.import_type.title()} erstellen", type="primary"):
-                _execute_import_with_progress(st.session_state.import_type, row_count)
+            spill_payloads = st.checkbox(
+                "💾 Vollständige Daten pro Zeile lokal als Parquet speichern",
+                value=False,
+                help="Speichert Zeilendaten und API-Antworten auf der Festplatte statt im Arbeitsspeicher. Die Ergebnisübersicht enthält immer nur kompakte Angaben."
+            )
+
+            import_mode = st.radio(
+                "Importmodus",
+                options=["create", "upsert"],
+                format_func=lambda mode: {
+                    "create": "Nur neue Datensätze erstellen",
+                    "upsert": "Erstellen oder aktualisieren (Upsert)"
+                }[mode],
+                horizontal=True,
+                help="Upsert lädt einmalig alle bestehenden Datensätze, aktualisiert gefundene und erstellt fehlende."
+            )
+
+            if import_mode == "upsert":
+                identifier_options = (
+                    COMPANY_UPSERT_IDENTIFIERS if st.session_state.import_type == 'companies' else PERSON_UPSERT_IDENTIFIERS
+                )
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    upsert_identifier = st.selectbox(
+                        "Abgleich bestehender Datensätze über",
+                        options=identifier_options,
+                        help="Zeilen mit gefundenem Wert werden aktualisiert, alle anderen neu erstellt"
+                    )
+                with col2:
+                    upsert_skip_unchanged = st.checkbox("⏭️ Nur Änderungen senden", value=True)
+                with col3:
+                    upsert_dry_run = st.checkbox("🧪 Test-Modus", value=False)
+
+                if upsert_identifier not in st.session_state.field_mapping:
+                    st.error(f"⚠️ Bitte ordnen Sie das Identifikationsfeld '{upsert_identifier}' zu")
+                else:
+                    if not upsert_dry_run:
+                        render_request_budget(estimate_request_budget(
+                            st.session_state.uploaded_data,
+                            st.session_state.field_mapping,
+                            entity_type=st.session_state.import_type,
+                            operation="upsert",
+                            tag_mappings=st.session_state.get('final_tag_mappings', {}),
+                            identifier_field=upsert_identifier,
+                            skip_unchanged=upsert_skip_unchanged,
+                            base_url=current_base_url()
+                        ))
+
+                    if st.button(f"🚀 {row_count:,} Zeilen erstellen oder aktualisieren", type="primary"):
+                        _submit_upsert_job(st.session_state.import_type, row_count, upsert_identifier,
+                                           upsert_skip_unchanged, upsert_dry_run)
+            else:
+                collapse_duplicates = False
+                conflict_policy = COLLAPSE_FIRST
+                if st.session_state.import_type == 'companies':
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        collapse_duplicates = st.checkbox(
+                            "🧩 Doppelte Firmen in der Datei zusammenführen",
+                            value=False,
+                            help="Zeilen mit gleichem Kurznamen bzw. gleichem Namen und gleicher PLZ werden zu einer Firma "
+                                 "zusammengeführt und nur einmal erstellt. Tags werden kombiniert; das Ergebnis gilt für alle Zeilen."
+                        )
+                    with col2:
+                        conflict_policy = st.selectbox(
+                            "Bei abweichenden Werten",
+                            options=COLLAPSE_POLICIES,
+                            format_func=lambda policy: {
+                                COLLAPSE_FIRST: "Ersten Wert verwenden",
+                                COLLAPSE_LAST: "Letzten Wert verwenden",
+                                COLLAPSE_FAIL: "Firma nicht erstellen (Fehler)"
+                            }[policy],
+                            disabled=not collapse_duplicates
+                        )
+
+                budget_data = st.session_state.uploaded_data
+                budget_tag_mappings = st.session_state.get('final_tag_mappings', {})
+                if collapse_duplicates:
+                    collapsed = collapse_duplicate_rows(
+                        budget_data, st.session_state.field_mapping,
+                        st.session_state.get('final_tag_mappings', {}), conflict_policy
+                    )
+                    budget_data = collapsed.df
+                    budget_tag_mappings = collapsed.tag_mappings
+                    st.caption(f"🧩 {row_count:,} Zeilen ergeben {len(collapsed.df):,} Firmen "
+                               f"({collapsed.collapsed_count:,} Zeilen werden zusammengeführt)")
+
+                render_request_budget(estimate_request_budget(
+                    budget_data,
+                    st.session_state.field_mapping,
+                    entity_type=st.session_state.import_type,
+                    operation="import",
+                    tag_mappings=budget_tag_mappings,
+                    base_url=current_base_url()
+                ))
+
+                if st.button(f"🚀 {st.session_state.import_type.title()} erstellen", type="primary"):
+                    _submit_import_job(st.session_state.import_type, row_count, spill_payloads,
+                                       collapse_duplicates, conflict_policy)
         else:
             st.error("⚠️ Bitte beheben Sie die Validierungsfehler oben, bevor Sie importieren.")
 
+# Background import jobs
+render_job_monitor(st.session_state.import_job_id, _load_import_job_results)
+render_job_history('crm_import', _load_import_job_results)
+
 # Display import results
 # noinspection PyUnreachableCode
 if st.session_state.import_results:
     results = st.session_state.import_results
+    store = get_result_store(results, entity_type=results.get('import_type', 'companies'))
     st.subheader("📊 Import-Ergebnisse")
 
+    if results.get('error'):
+        st.error(f"⚠️ {results['error']} – die Ergebnisse unten sind unvollständig.")
+
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("✅ Erfolgreich", len(results['successful']))
+        st.metric("✅ Erfolgreich", store.success_count)
     with col2:
-        st.metric("❌ Fehlgeschlagen", len(results['failed']))
+        st.metric("❌ Fehlgeschlagen", store.failure_count)
     with col3:
-        total = len(results['successful']) + len(results['failed'])
-        success_rate = (len(results['successful']) / total * 100) if total > 0 else 0
+        total = len(store)
+        success_rate = ((store.success_count + store.skipped_count) / total * 100) if total > 0 else 0
         st.metric("Erfolgsquote", f"{success_rate:.1f}%")
 
+    # Upsert breakdown by action
+    if store.operation_type == 'upsert':
+        if store.dry_run:
+            st.warning("🧪 **TEST-MODUS ERGEBNISSE** - Es wurden keine Datensätze erstellt oder aktualisiert.")
+
+        action_counts = store.to_pandas(columns=['action'])['action'].value_counts()
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("🆕 Erstellt", int(action_counts.get(UPSERT_CREATE, 0)))
+        with col2:
+            st.metric("🔄 Aktualisiert", int(action_counts.get(UPSERT_UPDATE, 0)))
+        with col3:
+            st.metric("⏭️ Übersprungen", int(action_counts.get(UPSERT_SKIP, 0)))
+        with col4:
+            st.metric("💾 Vermiedene Schreibzugriffe", store.writes_avoided)
+
+        if store.skipped_count:
+            with st.expander(f"⏭️ Übersprungene Zeilen ({store.skipped_count:,})", expanded=False):
+                skipped_df = store.to_pandas(status='skipped', limit=500, columns=['row', 'action', 'identifier', 'warnings'])
+                st.dataframe(
+                    skipped_df.rename(columns={'row': "Zeile", 'action': "Aktion", 'identifier': "Identifikator", 'warnings': "Grund"}),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
     # Show successful imports
-    if results['successful']:
-        success_count = len(results['successful'])
+    if store.success_count:
+        success_count = store.success_count
         expanded = success_count <= 100  # Only expand by default for small results
 
         with st.expander("✅ Erfolgreiche Imports", expanded=expanded):
-            success_data = []
-
             # Limit display for large results sets
             if success_count > 1000:
                 st.info(f"📊 Großer Import ({success_count:,} erfolgreich). Zeige erste 100 zur Performance.")
-                items_to_show = results['successful'][:100]
+                display_limit = 100
             elif success_count > 500:
                 st.info(f"📊 Mittlerer Import ({success_count:,} erfolgreich). Zeige erste 200.")
-                items_to_show = results['successful'][:200]
+                display_limit = 200
             else:
-                items_to_show = results['successful']
-
-            for item in items_to_show:
-                row_info = {"Zeile": item['row']}
-                if results['import_type'] == 'companies':
-                    row_info.update({
-                        "Name": item['created'].get('name', 'N/A'),
-                        "ID": item['created'].get('id', 'N/A')
-                    })
-                else:
-                    row_info.update({
-                        "Vorname": item['created'].get('firstname', 'N/A'),
-                        "Nachname": item['created'].get('lastname', 'N/A'),
-                        "ID": item['created'].get('id', 'N/A')
-                    })
-                success_data.append(row_info)
+                display_limit = None
+
+            success_df = store.to_pandas(
+                status='success',
+                limit=display_limit,
+                columns=['row', 'action', 'entity_name', 'entity_id', 'endpoints', 'warnings']
+            )
+            name_label = "Name" if results['import_type'] == 'companies' else "Vor- und Nachname"
+            if store.operation_type != 'upsert':
+                success_df = success_df.drop(columns=['action'])
+            success_df = success_df.rename(columns={
+                'row': "Zeile",
+                'action': "Aktion",
+                'entity_name': name_label,
+                'entity_id': "ID",
+                'endpoints': "Aktiviert",
+                'warnings': "Warnungen"
+            })
 
-            if success_data:
-                st.dataframe(pd.DataFrame(success_data), use_container_width=True, hide_index=True)
+            if not success_df.empty:
+                st.dataframe(success_df, use_container_width=True, hide_index=True)
 
-                if len(items_to_show) < success_count:
-                    st.caption(f"Zeige {len(items_to_show)} von {success_count:,} erfolgreichen Imports")
+                if len(success_df) < success_count:
+                    st.caption(f"Zeige {len(success_df)} von {success_count:,} erfolgreichen Imports")
 
 
     # Show failed imports with enhanced context
-    if results['failed']:
-        failed_count = len(results['failed'])
+    if store.failure_count:
+        failed_count = store.failure_count
         expanded = failed_count <= 50  # Only expand by default for small failure sets
 
         with st.expander("❌ Fehlgeschlagene Imports", expanded=expanded):
@@ -756,13 +1026,19 @@ if st.session_state.import_results:
             # Limit display for large failure sets
             if failed_count > 100:
                 st.info(f"📊 Große Fehleranzahl ({failed_count:,} fehlgeschlagen). Zeige erste 50 zur Performance.")
-                items_to_show = results['failed'][:50]
+                display_limit = 50
             else:
-                items_to_show = results['failed']
+                display_limit = None
+
+            failed_df = store.to_pandas(
+                status='failed',
+                limit=display_limit,
+                columns=['row', 'error_code', 'error_class', 'error_message', 'data_preview']
+            )
 
             failure_data = []
-            for item in items_to_show:
-                error_msg = item['error']
+            for item in failed_df.itertuples(index=False):
+                error_msg = item.error_message or ''
                 suggestions = []
 
                 # Add contextual suggestions based on error type
@@ -774,43 +1050,37 @@ if st.session_state.import_results:
                     suggestions.append("Fügen Sie Ländervorwahl hinzu (z.B. +49 30 12345678)")
                 elif 'duplicate' in error_msg.lower():
                     suggestions.append("Dieser Datensatz existiert möglicherweise bereits im CRM")
-                elif '400' in error_msg or 'Bad Request' in error_msg:
+                elif item.error_code == 400 or 'Bad Request' in error_msg:
                     suggestions.append("Prüfen Sie Datenformat und Pflichtfelder")
-                elif '401' in error_msg or 'Unauthorized' in error_msg:
+                elif item.error_code == 401 or 'Unauthorized' in error_msg:
                     suggestions.append("Überprüfen Sie, ob der API-Schlüssel korrekt ist")
-                elif '403' in error_msg or 'Forbidden' in error_msg:
+                elif item.error_code == 403 or 'Forbidden' in error_msg:
                     suggestions.append("Prüfen Sie API-Berechtigungen")
 
-                # Show sample data from the failed row
-                sample_data = []
-                if 'data' in item and item['data']:
-                    # Show first few fields as context
-                    for k, v in list(item['data'].items())[:3]:
-                        sample_data.append(f"{k}: {v}")
-
                 failure_data.append({
-                    "Zeile": item['row'],
+                    "Zeile": item.row,
+                    "Fehlerart": ERROR_CLASS_LABELS.get(item.error_class, "Dauerhaft"),
                     "Fehler": error_msg,
-                    "Beispieldaten": " | ".join(sample_data) if sample_data else "N/A",
+                    "Beispieldaten": item.data_preview or "N/A",
                     "Vorschlag": " | ".join(suggestions) if suggestions else "Datenformat überprüfen"
                 })
 
             if failure_data:
                 st.dataframe(pd.DataFrame(failure_data), use_container_width=True, hide_index=True)
 
-                if len(items_to_show) < failed_count:
-                    st.caption(f"Zeige {len(items_to_show)} von {failed_count:,} fehlgeschlagenen Imports")
-
-                # Common error patterns summary
-                error_types = {}
-                for item in results['failed']:
-                    error = item['error']
-                    if 'Missing required field' in error:
-                        error_types['Fehlende Pflichtfelder'] = error_types.get('Fehlende Pflichtfelder', 0) + 1
-                    elif any(code in error for code in ['400', '401', '403', '500']):
-                        error_types['API-Fehler'] = error_types.get('API-Fehler', 0) + 1
-                    else:
-                        error_types['Datenformat-Probleme'] = error_types.get('Datenformat-Probleme', 0) + 1
+                if len(failure_data) < failed_count:
+                    st.caption(f"Zeige {len(failure_data)} von {failed_count:,} fehlgeschlagenen Imports")
+
+                # Common error patterns summary (computed over all failures from the compact columns)
+                all_failures = store.to_pandas(status='failed', columns=['error_code', 'error_message'])
+                missing_required = all_failures['error_message'].fillna('').str.contains('Missing required field', regex=False)
+                api_errors = ~missing_required & all_failures['error_code'].isin([400, 401, 403, 500])
+                error_types = {
+                    'Fehlende Pflichtfelder': int(missing_required.sum()),
+                    'API-Fehler': int(api_errors.sum()),
+                    'Datenformat-Probleme': int((~missing_required & ~api_errors).sum())
+                }
+                error_types = {error_type: count for error_type, count in error_types.items() if count}
 
                 if error_types:
                     st.subheader("📊 Fehlerzusammenfassung")
@@ -818,6 +1088,28 @@ if st.session_state.import_results:
                     for i, (error_type, count) in enumerate(error_types.items()):
                         cols[i].metric(error_type, count)
 
+        def _on_retry_submitted(job_id: str):
+            st.session_state.import_job_id = job_id
+            st.session_state.import_results = None
+            st.rerun()
+
+        if store.operation_type == 'upsert':
+            retry_function = _run_upsert_job
+        else:
+            retry_function = bulk_import_companies if results['import_type'] == 'companies' else bulk_import_persons
+
+        render_retry_transient_failures(
+            store,
+            st.session_state.uploaded_data,
+            retry_function,
+            results.get('bulk_settings'),
+            'crm_import',
+            _on_retry_submitted,
+            input_fingerprint=results.get('input_fingerprint')
+        )
+
+    render_result_downloads(store, f"crm_import_{results['import_type']}_results", key_prefix="import_results")
+
     if st.button("🔄 Ergebnisse löschen"):
         st.session_state.import_results = None
         st.rerun()
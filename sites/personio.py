@@ -4,11 +4,18 @@ import pandas as pd
 import json
 from datetime import datetime, timedelta
 import io
+import os
 
 from src.helpers.personio import (
     create_personio_client,
     get_employees, get_absences, get_attendances,
-    process_employees_data, process_absences_data, process_attendances_data
+    process_employees_data, process_absences_data, process_attendances_data,
+    SHARD_MONTH, SHARD_WEEK,
+    PersonioCache, sync_dataset, DATASET_EMPLOYEES, DATASET_ABSENCES, DATASET_ATTENDANCES,
+    CACHE_RETENTION, cache_path, remove_cache, purge_expired
+)
+from src.helpers.data_profiling import (
+    profile_columns, PROFILE_NON_EMPTY, PROFILE_EMPTY, PROFILE_DISTINCT, PROFILE_DTYPE
 )
 
 # Page configuration
@@ -32,17 +39,93 @@ if 'absences_df' not in st.session_state:
     st.session_state.absences_df = None
 if 'absences_column_mapping' not in st.session_state:
     st.session_state.absences_column_mapping = {}
+if 'absences_date_range' not in st.session_state:
+    st.session_state.absences_date_range = (None, None)
 if 'attendances_df' not in st.session_state:
     st.session_state.attendances_df = None
 if 'attendances_column_mapping' not in st.session_state:
     st.session_state.attendances_column_mapping = {}
+if 'personio_sync_info' not in st.session_state:
+    st.session_state.personio_sync_info = {}
+if 'personio_pull_info' not in st.session_state:
+    st.session_state.personio_pull_info = {}
 
 
 def is_client_valid():
-    """Check if the current Personio client is still valid"""
+    """Check if the current Personio client is still valid (renews an expiring token)"""
     if not st.session_state.personio_client:
         return False
-    return st.session_state.personio_client.is_token_valid()
+    return st.session_state.personio_client.ensure_token() is None
+
+
+def fetch_with_cache(dataset, fetch_direct, start_date=None, end_date=None, shard_by=None):
+    """Fetch a dataset through the local cache (delta sync) if enabled, otherwise directly"""
+    client = st.session_state.personio_client
+
+    if not st.session_state.get('use_personio_cache', False):
+        st.session_state.personio_sync_info.pop(dataset, None)
+        data, error = fetch_direct()
+    else:
+        data, stats, error = sync_dataset(
+            client, PersonioCache(client.client_id), dataset, start_date, end_date, shard_by,
+            full=st.session_state.get('personio_full_sync', False)
+        )
+        if not error:
+            if stats['mode'] == 'delta':
+                st.session_state.personio_sync_info[dataset] = (
+                    f"🔄 Abgleich: {stats['fetched']:,} geänderte Datensätze abgerufen, {stats['total']:,} im lokalen Cache"
+                )
+            else:
+                st.session_state.personio_sync_info[dataset] = (
+                    f"📥 Vollständig abgerufen: {stats['total']:,} Datensätze im lokalen Cache gespeichert"
+                )
+
+    pull = client.pull_stats()
+    st.session_state.personio_pull_info[dataset] = (
+        f"⏱️ {pull['requests']:,} Anfragen in {pull['elapsed_seconds']:.1f} s "
+        f"({pull['requests_per_second']:.1f}/s), {pull['retries']:,} Wiederholungen, "
+        f"{pull['wait_seconds']:.1f} s Wartezeit (Rate-Limit/Backoff)"
+    )
+    return data, error
+
+
+def render_sync_info(dataset):
+    """Show how the last fetch of a dataset was served"""
+    info = st.session_state.personio_sync_info.get(dataset)
+    if info:
+        st.caption(info)
+    pull_info = st.session_state.personio_pull_info.get(dataset)
+    if pull_info:
+        st.caption(pull_info)
+
+
+def render_column_mapping(df, column_mapping):
+    """Show the API field to column mapping with fill rate, distinct values and dtype per column"""
+    st.write("Diese Tabelle zeigt die Zuordnung von API-Feldern zu DataFrame-Spalten:")
+    mapping_df = pd.DataFrame.from_dict(
+        column_mapping,
+        orient='index',
+        columns=['DataFrame-Spalte']
+    ).reset_index().rename(columns={'index': 'API-Feld'})
+
+    # Profile is cached by DataFrame content, so reruns do not recompute it
+    profile = profile_columns(df)
+    mapping_df = mapping_df.join(profile, on='DataFrame-Spalte')
+    count_columns = [PROFILE_NON_EMPTY, PROFILE_EMPTY, PROFILE_DISTINCT]
+    mapping_df[count_columns] = mapping_df[count_columns].fillna(0).astype(int)
+    mapping_df[PROFILE_DTYPE] = mapping_df[PROFILE_DTYPE].fillna('')
+    st.dataframe(mapping_df, use_container_width=True, hide_index=True)
+
+
+def render_shard_selector(key: str):
+    """Select the window size for fetching long date ranges"""
+    return st.selectbox(
+        "Abruf in Zeitfenstern",
+        options=[SHARD_MONTH, SHARD_WEEK, None],
+        format_func=lambda shard: {SHARD_MONTH: "Monatsweise", SHARD_WEEK: "Wochenweise", None: "Als eine Abfrage"}[shard],
+        help="Lange Zeiträume werden in Fenster aufgeteilt und parallel abgerufen. Nur wirksam, wenn Start- und Enddatum gesetzt sind.",
+        key=key
+    )
 
 
 def create_excel_download(df):
@@ -96,15 +179,57 @@ if st.session_state.personio_client:
     if is_client_valid():
         time_left = st.session_state.personio_client.token_expires_at - datetime.now()
         minutes_left = int(time_left.total_seconds() / 60)
-        st.success(f"🟢 Token ist gültig (läuft in {minutes_left} Minuten ab)")
+        st.success(f"🟢 Token ist gültig (läuft in {minutes_left} Minuten ab, wird automatisch erneuert)")
     else:
-        st.error("🔴 Token has expired - please re-authenticate")
+        st.error("🔴 Token konnte nicht erneuert werden - bitte erneut authentifizieren")
         st.session_state.personio_client = None
 
 st.markdown("---")
 
 # Main Tabs
 if st.session_state.personio_client and is_client_valid():
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        st.checkbox(
+            "💾 Lokalen Cache verwenden (nur Änderungen abrufen)",
+            value=False,
+            key="use_personio_cache",
+            help="Speichert abgerufene Daten lokal pro Client-ID. Weitere Abrufe laden nur seit dem letzten Abruf geänderte Datensätze."
+        )
+    with col2:
+        st.checkbox(
+            "Vollständig neu laden",
+            value=False,
+            key="personio_full_sync",
+            help="Ignoriert den Cache und lädt alle Daten neu (entfernt auch in Personio gelöschte Datensätze aus dem Cache)."
+        )
+    with col3:
+        if st.button("🗑️ Cache leeren", use_container_width=True):
+            remove_cache(st.session_state.personio_client.client_id)
+            st.session_state.personio_sync_info = {}
+            st.success("Lokaler Cache geleert")
+
+    # Expired cache files are deleted even while the cache is disabled
+    purge_expired()
+    if st.session_state.use_personio_cache:
+        st.caption(
+            f"⚠️ Mitarbeiter-, Abwesenheits- und Anwesenheitsdaten (inkl. Krankheitstagen) werden unverschlüsselt in "
+            f"`{os.path.abspath(cache_path(st.session_state.personio_client.client_id))}` gespeichert und "
+            f"{CACHE_RETENTION.days} Tage nach dem letzten Abruf automatisch gelöscht."
+        )
+
+    # Restore employees from the local cache after a reload
+    if st.session_state.employees_df is None and st.session_state.get('use_personio_cache', False):
+        cached_employees = PersonioCache(st.session_state.personio_client.client_id).load(DATASET_EMPLOYEES)
+        if cached_employees:
+            df, column_mapping, process_error = process_employees_data({'data': cached_employees})
+            if not process_error:
+                st.session_state.employees_df = df
+                st.session_state.employees_column_mapping = column_mapping
+                st.session_state.personio_sync_info[DATASET_EMPLOYEES] = (
+                    f"💾 {len(cached_employees):,} Mitarbeiter aus dem lokalen Cache geladen"
+                )
+
     tab1, tab2, tab3 = st.tabs(["👥 Mitarbeiter", "🏖️ Abwesenheiten", "⏰ Anwesenheiten"])
 
     # ========== TAB 1: EMPLOYEES ==========
@@ -113,7 +238,10 @@ if st.session_state.personio_client and is_client_valid():
 
         if st.button("📥 Mitarbeiter abrufen", type="secondary", key="fetch_employees"):
             with st.spinner("Hole Mitarbeiterdaten..."):
-                employees_data, error = get_employees(st.session_state.personio_client)
+                employees_data, error = fetch_with_cache(
+                    DATASET_EMPLOYEES,
+                    lambda: get_employees(st.session_state.personio_client)
+                )
 
                 if error:
                     st.error(f"Fehler beim Abrufen der Mitarbeiter: {error}")
@@ -128,36 +256,11 @@ if st.session_state.personio_client and is_client_valid():
                         st.rerun()
 
         if st.session_state.employees_df is not None:
+            render_sync_info(DATASET_EMPLOYEES)
+
             # Column mapping info
             with st.expander("📋 Spaltenzuordnung", expanded=False):
-                st.write("Diese Tabelle zeigt die Zuordnung von API-Feldern zu DataFrame-Spalten:")
-                mapping_df = pd.DataFrame.from_dict(
-                    st.session_state.employees_column_mapping,
-                    orient='index',
-                    columns=['DataFrame-Spalte']
-                ).reset_index().rename(columns={'index': 'API-Feld'})
-
-                # Count not null and not empty values per column in mapping
-                not_null_not_empty = []
-                null_or_empty = []
-
-                for _, row in mapping_df.iterrows():
-                    col_name = row['DataFrame-Spalte']
-                    if col_name in st.session_state.employees_df.columns:
-                        col_data = st.session_state.employees_df[col_name]
-                        not_null_not_empty.append(
-                            ((col_data.notnull()) & (col_data.astype(str).str.strip() != '')).sum()
-                        )
-                        null_or_empty.append(
-                            ((col_data.isnull()) | (col_data.astype(str).str.strip() == '')).sum()
-                        )
-                    else:
-                        not_null_not_empty.append(0)
-                        null_or_empty.append(0)
-
-                mapping_df['Nicht-leer Anzahl'] = not_null_not_empty
-                mapping_df['Leer Anzahl'] = null_or_empty
-                st.dataframe(mapping_df, use_container_width=True, hide_index=True)
+                render_column_mapping(st.session_state.employees_df, st.session_state.employees_column_mapping)
 
             # Display metrics
             st.markdown("#### 📊 Datenübersicht")
@@ -217,16 +320,23 @@ if st.session_state.personio_client and is_client_valid():
                 help="Abwesenheiten bis zu diesem Datum filtern"
             )
 
+        shard_by = render_shard_selector("absences_shard_by")
+
         # Format dates for API
         start_date_str = start_date.strftime('%Y-%m-%d') if start_date else None
         end_date_str = end_date.strftime('%Y-%m-%d') if end_date else None
 
         if st.button("📥 Abwesenheiten abrufen", type="secondary", key="fetch_absences"):
             with st.spinner("Hole Abwesenheitsdaten..."):
-                absences_data, error = get_absences(
-                    st.session_state.personio_client,
-                    start_date=start_date_str,
-                    end_date=end_date_str
+                absences_data, error = fetch_with_cache(
+                    DATASET_ABSENCES,
+                    lambda: get_absences(
+                        st.session_state.personio_client,
+                        start_date=start_date_str,
+                        end_date=end_date_str,
+                        shard_by=shard_by
+                    ),
+                    start_date_str, end_date_str, shard_by
                 )
 
                 if error:
@@ -239,39 +349,16 @@ if st.session_state.personio_client and is_client_valid():
                     else:
                         st.session_state.absences_df = df
                         st.session_state.absences_column_mapping = column_mapping
+                        # Requested range (None: open), used to annualize absences in the cost calculator
+                        st.session_state.absences_date_range = (start_date, end_date)
                         st.rerun()
 
         if st.session_state.absences_df is not None:
+            render_sync_info(DATASET_ABSENCES)
+
             # Column mapping info
             with st.expander("📋 Spaltenzuordnung", expanded=False):
-                st.write("Diese Tabelle zeigt die Zuordnung von API-Feldern zu DataFrame-Spalten:")
-                mapping_df = pd.DataFrame.from_dict(
-                    st.session_state.absences_column_mapping,
-                    orient='index',
-                    columns=['DataFrame-Spalte']
-                ).reset_index().rename(columns={'index': 'API-Feld'})
-
-                # Count not null and not empty values per column in mapping
-                not_null_not_empty = []
-                null_or_empty = []
-
-                for _, row in mapping_df.iterrows():
-                    col_name = row['DataFrame-Spalte']
-                    if col_name in st.session_state.absences_df.columns:
-                        col_data = st.session_state.absences_df[col_name]
-                        not_null_not_empty.append(
-                            ((col_data.notnull()) & (col_data.astype(str).str.strip() != '')).sum()
-                        )
-                        null_or_empty.append(
-                            ((col_data.isnull()) | (col_data.astype(str).str.strip() == '')).sum()
-                        )
-                    else:
-                        not_null_not_empty.append(0)
-                        null_or_empty.append(0)
-
-                mapping_df['Nicht-leer Anzahl'] = not_null_not_empty
-                mapping_df['Leer Anzahl'] = null_or_empty
-                st.dataframe(mapping_df, use_container_width=True, hide_index=True)
+                render_column_mapping(st.session_state.absences_df, st.session_state.absences_column_mapping)
 
             # Display metrics
             st.markdown("#### 📊 Datenübersicht")
@@ -335,16 +422,23 @@ if st.session_state.personio_client and is_client_valid():
                 key="att_end_date"
             )
 
+        att_shard_by = render_shard_selector("attendances_shard_by")
+
         # Format dates for API
         att_start_date_str = att_start_date.strftime('%Y-%m-%d') if att_start_date else None
         att_end_date_str = att_end_date.strftime('%Y-%m-%d') if att_end_date else None
 
         if st.button("📥 Anwesenheiten abrufen", type="secondary", key="fetch_attendances"):
             with st.spinner("Hole Anwesenheitsdaten..."):
-                attendances_data, error = get_attendances(
-                    st.session_state.personio_client,
-                    start_date=att_start_date_str,
-                    end_date=att_end_date_str
+                attendances_data, error = fetch_with_cache(
+                    DATASET_ATTENDANCES,
+                    lambda: get_attendances(
+                        st.session_state.personio_client,
+                        start_date=att_start_date_str,
+                        end_date=att_end_date_str,
+                        shard_by=att_shard_by
+                    ),
+                    att_start_date_str, att_end_date_str, att_shard_by
                 )
 
                 if error:
@@ -360,36 +454,11 @@ if st.session_state.personio_client and is_client_valid():
                         st.rerun()
 
         if st.session_state.attendances_df is not None:
+            render_sync_info(DATASET_ATTENDANCES)
+
             # Column mapping info
             with st.expander("📋 Spaltenzuordnung", expanded=False):
-                st.write("Diese Tabelle zeigt die Zuordnung von API-Feldern zu DataFrame-Spalten:")
-                mapping_df = pd.DataFrame.from_dict(
-                    st.session_state.attendances_column_mapping,
-                    orient='index',
-                    columns=['DataFrame-Spalte']
-                ).reset_index().rename(columns={'index': 'API-Feld'})
-
-                # Count not null and not empty values per column in mapping
-                not_null_not_empty = []
-                null_or_empty = []
-
-                for _, row in mapping_df.iterrows():
-                    col_name = row['DataFrame-Spalte']
-                    if col_name in st.session_state.attendances_df.columns:
-                        col_data = st.session_state.attendances_df[col_name]
-                        not_null_not_empty.append(
-                            ((col_data.notnull()) & (col_data.astype(str).str.strip() != '')).sum()
-                        )
-                        null_or_empty.append(
-                            ((col_data.isnull()) | (col_data.astype(str).str.strip() == '')).sum()
-                        )
-                    else:
-                        not_null_not_empty.append(0)
-                        null_or_empty.append(0)
-
-                mapping_df['Nicht-leer Anzahl'] = not_null_not_empty
-                mapping_df['Leer Anzahl'] = null_or_empty
-                st.dataframe(mapping_df, use_container_width=True, hide_index=True)
+                render_column_mapping(st.session_state.attendances_df, st.session_state.attendances_column_mapping)
 
             # Display metrics
             st.markdown("#### 📊 Datenübersicht")
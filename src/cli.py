@@ -0,0 +1,182 @@
+"""
+Headless command-line runner for CRM imports and updates.
+
+Runs the same bulk functions as the Streamlit pages without a browser
+session, so large migrations can run on a server:
+
+    python -m src.cli import companies firmen.csv --mapping mapping.json --output ergebnisse.parquet
+    python -m src.cli update persons personen.xlsx --mapping mapping.json --identifier email --dry-run
+
+The mapping file is the JSON exported from the import/update pages. The API
+key is read from --api-key or the POOOL_API_KEY environment variable.
+Outcomes are written via ResultStore (Parquet or CSV by file extension).
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+import pandas as pd
+
+from src.helpers.crm import (
+    create_api_client,
+    bulk_import_generic,
+    bulk_update_companies,
+    bulk_update_persons,
+    ResultStore,
+    ProgressEvent,
+    format_duration,
+    COLLAPSE_FIRST,
+    COLLAPSE_POLICIES,
+)
+from src.helpers.crm.update_operations import UPDATE_MAX_WORKERS
+from src.helpers.mapping_utils import import_mapping_from_json
+
+# Exit codes
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_ROWS_FAILED = 2
+
+
+def read_input_file(path: str) -> pd.DataFrame:
+    """
+    Read an input file as strings (same dtype handling as the upload pages).
+
+    Args:
+        path: Path to a CSV or Excel file
+
+    Returns:
+        DataFrame with all columns as strings
+    """
+    if path.lower().endswith(('.xlsx', '.xls')):
+        return pd.read_excel(path, dtype=str)
+    return pd.read_csv(path, dtype=str)
+
+
+def print_progress(event: ProgressEvent) -> None:
+    """Print a single, overwritten progress line to stderr."""
+    sys.stderr.write(
+        f"\r{event.completed:,}/{event.total:,} Zeilen "
+        f"(✅ {event.successful:,} | ❌ {event.failed:,}) · "
+        f"{event.rows_per_second:.1f} Zeilen/s · "
+        f"verbleibend ca. {format_duration(event.eta_seconds)}   "
+    )
+    if event.finished:
+        sys.stderr.write("\n")
+    sys.stderr.flush()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser with the import and update subcommands."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="CRM-Import und -Aktualisierung ohne Browser ausführen"
+    )
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("entity_type", choices=["companies", "persons"], help="Firmen oder Personen")
+    common.add_argument("file", help="Eingabedatei (CSV oder Excel)")
+    common.add_argument("--mapping", required=True, help="Zuordnungs-JSON (Export der Import-/Update-Seite)")
+    common.add_argument("--env", default="production", choices=["production", "staging", "custom"],
+                        help="API-Umgebung (Standard: production)")
+    common.add_argument("--url", default=None, help="Basis-URL bei --env custom")
+    common.add_argument("--api-key", default=None, help="API-Schlüssel (Standard: POOOL_API_KEY)")
+    common.add_argument("--output", default=None,
+                        help="Ergebnisdatei (.parquet oder .csv, Standard: <modus>_<typ>_<zeitstempel>.parquet)")
+    common.add_argument("--quiet", action="store_true", help="Keine Fortschrittsanzeige")
+
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    import_parser = subparsers.add_parser("import", parents=[common], help="Neue Datensätze importieren")
+    import_parser.add_argument("--collapse-duplicates", action="store_true",
+                               help="Doppelte Firmen in der Datei zusammenführen und nur einmal erstellen")
+    import_parser.add_argument("--conflict-policy", default=COLLAPSE_FIRST, choices=COLLAPSE_POLICIES,
+                               help=f"Umgang mit abweichenden Werten beim Zusammenführen (Standard: {COLLAPSE_FIRST})")
+
+    update = subparsers.add_parser("update", parents=[common], help="Bestehende Datensätze aktualisieren")
+    update.add_argument("--identifier", required=True,
+                        help="API-Feld zum Abgleich (z.B. id, name, customer_number, email)")
+    update.add_argument("--dry-run", action="store_true", help="Nur simulieren, keine Schreibzugriffe")
+    update.add_argument("--skip-unchanged", action="store_true",
+                        help="Nur geänderte Felder senden, unveränderte Zeilen überspringen")
+    update.add_argument("--workers", type=int, default=UPDATE_MAX_WORKERS,
+                        help=f"Parallel verarbeitete Zeilen (Standard: {UPDATE_MAX_WORKERS})")
+
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run an import or update from parsed arguments.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    api_key = args.api_key or os.environ.get("POOOL_API_KEY")
+    if not api_key:
+        print("Fehler: Kein API-Schlüssel angegeben (--api-key oder POOOL_API_KEY)", file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        df = read_input_file(args.file)
+    except Exception as e:
+        print(f"Fehler beim Lesen der Datei: {str(e)}", file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        with open(args.mapping, encoding="utf-8") as f:
+            mapping_json = f.read()
+    except OSError as e:
+        print(f"Fehler beim Lesen der Zuordnung: {str(e)}", file=sys.stderr)
+        return EXIT_ERROR
+
+    config, messages = import_mapping_from_json(mapping_json, list(df.columns))
+    for message in messages:
+        print(message, file=sys.stderr)
+
+    field_mapping = config['field_mapping']
+    if not field_mapping:
+        print("Fehler: Keine gültigen Feldzuordnungen für diese Datei", file=sys.stderr)
+        return EXIT_ERROR
+
+    tag_mappings = {**config['final_tag_mappings'], **config['manual_tag_mappings']}
+    dry_run = getattr(args, 'dry_run', False)
+    output = args.output or f"{args.mode}_{args.entity_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+    progress_callback = None if args.quiet else print_progress
+
+    store = ResultStore(operation_type=args.mode, entity_type=args.entity_type, dry_run=dry_run)
+    print(f"{len(df):,} Zeilen aus {args.file} ({args.mode}, {args.entity_type}, {args.env})", file=sys.stderr)
+
+    if args.mode == "import":
+        client = create_api_client(api_key, args.env, args.url)
+        bulk_import_generic(client, df, field_mapping, args.entity_type, tag_mappings or None,
+                            result_store=store, progress_callback=progress_callback,
+                            collapse_duplicates=args.collapse_duplicates, conflict_policy=args.conflict_policy)
+    else:
+        bulk_update = bulk_update_companies if args.entity_type == "companies" else bulk_update_persons
+        bulk_update(api_key, df, field_mapping, args.identifier, args.env, args.url,
+                    dry_run=dry_run, result_store=store, progress_callback=progress_callback,
+                    skip_unchanged=args.skip_unchanged, max_workers=args.workers)
+
+    store.write(output)
+
+    print(
+        f"Erfolgreich: {store.success_count:,} | Unverändert: {store.skipped_count:,} | "
+        f"Fehlgeschlagen: {store.failure_count:,} → {output}",
+        file=sys.stderr
+    )
+    return EXIT_ROWS_FAILED if store.failure_count else EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,12 @@ from .session_state_manager import (
     get_state_config,
     init_global_crm_state,
 )
+from .job_monitor import (
+    current_job_owner,
+    render_job_progress,
+    render_job_monitor,
+    render_job_history,
+)
 
 __all__ = [
     # Sidebar
@@ -25,4 +31,10 @@ __all__ = [
     'clear_page_state',
     'get_state_config',
     'init_global_crm_state',
+
+    # Background jobs
+    'current_job_owner',
+    'render_job_progress',
+    'render_job_monitor',
+    'render_job_history',
 ]
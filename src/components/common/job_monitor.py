@@ -0,0 +1,132 @@
+"""
+Background Job Monitor Components
+
+Polls background jobs from the JobManager and renders their progress without
+blocking the page. Uses Streamlit fragments, so only the monitor reruns while
+a job is active. Only jobs submitted with the session's CRM API key are shown.
+"""
+
+import streamlit as st
+from datetime import datetime
+from typing import Callable, Optional
+
+from ...helpers.crm.progress import format_duration
+from ...helpers.jobs import Job, JobStatus, get_job_manager, job_owner
+
+# Seconds between two status polls of a running job
+JOB_POLL_INTERVAL = 2
+
+STATUS_LABELS = {
+    JobStatus.QUEUED: "⏳ In Warteschlange",
+    JobStatus.RUNNING: "🔄 Läuft",
+    JobStatus.COMPLETED: "✅ Abgeschlossen",
+    JobStatus.FAILED: "❌ Fehlgeschlagen",
+}
+
+
+def current_job_owner() -> Optional[str]:
+    """
+    Owner ID of the jobs of the current session.
+
+    Returns:
+        Hash of the session's CRM API key, or None if no key is set
+    """
+    return job_owner(st.session_state.get('crm_api_key'))
+
+
+def render_job_progress(job: Job):
+    """
+    Render the current status and progress of a job.
+
+    Args:
+        job: Job to render
+    """
+    st.markdown(f"**{job.label}** · {STATUS_LABELS[job.status]}")
+
+    event = job.progress
+    if event is None:
+        st.progress(0.0)
+        st.caption("Warte auf einen freien Worker..." if job.status == JobStatus.QUEUED else "Job wird vorbereitet...")
+        return
+
+    st.progress(event.fraction)
+    st.caption(
+        f"{event.completed:,}/{event.total:,} Zeilen "
+        f"(✅ {event.successful:,} | ❌ {event.failed:,}) · "
+        f"{event.rows_per_second:.1f} Zeilen/s · "
+        f"verbleibend ca. {format_duration(event.eta_seconds)}"
+    )
+
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def _job_monitor_fragment(job_id: str, on_finished: Callable[[Job], None]):
+    """Fragment that polls a job and triggers a full rerun once it finished."""
+    job = get_job_manager().get_job(job_id, current_job_owner())
+
+    if job is None:
+        st.warning(f"Job {job_id} nicht gefunden")
+        return
+
+    render_job_progress(job)
+
+    if not job.status.is_active:
+        on_finished(job)
+        st.rerun()
+
+
+def render_job_monitor(job_id: Optional[str], on_finished: Callable[[Job], None]):
+    """
+    Render a self-refreshing monitor for a background job.
+
+    The page stays interactive while the job runs. Once the job is finished,
+    `on_finished` is called with the job and the page is rerun.
+
+    Args:
+        job_id: ID of the job to monitor (nothing is rendered if None)
+        on_finished: Callback that receives the finished job (e.g. to store results in session state)
+    """
+    if not job_id:
+        return
+
+    st.info("🧵 Der Job läuft im Hintergrund. Sie können die Seite weiter benutzen.")
+    _job_monitor_fragment(job_id, on_finished)
+
+
+def render_job_history(job_type: str, on_select: Callable[[Job], None], limit: int = 10):
+    """
+    Render a list of the session's recent jobs of a type with buttons to load finished results.
+
+    Args:
+        job_type: Job type to list (e.g. "crm_import")
+        on_select: Callback that receives the selected finished job
+        limit: Maximum number of jobs to list
+    """
+    jobs = get_job_manager().list_jobs(current_job_owner(), job_type, limit=limit)
+    if not jobs:
+        return
+
+    active_count = sum(1 for job in jobs if job.status.is_active)
+    title = f"🗂️ Hintergrund-Jobs ({active_count} aktiv)" if active_count else "🗂️ Hintergrund-Jobs"
+
+    with st.expander(title, expanded=False):
+        for job in jobs:
+            col1, col2, col3 = st.columns([3, 2, 1])
+
+            with col1:
+                created = datetime.fromtimestamp(job.created_at).strftime('%d.%m.%Y %H:%M')
+                st.markdown(f"**{job.label}**  \n`{job.job_id}` · {created}")
+
+            with col2:
+                status_text = STATUS_LABELS[job.status]
+                if job.progress and job.status.is_active:
+                    status_text += f" ({job.progress.fraction * 100:.0f}%)"
+                elif job.duration is not None and not job.status.is_active:
+                    status_text += f" ({format_duration(job.duration)})"
+                st.markdown(status_text)
+                if job.error:
+                    st.caption(job.error)
+
+            with col3:
+                if st.button("Anzeigen", key=f"show_job_{job.job_id}", disabled=job.status.is_active):
+                    on_select(job)
+                    st.rerun()
@@ -16,13 +16,15 @@ STATE_CONFIGS = {
         'field_mapping': {},
         'identifier_field': 'id',
         'update_results': None,
-        'preview_results': None
+        'preview_results': None,
+        'update_job_id': None
     },
     'import_page': {
         'uploaded_data': None,
         'field_mapping': {},
         'import_type': 'companies',
         'import_results': None,
+        'import_job_id': None,
         'final_tag_mappings': {},
         'manual_tag_mappings': {},
         'mapping_file_processed': False
@@ -33,6 +35,7 @@ STATE_CONFIGS = {
         'employees_column_mapping': {},
         'absences_df': None,
         'absences_column_mapping': {},
+        'absences_date_range': (None, None),
         'attendances_df': None,
         'attendances_column_mapping': {}
     },
@@ -19,6 +19,8 @@ from .ui import (
     create_personnel_breakdown_chart,
     create_sensitivity_analysis_chart,
     render_apportion_mapping,
+    render_personio_absence_import,
+    apply_absence_groups,
 )
 
 __all__ = [
@@ -36,4 +38,6 @@ __all__ = [
     'create_personnel_breakdown_chart',
     'create_sensitivity_analysis_chart',
     'render_apportion_mapping',
+    'render_personio_absence_import',
+    'apply_absence_groups',
 ]
@@ -9,12 +9,28 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
+from datetime import date
 from typing import List, Dict, Optional, Tuple
 from src.helpers.cost_calculator import (
     EmployeeGroup,
     OverheadCosts,
     PricingParameters
 )
+from src.helpers.personio import (
+    GROUP_BY_DEPARTMENT,
+    GROUP_BY_POSITION,
+    absence_types,
+    absence_date_range,
+    default_absence_types,
+    aggregate_absences,
+)
+from src.helpers.personio.absence_aggregation import (
+    COLUMN_DEPARTMENT,
+    COLUMN_POSITION,
+    COLUMN_EMPLOYEE_COUNT,
+    COLUMN_AVG_VACATION_DAYS,
+    COLUMN_AVG_SICK_DAYS,
+)
 
 
 # ============================================================================
@@ -69,6 +85,25 @@ def render_basic_parameters() -> Dict:
     }
 
 
+def _group_keys(idx: int) -> List[str]:
+    """Session state keys of the widgets of one employee group"""
+    return [f'group_name_{idx}', f'group_count_{idx}', f'group_salary_{idx}',
+            f'group_social_{idx}', f'group_special_{idx}', f'group_vacation_{idx}',
+            f'group_sick_{idx}', f'group_productivity_{idx}']
+
+
+def _init_group_state(idx: int, name: str, count: int = 1, vacation_days: int = 30, sick_days: int = 10):
+    """Set the widget values of an employee group (defaults for everything not given)"""
+    st.session_state[f'group_name_{idx}'] = name
+    st.session_state[f'group_count_{idx}'] = count
+    st.session_state[f'group_salary_{idx}'] = 50000.0
+    st.session_state[f'group_social_{idx}'] = 20.0
+    st.session_state[f'group_special_{idx}'] = 0.0
+    st.session_state[f'group_vacation_{idx}'] = vacation_days
+    st.session_state[f'group_sick_{idx}'] = sick_days
+    st.session_state[f'group_productivity_{idx}'] = 75.0
+
+
 def render_employee_groups_form() -> List[EmployeeGroup]:
     """
     Render dynamic form for employee groups with add/remove functionality
@@ -84,14 +119,7 @@ def render_employee_groups_form() -> List[EmployeeGroup]:
     if 'employee_groups_count' not in st.session_state:
         st.session_state.employee_groups_count = 1
         # Initialize first group with defaults
-        st.session_state['group_name_0'] = 'Beispielgruppe'
-        st.session_state['group_count_0'] = 1
-        st.session_state['group_salary_0'] = 50000.0
-        st.session_state['group_social_0'] = 20.0
-        st.session_state['group_special_0'] = 0.0
-        st.session_state['group_vacation_0'] = 30
-        st.session_state['group_sick_0'] = 10
-        st.session_state['group_productivity_0'] = 75.0
+        _init_group_state(0, 'Beispielgruppe')
 
     groups_list = []
 
@@ -116,9 +144,7 @@ def render_employee_groups_form() -> List[EmployeeGroup]:
             with col2:
                 if st.button("🗑️ Löschen", key=f"delete_{idx}", type="secondary"):
                     # Remove all keys for this group
-                    for key in [f'group_name_{idx}', f'group_count_{idx}', f'group_salary_{idx}',
-                               f'group_social_{idx}', f'group_special_{idx}', f'group_vacation_{idx}',
-                               f'group_sick_{idx}', f'group_productivity_{idx}']:
+                    for key in _group_keys(idx):
                         if key in st.session_state:
                             del st.session_state[key]
                     st.rerun()
@@ -214,14 +240,7 @@ def render_employee_groups_form() -> List[EmployeeGroup]:
         idx = st.session_state.employee_groups_count
         st.session_state.employee_groups_count += 1
         # Initialize new group with defaults
-        st.session_state[f'group_name_{idx}'] = f'Gruppe {idx + 1}'
-        st.session_state[f'group_count_{idx}'] = 1
-        st.session_state[f'group_salary_{idx}'] = 50000.0
-        st.session_state[f'group_social_{idx}'] = 20.0
-        st.session_state[f'group_special_{idx}'] = 0.0
-        st.session_state[f'group_vacation_{idx}'] = 30
-        st.session_state[f'group_sick_{idx}'] = 10
-        st.session_state[f'group_productivity_{idx}'] = 75.0
+        _init_group_state(idx, f'Gruppe {idx + 1}')
         st.rerun()
 
     return groups_list
@@ -1021,3 +1040,107 @@ def render_apportion_mapping(available_apportion: List[str]) -> Dict[str, List[s
         st.info("Diese Werte werden bei der Zuordnung ignoriert. Sie können sie der Kategorie 'Sonstige Kosten' zuordnen.")
 
     return mapping
+
+
+def apply_absence_groups(per_group: pd.DataFrame, replace: bool = True):
+    """
+    Create employee groups from aggregated Personio absences.
+
+    Each group row becomes an employee group named after its department
+    and/or position, with employee count, vacation and sick days pre-filled
+    (salary and other values use the defaults).
+
+    Args:
+        per_group: Group table from aggregate_absences
+        replace: Remove the existing groups first
+    """
+    if replace:
+        for idx in range(st.session_state.get('employee_groups_count', 0)):
+            for key in _group_keys(idx):
+                st.session_state.pop(key, None)
+        st.session_state.employee_groups_count = 0
+    else:
+        st.session_state.setdefault('employee_groups_count', 0)
+
+    label_columns = [c for c in (COLUMN_DEPARTMENT, COLUMN_POSITION) if c in per_group.columns]
+    for position, values in enumerate(per_group.to_dict('records')):
+        name = ' / '.join(str(values[c]) for c in label_columns) or f'Gruppe {position + 1}'
+
+        idx = st.session_state.employee_groups_count
+        st.session_state.employee_groups_count += 1
+        _init_group_state(
+            idx,
+            name,
+            count=min(1000, max(1, int(values[COLUMN_EMPLOYEE_COUNT]))),
+            vacation_days=min(365, int(round(values[COLUMN_AVG_VACATION_DAYS]))),
+            sick_days=min(365, int(round(values[COLUMN_AVG_SICK_DAYS]))),
+        )
+
+
+def render_personio_absence_import():
+    """
+    Render the import of vacation and sick days from Personio absences.
+
+    Uses the absences (and employees) loaded on the Personio page, aggregates
+    them per department and/or position and pre-fills the employee groups.
+    """
+    absences_df = st.session_state.get('absences_df')
+    employees_df = st.session_state.get('employees_df')
+
+    if absences_df is None or absences_df.empty:
+        st.info("ℹ️ Laden Sie zuerst Abwesenheiten (und Mitarbeiter) auf der Seite 'Personio'.")
+        return
+    if employees_df is None:
+        st.warning("⚠️ Keine Mitarbeiterdaten geladen - ohne Mitarbeiter ist keine Gruppierung nach Abteilung/Position möglich.")
+
+    # Default to the loaded range; open bounds fall back to the dates in the data. Days outside
+    # the loaded range were not fetched, so the range is clipped to it (annualizing would understate).
+    loaded_start, loaded_end = st.session_state.get('absences_date_range') or (None, None)
+    data_start, data_end = absence_date_range(absences_df)
+    default_start = loaded_start or data_start or date(date.today().year - 1, 1, 1)
+    default_end = loaded_end or data_end or max(default_start, date.today())
+    for key, value in (("absence_import_start", default_start), ("absence_import_end", default_end)):
+        current = st.session_state.get(key)
+        if current is None or (loaded_start and current < loaded_start) or (loaded_end and current > loaded_end):
+            st.session_state[key] = value
+
+    col1, col2 = st.columns(2)
+    with col1:
+        start_date = st.date_input("Von", min_value=loaded_start, max_value=loaded_end, key="absence_import_start",
+                                   help="Abwesenheiten werden auf diesen Zeitraum zugeschnitten und je Mitarbeiter über die Beschäftigungsdauer im Zeitraum auf ein Jahr hochgerechnet")
+    with col2:
+        end_date = st.date_input("Bis", min_value=loaded_start, max_value=loaded_end, key="absence_import_end")
+    if not (loaded_start and loaded_end):
+        st.caption("ℹ️ Die Abwesenheiten wurden ohne festen Zeitraum geladen. Bitte prüfen Sie, dass der "
+                   "gewählte Zeitraum vollständig in den geladenen Daten enthalten ist.")
+
+    types = absence_types(absences_df)
+    default_vacation, default_sick = default_absence_types(types)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        vacation_types = st.multiselect("Urlaubsarten", types, default=default_vacation, key="absence_import_vacation")
+    with col2:
+        sick_types = st.multiselect("Krankheitsarten", types, default=default_sick, key="absence_import_sick")
+    with col3:
+        group_labels = {GROUP_BY_DEPARTMENT: "Abteilung", GROUP_BY_POSITION: "Position"}
+        group_by = st.multiselect("Gruppieren nach", list(group_labels), default=[GROUP_BY_DEPARTMENT],
+                                  format_func=group_labels.get, key="absence_import_group_by")
+
+    per_employee, per_group, error = aggregate_absences(
+        absences_df, employees_df, start_date, end_date, vacation_types, sick_types, group_by
+    )
+    if error:
+        st.error(f"❌ {error}")
+        return
+
+    st.markdown(f"**Ø pro Gruppe und Jahr** ({len(per_employee):,} Mitarbeiter)")
+    st.dataframe(per_group, use_container_width=True, hide_index=True)
+    if st.checkbox("Werte pro Mitarbeiter anzeigen", key="absence_import_show_employees"):
+        st.dataframe(per_employee, use_container_width=True, hide_index=True)
+
+    replace = st.checkbox("Bestehende Mitarbeitergruppen ersetzen", value=True, key="absence_import_replace")
+    if st.button("📥 Als Mitarbeitergruppen übernehmen", key="absence_import_apply", type="primary"):
+        apply_absence_groups(per_group, replace=replace)
+        # The groups form is rendered after this section and picks up the new values in this run
+        st.success(f"✅ {len(per_group)} Mitarbeitergruppen mit Urlaubs- und Krankheitstagen vorbelegt")
+
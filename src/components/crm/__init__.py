@@ -8,14 +8,21 @@ Reusable components for CRM operations (import, update, field mapping).
 from .ui import (
     render_wip_warning,
     render_environment_selector,
+    current_base_url,
     render_api_configuration,
     render_file_uploader,
     render_results_display,
+    get_result_store,
+    render_result_downloads,
+    create_progress_renderer,
     get_csv_columns,
     render_mapping_summary,
     render_preview_matches,
     render_update_execution,
     render_update_results,
+    load_update_job_results,
+    render_retry_transient_failures,
+    render_request_budget,
 )
 
 # Entity update page
@@ -46,14 +53,21 @@ __all__ = [
     # UI components
     'render_wip_warning',
     'render_environment_selector',
+    'current_base_url',
     'render_api_configuration',
     'render_file_uploader',
     'render_results_display',
+    'get_result_store',
+    'render_result_downloads',
+    'create_progress_renderer',
     'get_csv_columns',
     'render_mapping_summary',
     'render_preview_matches',
     'render_update_execution',
     'render_update_results',
+    'load_update_job_results',
+    'render_retry_transient_failures',
+    'render_request_budget',
 
     # Entity update
     'EntityUpdateConfig',
@@ -9,6 +9,7 @@ import streamlit as st
 import pandas as pd
 from typing import Dict, List, Tuple, Optional, Callable, Any
 from ..common.session_state_manager import init_session_state
+from ..common.job_monitor import render_job_monitor, render_job_history
 from .ui import (
     render_environment_selector,
     render_api_configuration,
@@ -17,6 +18,7 @@ from .ui import (
     render_preview_matches,
     render_update_execution,
     render_update_results,
+    load_update_job_results,
     render_wip_warning
 )
 
@@ -165,8 +167,16 @@ def render_entity_update_page(config: EntityUpdateConfig,
             entity_icon=config.entity_icon
         )
 
+    # Background jobs
+    render_job_monitor(st.session_state.get('update_job_id'), load_update_job_results)
+    render_job_history(f"{config.entity_type}_update", load_update_job_results)
+
     # Show Results
-    render_update_results(st.session_state.get('update_results'))
+    render_update_results(
+        st.session_state.get('update_results'),
+        df=st.session_state.get('uploaded_data'),
+        bulk_update_function=config.bulk_update_func
+    )
 
 
 def _render_field_mapping_tabs(field_groups: List[Tuple[str, str, List[str]]],
@@ -9,6 +9,18 @@ import streamlit as st
 import pandas as pd
 from typing import Tuple, Optional
 from ..common.session_state_manager import init_global_crm_state
+from ..common.job_monitor import current_job_owner
+from ...helpers.crm.result_store import ResultStore
+from ...helpers.crm.progress import ProgressEvent, format_duration
+from ...helpers.crm.retry import retry_transient_failures
+from ...helpers.crm.planning import RequestBudget, estimate_request_budget
+from ...helpers.jobs import Job, get_job_manager
+from ...helpers.export_utils import generate_filename
+from ...helpers.poool_api_client import resolve_base_url
+from ...helpers.data_profiling import dataframe_fingerprint
+
+# Maximum number of result rows materialized for on-screen tables
+RESULT_DISPLAY_LIMIT = 500
 
 
 def render_wip_warning():
@@ -69,6 +81,13 @@ def render_environment_selector() -> Tuple[str, Optional[str]]:
     return env_option, custom_url
 
 
+def current_base_url() -> str:
+    """Return the API base URL of the selected environment (for per-environment request metrics)."""
+    environment = st.session_state.get('crm_environment', 'production')
+    custom_url = st.session_state.get('crm_custom_url') if environment == 'custom' else None
+    return resolve_base_url(environment, custom_url)
+
+
 def render_api_configuration(test_connection_callback) -> Tuple[str, bool]:
     """
     Render API configuration UI with test connection using global CRM session state.
@@ -172,46 +191,163 @@ def render_file_uploader(operation_type: str = "import") -> Optional[pd.DataFram
     return st.session_state.get('uploaded_data')
 
 
+def get_result_store(results: dict, operation_type: str = "import",
+                     entity_type: str = "companies") -> Optional[ResultStore]:
+    """
+    Get the ResultStore from a results dict.
+
+    Accepts both the store-based format ({'store': ResultStore, ...}) and the
+    legacy format with 'successful' and 'failed' lists.
+
+    Args:
+        results: Results dict from session state
+        operation_type: "import" or "update"
+        entity_type: "companies" or "persons"
+
+    Returns:
+        ResultStore or None if no results are available
+    """
+    if not results:
+        return None
+
+    store = results.get('store')
+    if store is not None:
+        return store
+
+    return ResultStore.from_lists(
+        results.get('successful', []),
+        results.get('failed', []),
+        operation_type=operation_type,
+        entity_type=entity_type,
+        dry_run=results.get('dry_run', False)
+    )
+
+
+def render_result_downloads(store: ResultStore, base_name: str, key_prefix: str = "results"):
+    """
+    Render CSV and Parquet download buttons for a ResultStore.
+
+    The files are serialized from the Arrow table only after "Download
+    vorbereiten" is clicked and kept in the session until the results
+    change, so reruns do not serialize large stores again.
+
+    Args:
+        store: ResultStore with the results
+        base_name: Base name for the downloaded files
+        key_prefix: Prefix for the widget keys
+    """
+    signature = (len(store), store.success_count, store.skipped_count, store.failure_count)
+    prepared_key = f"{key_prefix}_prepared_downloads"
+    prepared = st.session_state.get(prepared_key)
+
+    if not prepared or prepared['signature'] != signature:
+        if not st.button("📦 Download vorbereiten", key=f"{key_prefix}_prepare_download"):
+            return
+        with st.spinner("Dateien werden erstellt..."):
+            prepared = {
+                'signature': signature,
+                'csv': store.to_csv_bytes(),
+                'parquet': store.to_parquet_bytes(),
+            }
+        st.session_state[prepared_key] = prepared
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.download_button(
+            label="📥 Ergebnisse als CSV",
+            data=prepared['csv'],
+            file_name=generate_filename(base_name, "csv"),
+            mime="text/csv",
+            key=f"{key_prefix}_csv_download"
+        )
+
+    with col2:
+        st.download_button(
+            label="📥 Ergebnisse als Parquet",
+            data=prepared['parquet'],
+            file_name=generate_filename(base_name, "parquet"),
+            mime="application/octet-stream",
+            key=f"{key_prefix}_parquet_download"
+        )
+
+
+def _render_store_table(store: ResultStore, status: str, columns: list):
+    """Render a limited slice of the results for one status."""
+    count = {
+        'success': store.success_count,
+        'skipped': store.skipped_count,
+        'failed': store.failure_count
+    }[status]
+    result_df = store.to_pandas(status=status, limit=RESULT_DISPLAY_LIMIT, columns=columns)
+    st.dataframe(result_df, use_container_width=True, hide_index=True)
+
+    if count > RESULT_DISPLAY_LIMIT:
+        st.caption(f"Zeige {RESULT_DISPLAY_LIMIT:,} von {count:,} Zeilen. Vollständige Ergebnisse über den Download.")
+
+
 def render_results_display(results: dict, operation_type: str = "import"):
     """
     Render results display with success/failure breakdown.
 
     Args:
-        results: Dict with 'successful' and 'failed' lists
+        results: Dict with a 'store' ResultStore (or legacy 'successful' and 'failed' lists)
         operation_type: "import" or "update"
     """
-    if not results:
+    store = get_result_store(results, operation_type)
+    if store is None:
         return
 
     st.markdown("---")
     st.subheader(f"📊 {operation_type.title()} Results")
 
-    successful = results.get('successful', [])
-    failed = results.get('failed', [])
-
     # Metrics
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        st.metric("✅ Successful", len(successful))
+        st.metric("✅ Successful", store.success_count)
     with col2:
-        st.metric("❌ Failed", len(failed))
+        st.metric("❌ Failed", store.failure_count)
     with col3:
-        total = len(successful) + len(failed)
-        success_rate = (len(successful) / total * 100) if total > 0 else 0
+        total = len(store)
+        success_rate = (store.success_count / total * 100) if total > 0 else 0
         st.metric("Success Rate", f"{success_rate:.1f}%")
 
     # Successful records
-    if successful:
-        with st.expander(f"✅ Successful {operation_type.title()}s ({len(successful)})", expanded=True):
-            success_df = pd.DataFrame(successful)
-            st.dataframe(success_df, use_container_width=True)
+    if store.success_count:
+        with st.expander(f"✅ Successful {operation_type.title()}s ({store.success_count})", expanded=True):
+            _render_store_table(store, 'success', ['row', 'entity_id', 'entity_name', 'identifier', 'endpoints', 'fields', 'warnings'])
 
     # Failed records
-    if failed:
-        with st.expander(f"❌ Failed {operation_type.title()}s ({len(failed)})", expanded=True):
-            failed_df = pd.DataFrame(failed)
-            st.dataframe(failed_df, use_container_width=True)
+    if store.failure_count:
+        with st.expander(f"❌ Failed {operation_type.title()}s ({store.failure_count})", expanded=True):
+            _render_store_table(store, 'failed', ['row', 'identifier', 'error_code', 'error_class', 'error_message', 'partial_success', 'data_preview'])
+
+    render_result_downloads(store, f"crm_{operation_type}_results", key_prefix=f"{operation_type}_results")
+
+
+def create_progress_renderer(progress_bar, status_text, action_label: str = "Verarbeitet"):
+    """
+    Create a progress callback that renders ProgressEvents into Streamlit placeholders.
+
+    Args:
+        progress_bar: Placeholder returned by st.progress()
+        status_text: Placeholder returned by st.empty()
+        action_label: Verb shown in the status line (e.g. "Importiert")
+
+    Returns:
+        Callback accepting a ProgressEvent
+    """
+    def render(event: ProgressEvent):
+        progress_bar.progress(event.fraction)
+        status_text.text(
+            f"{action_label}: {event.completed:,}/{event.total:,} Zeilen "
+            f"(✅ {event.successful:,} | ❌ {event.failed:,}) · "
+            f"{event.rows_per_second:.1f} Zeilen/s · "
+            f"verbleibend ca. {format_duration(event.eta_seconds)}"
+        )
+
+    return render
 
 
 def get_csv_columns(df: pd.DataFrame) -> list:
@@ -260,7 +396,7 @@ def render_preview_matches(df: pd.DataFrame, field_mapping: dict, identifier_fie
         df: DataFrame with data
         field_mapping: CSV column to API field mapping
         identifier_field: Field to use for matching
-        preview_function: Function to call for preview (takes api_key, df, mapping, identifier, env, url, limit)
+        preview_function: Function to call for preview (takes api_key, df, mapping, identifier, env, url, limit; limit None = whole file)
         entity_type: "company" or "person"
     """
     st.markdown("### 2️⃣ Vorschau Übereinstimmungen (Optional)")
@@ -276,10 +412,19 @@ def render_preview_matches(df: pd.DataFrame, field_mapping: dict, identifier_fie
 
     with col1:
         st.markdown("Vorschau, wie Datensätze vor der Aktualisierung abgeglichen werden:")
+        preview_scope = st.radio(
+            "Vorschau-Umfang",
+            options=["Erste 20 Zeilen", "Gesamte Datei"],
+            horizontal=True,
+            help="Bei der gesamten Datei werden die bestehenden Datensätze einmalig geladen und alle Zeilen lokal abgeglichen"
+        )
 
     with col2:
         if st.button("🔍 Vorschau Übereinstimmungen", type="secondary"):
-            with st.spinner("Vorschau der ersten 20 Übereinstimmungen..."):
+            preview_limit = None if preview_scope == "Gesamte Datei" else 20
+            spinner_text = f"Vorschau aller {len(df):,} Übereinstimmungen..." if preview_limit is None else "Vorschau der ersten 20 Übereinstimmungen..."
+
+            with st.spinner(spinner_text):
                 current_env = st.session_state.get('crm_environment', 'production')
                 custom_url = st.session_state.get('crm_custom_url') if current_env == 'custom' else None
 
@@ -290,7 +435,7 @@ def render_preview_matches(df: pd.DataFrame, field_mapping: dict, identifier_fie
                     identifier_field,
                     current_env,
                     custom_url,
-                    preview_limit=20
+                    preview_limit=preview_limit
                 )
 
                 st.session_state.preview_results = preview_results
@@ -323,17 +468,63 @@ def render_preview_matches(df: pd.DataFrame, field_mapping: dict, identifier_fie
             st.rerun()
 
 
+def render_request_budget(budget: RequestBudget):
+    """
+    Render the estimated requests and duration of a bulk run.
+
+    Args:
+        budget: RequestBudget from estimate_request_budget
+    """
+    # Index pages depend on the CRM size, so totals with an index are minimums
+    at_least = "≥ " if budget.index_lower_bound else ""
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Geschätzte API-Anfragen", f"{at_least}{budget.total_requests:,}")
+    with col2:
+        st.metric("Geschätzte Dauer", f"{at_least}{format_duration(budget.estimated_seconds)}")
+    with col3:
+        st.metric("Anfragen pro Zeile", f"{at_least}{budget.total_requests / budget.rows:.1f}" if budget.rows else "–")
+
+    latency_note = (
+        f"gemessene Latenz {budget.latency_seconds * 1000:.0f} ms" if budget.latency_measured
+        else f"angenommene Latenz {budget.latency_seconds * 1000:.0f} ms (noch keine Messung)"
+    )
+    parallel_note = f", {budget.concurrency} Zeilen parallel" if budget.concurrency > 1 else ""
+    index_note = (
+        " Der Bestandsabgleich lädt alle Datensätze des CRM (100 pro Anfrage); seine Anfragen sind eine "
+        "Untergrenze, die von der Größe des CRM abhängt." if budget.index_lower_bound else ""
+    )
+    st.caption(f"Schätzung ohne API-Aufrufe: {latency_note}{parallel_note}. "
+               f"Neue Tags und Länder sind Obergrenzen.{index_note}")
+
+    with st.expander("📋 Aufschlüsselung der Anfragen"):
+        st.dataframe(
+            pd.DataFrame([{'Kategorie': label, 'Anfragen': count} for label, count in budget.breakdown().items()]),
+            use_container_width=True,
+            hide_index=True
+        )
+        distinct_labels = {'tags': "Verschiedene Tags", 'countries': "Verschiedene Länder",
+                           'company_names': "Verschiedene Firmennamen"}
+        distinct = [f"{distinct_labels[k]}: {v:,}" for k, v in budget.distinct.items() if k in distinct_labels]
+        if distinct:
+            st.caption(" · ".join(distinct))
+
+
 def render_update_execution(df: pd.DataFrame, field_mapping: dict, identifier_field: str,
                             bulk_update_function, entity_type: str = "company",
                             entity_icon: str = "🔄"):
     """
     Render update execution section with dry run mode and execute button.
 
+    The update is submitted as background job; its ID is stored in
+    `st.session_state.update_job_id`.
+
     Args:
         df: DataFrame with data
         field_mapping: CSV column to API field mapping
         identifier_field: Field to use for matching
-        bulk_update_function: Function to call for bulk update (takes api_key, df, mapping, identifier, env, url, dry_run)
+        bulk_update_function: Function to call for bulk update (takes api_key, df, mapping, identifier, env, url, dry_run, skip_unchanged, result_store, progress_callback)
         entity_type: "company" or "person"
         entity_icon: Icon for the update button
     """
@@ -349,6 +540,13 @@ def render_update_execution(df: pd.DataFrame, field_mapping: dict, identifier_fi
     if dry_run_mode:
         st.info("⚠️ **Test-Modus aktiv** - Es werden keine echten Aktualisierungen vorgenommen. Ergebnisse zeigen, was aktualisiert WÜRDE.")
 
+    skip_unchanged = st.checkbox(
+        "⏭️ Nur Änderungen senden (unveränderte Datensätze überspringen)",
+        value=False,
+        help="Lädt vorab alle bestehenden Datensätze und vergleicht jede Zeile mit den aktuellen Werten. "
+             "Es werden nur geänderte Felder gesendet; Zeilen ohne Änderungen werden übersprungen."
+    )
+
     # Check if identifier is mapped
     identifier_mapped = identifier_field in field_mapping.values()
 
@@ -359,78 +557,221 @@ def render_update_execution(df: pd.DataFrame, field_mapping: dict, identifier_fi
     else:
         row_count = len(df)
 
+        if not dry_run_mode:
+            render_request_budget(estimate_request_budget(
+                df, field_mapping,
+                entity_type="companies" if entity_type == "company" else "persons",
+                operation="update",
+                identifier_field=identifier_field,
+                skip_unchanged=skip_unchanged,
+                base_url=current_base_url()
+            ))
+
         button_text = f"🧪 Vorschau {row_count:,} Aktualisierungen" if dry_run_mode else f"{entity_icon} {row_count:,} Datensätze aktualisieren"
         button_type = "secondary" if dry_run_mode else "primary"
 
         if st.button(button_text, type=button_type):
-            spinner_text = f"Simuliere Aktualisierungen für {row_count:,} {entity_type}..." if dry_run_mode else f"Aktualisiere {row_count:,} {entity_type}..."
+            current_env = st.session_state.get('crm_environment', 'production')
+            custom_url = st.session_state.get('crm_custom_url') if current_env == 'custom' else None
+
+            job_label = f"{'Test-' if dry_run_mode else ''}Aktualisierung {entity_type} ({row_count:,} Zeilen)"
+
+            # Inputs are copied so later edits on the page cannot affect the running job
+            job_id = get_job_manager().submit(
+                job_type=f"{entity_type}_update",
+                label=job_label,
+                func=bulk_update_function,
+                kwargs={
+                    'api_key': st.session_state.crm_api_key,
+                    'df': df.copy(),
+                    'field_mapping': dict(field_mapping),
+                    'identifier_field': identifier_field,
+                    'environment': current_env,
+                    'custom_url': custom_url,
+                    'dry_run': dry_run_mode,
+                    'skip_unchanged': skip_unchanged
+                },
+                total=row_count,
+                operation_type="update",
+                entity_type="companies" if entity_type == "company" else "persons",
+                dry_run=dry_run_mode,
+                owner=current_job_owner(),
+                # Settings (without API key) and input fingerprint needed to retry failed rows later
+                metadata={
+                    'bulk_settings': {
+                        'field_mapping': dict(field_mapping),
+                        'identifier_field': identifier_field,
+                        'environment': current_env,
+                        'custom_url': custom_url,
+                        'skip_unchanged': skip_unchanged
+                    },
+                    'input_fingerprint': dataframe_fingerprint(df)
+                }
+            )
 
-            with st.spinner(spinner_text):
-                current_env = st.session_state.get('crm_environment', 'production')
-                custom_url = st.session_state.get('crm_custom_url') if current_env == 'custom' else None
+            st.session_state.update_job_id = job_id
+            st.session_state.update_results = None
+            st.rerun()
 
-                successful, failed = bulk_update_function(
-                    st.session_state.crm_api_key,
-                    df,
-                    field_mapping,
-                    identifier_field,
-                    current_env,
-                    custom_url,
-                    dry_run=dry_run_mode
-                )
 
-                st.session_state.update_results = {
-                    'successful': successful,
-                    'failed': failed,
-                    'dry_run': dry_run_mode
+def load_update_job_results(job: Job):
+    """
+    Store the results of a finished update job in session state.
+
+    Args:
+        job: Finished update job
+    """
+    st.session_state.update_results = {
+        'store': get_job_manager().get_result_store(job.job_id, current_job_owner()),
+        'dry_run': job.dry_run,
+        'error': job.error,
+        'job_type': job.job_type,
+        'bulk_settings': job.metadata.get('bulk_settings'),
+        'input_fingerprint': job.metadata.get('input_fingerprint')
+    }
+    if st.session_state.get('update_job_id') == job.job_id:
+        st.session_state.update_job_id = None
+
+
+def render_retry_transient_failures(store: ResultStore, df: Optional[pd.DataFrame], bulk_function,
+                                    bulk_settings: Optional[dict], job_type: str, on_submitted,
+                                    input_fingerprint: Optional[str] = None):
+    """
+    Render the "retry failed" action for transient failures.
+
+    Only rows classified as transient (rate limit, server error, timeout) are
+    resubmitted as background job; the job's results are the original results
+    with those rows replaced. Creates with a lost response are only reported,
+    as the record may already exist. Retrying requires the DataFrame of the
+    session to be the exact input of the original job.
+
+    Args:
+        store: Results of the finished run
+        df: DataFrame of the current session (used if it matches input_fingerprint)
+        bulk_function: Bulk import/update function used for the original run
+        bulk_settings: Arguments of the original run without API key and DataFrame
+        job_type: Job type for the retry job
+        on_submitted: Called with the new job ID
+        input_fingerprint: dataframe_fingerprint of the original job's input
+    """
+    uncertain_rows = store.uncertain_failure_rows()
+    if uncertain_rows:
+        st.warning(
+            f"⚠️ Bei {len(uncertain_rows):,} Anlagen ist unklar, ob sie ausgeführt wurden (Zeitüberschreitung, "
+            f"Verbindungs- oder Serverfehler). Die Datensätze wurden möglicherweise trotzdem angelegt und werden daher "
+            f"nicht automatisch wiederholt. Bitte im CRM prüfen (Zeilen: "
+            f"{', '.join(str(row) for row in uncertain_rows[:20])}{' …' if len(uncertain_rows) > 20 else ''})."
+        )
+
+    transient_rows = store.transient_failure_rows()
+    if not transient_rows:
+        return
+
+    permanent_count = store.failure_count - len(transient_rows) - len(uncertain_rows)
+    st.info(
+        f"🔁 {len(transient_rows):,} Fehler sind vorübergehend (Ratenlimit, Serverfehler, Zeitüberschreitung) "
+        f"und können erneut versucht werden. {permanent_count:,} Fehler erfordern eine Korrektur der Daten."
+    )
+
+    if df is None or bulk_settings is None or input_fingerprint is None or \
+            dataframe_fingerprint(df) != input_fingerprint:
+        st.caption("Zum erneuten Versuch wird die unveränderte ursprüngliche Datei in dieser Sitzung benötigt.")
+        return
+
+    if st.button(f"🔁 {len(transient_rows):,} vorübergehende Fehler erneut versuchen", key=f"retry_{job_type}"):
+        job_id = get_job_manager().submit(
+            job_type=job_type,
+            label=f"Wiederholung vorübergehender Fehler ({len(transient_rows):,} Zeilen)",
+            func=retry_transient_failures,
+            kwargs={
+                'source_store': store,
+                'df': df.copy(),
+                'bulk_function': bulk_function,
+                'bulk_kwargs': {
+                    **bulk_settings,
+                    'api_key': st.session_state.crm_api_key,
+                    **({'dry_run': store.dry_run} if store.operation_type == 'update' else {})
                 }
-                st.rerun()
+            },
+            total=len(transient_rows),
+            operation_type=store.operation_type,
+            entity_type=store.entity_type,
+            dry_run=store.dry_run,
+            owner=current_job_owner(),
+            metadata={'bulk_settings': bulk_settings, 'input_fingerprint': input_fingerprint}
+        )
+        on_submitted(job_id)
 
 
-def render_update_results(results: dict):
+def render_update_results(results: dict, df: Optional[pd.DataFrame] = None, bulk_update_function=None):
     """
     Render update results with dry run banner and success/failure breakdown.
 
     Args:
-        results: Dict with 'successful', 'failed', and 'dry_run' keys
+        results: Dict with 'store' (or legacy 'successful'/'failed' lists) and 'dry_run' keys
+        df: Uploaded DataFrame (enables retrying transient failures)
+        bulk_update_function: Bulk update function used for the run (enables retrying transient failures)
     """
-    if not results:
+    store = get_result_store(results, operation_type="update")
+    if store is None:
         return
 
     st.markdown("---")
 
+    if results.get('error'):
+        st.error(f"⚠️ {results['error']} – die Ergebnisse unten sind unvollständig.")
+
     # Show dry run banner if applicable
     if results.get('dry_run', False):
         st.warning("🧪 **TEST-MODUS ERGEBNISSE** - Es wurden keine echten Aktualisierungen vorgenommen. Dies zeigt, was aktualisiert WÜRDE.")
 
     st.subheader("📊 Aktualisierungsergebnisse")
 
-    successful = results.get('successful', [])
-    failed = results.get('failed', [])
-
     # Metrics
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
-        st.metric("✅ Erfolgreich", len(successful))
+        st.metric("✅ Erfolgreich", store.success_count)
     with col2:
-        st.metric("❌ Fehlgeschlagen", len(failed))
+        st.metric("⏭️ Unverändert", store.skipped_count)
     with col3:
-        total = len(successful) + len(failed)
-        success_rate = (len(successful) / total * 100) if total > 0 else 0
+        st.metric("❌ Fehlgeschlagen", store.failure_count)
+    with col4:
+        total = len(store)
+        success_rate = ((store.success_count + store.skipped_count) / total * 100) if total > 0 else 0
         st.metric("Erfolgsquote", f"{success_rate:.1f}%")
+    with col5:
+        st.metric("💾 Vermiedene Schreibzugriffe", store.writes_avoided)
 
     # Successful updates
-    if successful:
-        with st.expander(f"✅ Erfolgreiche Aktualisierungen ({len(successful)})", expanded=True):
-            success_df = pd.DataFrame(successful)
-            st.dataframe(success_df, use_container_width=True)
+    if store.success_count:
+        with st.expander(f"✅ Erfolgreiche Aktualisierungen ({store.success_count})", expanded=True):
+            _render_store_table(store, 'success', ['row', 'entity_id', 'identifier', 'endpoints', 'endpoints_skipped', 'fields'])
+
+    # Unchanged records
+    if store.skipped_count:
+        with st.expander(f"⏭️ Unveränderte Datensätze ({store.skipped_count})", expanded=False):
+            _render_store_table(store, 'skipped', ['row', 'entity_id', 'identifier', 'endpoints_skipped'])
 
     # Failed updates
-    if failed:
-        with st.expander(f"❌ Fehlgeschlagene Aktualisierungen ({len(failed)})", expanded=True):
-            failed_df = pd.DataFrame(failed)
-            st.dataframe(failed_df, use_container_width=True)
+    if store.failure_count:
+        with st.expander(f"❌ Fehlgeschlagene Aktualisierungen ({store.failure_count})", expanded=True):
+            _render_store_table(store, 'failed', ['row', 'identifier', 'error_code', 'error_class', 'error_message', 'partial_success', 'data_preview'])
+
+        if bulk_update_function is not None:
+            def on_retry_submitted(job_id: str):
+                st.session_state.update_job_id = job_id
+                st.session_state.update_results = None
+                st.rerun()
+
+            render_retry_transient_failures(
+                store, df, bulk_update_function, results.get('bulk_settings'),
+                results.get('job_type', f"{'company' if store.entity_type == 'companies' else 'person'}_update"),
+                on_retry_submitted,
+                input_fingerprint=results.get('input_fingerprint')
+            )
+
+    render_result_downloads(store, "crm_update_results", key_prefix="update_results")
 
     # Clear results button
     if st.button("🔄 Neue Aktualisierung starten"):
@@ -0,0 +1,68 @@
+"""
+Concurrency helpers for I/O-bound API work.
+
+Thin wrappers around ThreadPoolExecutor used to fan out independent requests
+and to process rows in parallel while keeping results in input order.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], T]]) -> Dict[str, T]:
+    """
+    Run independent zero-argument callables concurrently.
+
+    A single task runs inline without starting a thread pool.
+
+    Args:
+        tasks: Dict mapping a task name to its callable
+
+    Returns:
+        Dict mapping each task name to its return value (in the order of tasks)
+    """
+    if len(tasks) <= 1:
+        return {name: task() for name, task in tasks.items()}
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def ordered_map(func: Callable[[T], R], items: Iterable[T], max_workers: int = 4,
+                window: Optional[int] = None) -> Iterator[R]:
+    """
+    Apply func to items concurrently and yield the results in input order.
+
+    At most `window` items are in flight at once, so large inputs are not
+    submitted all at once. With max_workers <= 1 items are processed serially.
+
+    Args:
+        func: Function applied to each item
+        items: Input items
+        max_workers: Number of worker threads
+        window: Maximum number of submitted but not yet yielded items (default: 4 × max_workers)
+
+    Yields:
+        func(item) for each item, in the order of items
+    """
+    if max_workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    window = window or max_workers * 4
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
@@ -32,6 +32,10 @@ from .field_definitions import (
     get_person_field_labels,
     get_company_field_tabs,
     get_person_field_tabs,
+    get_company_field_types,
+    get_person_field_types,
+    get_field_max_lengths,
+    get_field_length_hints,
 )
 
 from .company_operations import (
@@ -55,6 +59,24 @@ from .tag_operations import (
 
 from .validation import (
     validate_import_data,
+    validate_rows,
+    summarize_row_errors,
+    summarize_length_warnings,
+)
+
+from .collapse import (
+    COLLAPSE_FIRST,
+    COLLAPSE_LAST,
+    COLLAPSE_FAIL,
+    COLLAPSE_POLICIES,
+    CollapsedRows,
+    company_collapse_keys,
+    collapse_duplicate_rows,
+)
+
+from .rows import (
+    MappedRows,
+    mapped_columns,
 )
 
 from .import_operations import (
@@ -62,10 +84,68 @@ from .import_operations import (
     bulk_import_generic,
 )
 
+from .result_store import (
+    ResultStore,
+    extract_error_code,
+    classify_error,
+    ERROR_CLASS_TRANSIENT,
+    ERROR_CLASS_PERMANENT,
+    ERROR_CLASS_UNCERTAIN,
+)
+
+from .retry import (
+    backoff_delay,
+    retry_transient_failures,
+)
+
+from .progress import (
+    ProgressEvent,
+    ProgressTracker,
+    format_duration,
+)
+
+from .entity_index import (
+    EntityIndex,
+    normalize_key,
+    build_company_index,
+    build_person_index,
+)
+
+from .diff import (
+    values_equal,
+    diff_payload,
+)
+
+from .dedupe import (
+    normalize_company_name,
+    find_crm_duplicates,
+    detect_crm_duplicates,
+)
+
+from .cluster_tags import (
+    CLUSTER_TAG_PREFIX,
+    cluster_tag_name,
+    ensure_cluster_tags,
+    compute_tag_changes,
+    assign_cluster_tags,
+)
+
+from .upsert_operations import (
+    UPSERT_CREATE,
+    UPSERT_UPDATE,
+    UPSERT_SKIP,
+    COMPANY_UPSERT_IDENTIFIERS,
+    PERSON_UPSERT_IDENTIFIERS,
+    classify_upsert_rows,
+    bulk_upsert,
+)
+
 from .update_operations import (
     separate_update_fields_by_endpoint,
     prepare_supplier_update_data,
+    match_company_record_by_identifier,
     match_company_by_identifier,
+    match_person_record_by_identifier,
     match_person_by_identifier,
     process_single_update,
     bulk_update_companies,
@@ -74,6 +154,12 @@ from .update_operations import (
     preview_person_matches,
 )
 
+from .planning import (
+    RequestBudget,
+    count_distinct_tags,
+    estimate_request_budget,
+)
+
 # Define public API
 __all__ = [
     # Core functions
@@ -91,6 +177,10 @@ __all__ = [
     'get_person_field_labels',
     'get_company_field_tabs',
     'get_person_field_tabs',
+    'get_company_field_types',
+    'get_person_field_types',
+    'get_field_max_lengths',
+    'get_field_length_hints',
 
     # Company operations
     'lookup_or_create_country_id',
@@ -110,19 +200,88 @@ __all__ = [
 
     # Validation
     'validate_import_data',
+    'validate_rows',
+    'summarize_row_errors',
+    'summarize_length_warnings',
+
+    # In-file duplicate collapsing
+    'COLLAPSE_FIRST',
+    'COLLAPSE_LAST',
+    'COLLAPSE_FAIL',
+    'COLLAPSE_POLICIES',
+    'CollapsedRows',
+    'company_collapse_keys',
+    'collapse_duplicate_rows',
+
+    # Lazy row access
+    'MappedRows',
+    'mapped_columns',
 
     # Import operations
     'process_single_import',
     'bulk_import_generic',
 
+    # Result store
+    'ResultStore',
+    'extract_error_code',
+    'classify_error',
+    'ERROR_CLASS_TRANSIENT',
+    'ERROR_CLASS_PERMANENT',
+    'ERROR_CLASS_UNCERTAIN',
+
+    # Retry of transient failures
+    'backoff_delay',
+    'retry_transient_failures',
+
+    # Progress tracking
+    'ProgressEvent',
+    'ProgressTracker',
+    'format_duration',
+
+    # Snapshot index and diffing
+    'EntityIndex',
+    'normalize_key',
+    'build_company_index',
+    'build_person_index',
+    'values_equal',
+    'diff_payload',
+
+    # Duplicate detection
+    'normalize_company_name',
+    'find_crm_duplicates',
+    'detect_crm_duplicates',
+
+    # Cluster tag assignment
+    'CLUSTER_TAG_PREFIX',
+    'cluster_tag_name',
+    'ensure_cluster_tags',
+    'compute_tag_changes',
+    'assign_cluster_tags',
+
+    # Upsert operations
+    'UPSERT_CREATE',
+    'UPSERT_UPDATE',
+    'UPSERT_SKIP',
+    'COMPANY_UPSERT_IDENTIFIERS',
+    'PERSON_UPSERT_IDENTIFIERS',
+    'classify_upsert_rows',
+    'bulk_upsert',
+
     # Update operations
     'separate_update_fields_by_endpoint',
     'prepare_supplier_update_data',
+    'match_company_record_by_identifier',
     'match_company_by_identifier',
+    'match_person_record_by_identifier',
     'match_person_by_identifier',
     'process_single_update',
     'bulk_update_companies',
     'preview_company_matches',
     'bulk_update_persons',
     'preview_person_matches',
+
+    # Pre-flight request budget
+    'RequestBudget',
+    'count_distinct_tags',
+    'estimate_request_budget',
 ]
@@ -0,0 +1,237 @@
+"""
+Cluster tag assignment for CRM companies.
+
+Assigns one "Cluster: <name>" tag per company in a single pass: all companies
+are prefetched in bulk pages, the tag changes are computed locally, and only
+companies whose tags actually change are updated, with bounded concurrency
+and a shared request rate limit. Cluster tags from earlier runs are removed.
+
+The listing is only used to find candidates. The full tags array is written
+back, so every update is computed from the full company record (and list
+entries without tags are refetched), never from the list payload alone.
+"""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from ..poool_api_client import PooolAPIClient
+from ..concurrency import ordered_map
+from ..rate_limiting import TokenBucket
+from .progress import ProgressTracker, ProgressCallback
+
+# Prefix identifying cluster tags created by the clustering page
+CLUSTER_TAG_PREFIX = "Cluster: "
+CLUSTER_TAG_COLOR = "#000000"
+CLUSTER_TAG_BACKGROUND = "#f3f3f3"
+
+# Concurrent company updates and sustained request rate
+TAG_MAX_WORKERS = 4
+TAG_REQUESTS_PER_SECOND = 5.0
+
+
+def cluster_tag_name(cluster_name: str) -> str:
+    """Return the tag title for a cluster name."""
+    return f"{CLUSTER_TAG_PREFIX}{cluster_name.strip()}"
+
+
+def ensure_cluster_tags(client: PooolAPIClient, cluster_names: Dict[int, str]) -> Tuple[Dict[int, int], Set[int], Optional[str]]:
+    """
+    Find or create one tag per cluster.
+
+    Args:
+        client: PooolAPIClient instance
+        cluster_names: Dict mapping cluster number to cluster name
+
+    Returns:
+        Tuple of (cluster number to tag ID, IDs of all existing cluster tags, error_message)
+    """
+    existing_tags, error = client.get_all_tags()
+    if error:
+        return {}, set(), error
+
+    prefix = CLUSTER_TAG_PREFIX.lower()
+    cluster_tag_ids = {tag_id for name, tag_id in existing_tags.items() if name.lower().startswith(prefix)}
+
+    tag_ids = {}
+    for cluster, name in cluster_names.items():
+        title = cluster_tag_name(name)
+        tag_id = existing_tags.get(title.lower())
+
+        if tag_id is None:
+            tag_id, error = client.create_tag_if_missing(
+                tag_name=title,
+                color=CLUSTER_TAG_COLOR,
+                color_background=CLUSTER_TAG_BACKGROUND
+            )
+            if error:
+                return {}, set(), f"Fehler beim Erstellen des Tags '{title}': {error}"
+            existing_tags[title.lower()] = tag_id
+
+        tag_ids[cluster] = tag_id
+        cluster_tag_ids.add(tag_id)
+
+    return tag_ids, cluster_tag_ids, None
+
+
+def _tag_ids(company: Dict) -> List[int]:
+    """Return the tag IDs of a company record (tags may be objects or plain IDs)."""
+    ids = []
+    for tag in company.get('tags') or []:
+        tag_id = tag.get('id') if isinstance(tag, dict) else tag
+        if tag_id is not None:
+            ids.append(int(tag_id))
+    return ids
+
+
+def compute_tag_changes(companies: Dict[int, Dict], assignments: Dict[int, int], cluster_tag_ids: Set[int],
+                        clear_unassigned: bool = False) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Compute the tag updates needed to reach the desired cluster assignment.
+
+    Every assigned company ends up with exactly one cluster tag; all its other
+    tags are kept. With clear_unassigned, cluster tags are also removed from
+    companies that are not part of the assignment.
+
+    Args:
+        companies: Dict mapping company ID to the current company record
+        assignments: Dict mapping company ID to the desired cluster tag ID
+        cluster_tag_ids: IDs of all cluster tags (current and from earlier runs)
+        clear_unassigned: Remove cluster tags from companies not in assignments
+
+    Returns:
+        Tuple of (changes, missing) - changes hold company_id, tags, added and
+        removed tag IDs; missing holds company_id and error for unknown companies
+    """
+    changes = []
+    missing = []
+
+    targets = dict(assignments)
+    if clear_unassigned:
+        for company_id, company in companies.items():
+            if company_id not in targets and cluster_tag_ids.intersection(_tag_ids(company)):
+                targets[company_id] = None
+
+    for company_id, tag_id in targets.items():
+        company = companies.get(company_id)
+        if company is None:
+            missing.append({'company_id': company_id, 'error': "Firma nicht gefunden"})
+            continue
+
+        current = _tag_ids(company)
+        desired = [t for t in current if t not in cluster_tag_ids or t == tag_id]
+        if tag_id is not None and tag_id not in desired:
+            desired.append(tag_id)
+
+        if set(desired) == set(current):
+            continue
+
+        changes.append({
+            'company_id': company_id,
+            'tags': desired,
+            'added': sorted(set(desired) - set(current)),
+            'removed': sorted(set(current) - set(desired)),
+        })
+
+    return changes, missing
+
+
+def assign_cluster_tags(client: PooolAPIClient, assignments: Dict[int, int], cluster_names: Dict[int, str],
+                        clear_unassigned: bool = False, max_workers: int = TAG_MAX_WORKERS,
+                        requests_per_second: float = TAG_REQUESTS_PER_SECOND,
+                        progress_callback: Optional[ProgressCallback] = None) -> Tuple[Dict, Optional[str]]:
+    """
+    Assign cluster tags to companies.
+
+    Args:
+        client: PooolAPIClient instance
+        assignments: Dict mapping company ID to cluster number
+        cluster_names: Dict mapping cluster number to cluster name
+        clear_unassigned: Remove cluster tags from companies outside this clustering
+        max_workers: Concurrent company updates
+        requests_per_second: Sustained write rate shared by all workers
+        progress_callback: Called with ProgressEvents while updates are sent
+
+    Returns:
+        Tuple of (summary, error_message). The summary holds the counts
+        'total', 'updated', 'unchanged', 'cleared' (unassigned companies whose
+        cluster tags were removed), 'failed', 'stale_removed', the
+        resolved 'tag_ids' and a list of 'errors'.
+    """
+    tag_ids, cluster_tag_ids, error = ensure_cluster_tags(client, cluster_names)
+    if error:
+        return {}, error
+
+    companies, error = client.get_all_companies()
+    if error:
+        return {}, f"Fehler beim Abrufen der Firmen: {error}"
+    companies_by_id = {int(c['id']): c for c in companies if c.get('id') is not None}
+
+    desired = {int(company_id): tag_ids[cluster] for company_id, cluster in assignments.items()}
+    bucket = TokenBucket(requests_per_second)
+    errors = []
+
+    def fetch(company_id: int) -> Tuple[Optional[Dict], Optional[str]]:
+        bucket.acquire()
+        return client.get_company_by_id(company_id)
+
+    # List entries without tags cannot be diffed; load their full records first
+    incomplete = [company_id for company_id, company in companies_by_id.items()
+                  if 'tags' not in company and (clear_unassigned or company_id in desired)]
+    for company_id, (company, fetch_error) in zip(incomplete, ordered_map(fetch, incomplete, max_workers)):
+        if fetch_error or company is None:
+            errors.append(f"Company {company_id}: {fetch_error or 'Firma nicht gefunden'}")
+            del companies_by_id[company_id]
+            desired.pop(company_id, None)
+        else:
+            companies_by_id[company_id] = company
+
+    changes, missing = compute_tag_changes(companies_by_id, desired, cluster_tag_ids, clear_unassigned)
+    errors.extend(f"Company {m['company_id']}: {m['error']}" for m in missing)
+    tracker = ProgressTracker(len(changes), progress_callback)
+
+    def send(change: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+        # Recompute from the full record so tags missing in the listing are kept
+        company_id = change['company_id']
+        company, fetch_error = fetch(company_id)
+        if fetch_error or company is None:
+            return None, fetch_error or "Firma nicht gefunden"
+
+        target = {company_id: desired[company_id]} if company_id in desired else {}
+        current_changes, _ = compute_tag_changes({company_id: company}, target, cluster_tag_ids,
+                                                 clear_unassigned=company_id not in desired)
+        if not current_changes:
+            return None, None
+
+        bucket.acquire()
+        current = current_changes[0]
+        _, update_error = client.update_company(company_id, {"tags": [{"id": t} for t in current['tags']]})
+        return current, update_error
+
+    updated = 0
+    cleared = 0
+    stale_removed = 0
+    unchanged = len(desired) - len(missing) - sum(1 for c in changes if c['company_id'] in desired)
+    for change, (applied, update_error) in zip(changes, ordered_map(send, changes, max_workers)):
+        if update_error:
+            errors.append(f"Company {change['company_id']}: Failed to update tags - {update_error}")
+        elif applied is None:
+            # Full record already had the desired tags
+            if change['company_id'] in desired:
+                unchanged += 1
+        else:
+            if change['company_id'] in desired:
+                updated += 1
+            else:
+                cleared += 1
+            stale_removed += len(applied['removed'])
+        tracker.update(update_error is None)
+
+    return {
+        'total': len(assignments),
+        'updated': updated,
+        'unchanged': unchanged,
+        'cleared': cleared,
+        'failed': len(errors),
+        'stale_removed': stale_removed,
+        'tag_ids': tag_ids,
+        'errors': errors,
+    }, None
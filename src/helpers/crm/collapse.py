@@ -0,0 +1,211 @@
+"""
+In-file duplicate collapsing for company imports.
+
+Groups the rows of an import file that describe the same company (same
+name token, or same name and zip, ignoring case and whitespace) and merges
+them into one row per company before dispatch. Field values are merged under a conflict
+policy and tags are combined, so each company is created once; the import
+maps the outcome back to every source row.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .tag_operations import parse_comma_separated_tags
+
+# Conflict policies for differing values within a group
+COLLAPSE_FIRST = 'first'  # first non-empty value wins
+COLLAPSE_LAST = 'last'  # last non-empty value wins
+COLLAPSE_FAIL = 'fail'  # conflicting values fail the whole group
+COLLAPSE_POLICIES = [COLLAPSE_FIRST, COLLAPSE_LAST, COLLAPSE_FAIL]
+
+_TRUE_VALUES = ['1', 'true', 'yes', '1.0']
+
+
+@dataclass
+class CollapsedRows:
+    """
+    Result of collapsing duplicate rows.
+
+    Attributes:
+        df: One row per company, in order of first occurrence
+        groups: 1-based source row numbers for each row of df
+        conflicts: Position in df to error message for groups failed by COLLAPSE_FAIL
+        tag_mappings: Tag mappings for df (including the extra single-tag columns of merged rows)
+    """
+    df: pd.DataFrame
+    groups: List[List[int]]
+    conflicts: Dict[int, str] = field(default_factory=dict)
+    tag_mappings: Optional[Dict[str, str]] = None
+
+    @property
+    def collapsed_count(self) -> int:
+        """Number of source rows merged into another row."""
+        return sum(len(group) - 1 for group in self.groups)
+
+
+def _clean(value) -> Optional[str]:
+    """Return the stripped string value, or None for empty cells."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    return text if text and text.lower() != 'nan' else None
+
+
+def _key_text(value) -> str:
+    """Lower-cased value with collapsed whitespace ('' for empty cells)."""
+    return ' '.join((_clean(value) or '').lower().split())
+
+
+def company_collapse_keys(df: pd.DataFrame, field_mapping: Dict) -> pd.Series:
+    """
+    Compute the grouping key of every row.
+
+    The key is the name token if it is mapped and filled, otherwise the
+    company name (case and whitespace insensitive) plus the zip code. Legal
+    forms are part of the name, so "Müller GmbH" and "Müller KG" stay
+    separate companies. Rows without name and name token get no key (None)
+    and are never merged.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+
+    Returns:
+        Series of keys aligned with df
+    """
+    keys = pd.Series(None, index=df.index, dtype=object)
+
+    name_column = field_mapping.get('name')
+    if name_column in df.columns:
+        names = df[name_column].map(_key_text)
+        zip_column = field_mapping.get('address_zip')
+        zips = (df[zip_column].map(lambda v: _clean(v) or '') if zip_column in df.columns
+                else pd.Series('', index=df.index))
+        keys = ('name:' + names + '|' + zips).where(names.ne(''), None)
+
+    token_column = field_mapping.get('name_token')
+    if token_column in df.columns:
+        tokens = df[token_column].map(lambda v: (_clean(v) or '').replace(' ', '').lower())
+        keys = ('token:' + tokens).where(tokens.ne(''), keys)
+
+    return keys
+
+
+def _merge_tags(values: List, format_type: str) -> List[str]:
+    """
+    Merge the tag cells of a group.
+
+    Returns the cell values of the merged row: one value for one-hot and
+    comma separated columns, one value per distinct tag (in order) for
+    single-tag columns.
+    """
+    if format_type == 'one_hot':
+        cleaned = [_clean(v) for v in values]
+        if any(v and v.lower() in _TRUE_VALUES for v in cleaned):
+            return ['1']
+        return [next((v for v in cleaned if v), None)]
+
+    names = {}
+    for value in values:
+        if format_type == 'comma_separated':
+            tags = parse_comma_separated_tags(value)
+        else:
+            tags = [_clean(value)] if _clean(value) else []
+        for tag in tags:
+            names.setdefault(tag.lower(), tag)
+
+    if format_type == 'comma_separated':
+        return [', '.join(names.values()) or None]
+    return list(names.values()) or [None]
+
+
+def _extra_tag_column(column: str, number: int, existing) -> str:
+    """Name of the number-th extra single-tag column of a column (not clashing with existing columns)."""
+    name = f"{column} ({number})"
+    while name in existing:
+        name += "'"
+    return name
+
+
+def collapse_duplicate_rows(df: pd.DataFrame, field_mapping: Dict, tag_mappings: Optional[Dict[str, str]] = None,
+                            policy: str = COLLAPSE_FIRST) -> CollapsedRows:
+    """
+    Merge rows describing the same company into one row.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        tag_mappings: Tag column mappings (tags of merged rows are combined)
+        policy: COLLAPSE_FIRST, COLLAPSE_LAST or COLLAPSE_FAIL for differing values
+
+    Returns:
+        CollapsedRows with the merged DataFrame and the source rows of each merged row
+    """
+    if policy not in COLLAPSE_POLICIES:
+        raise ValueError(f"Unknown conflict policy: {policy}")
+
+    tag_mappings = dict(tag_mappings or {})
+    mapped_columns = {column for column in field_mapping.values() if column}
+    keys = company_collapse_keys(df, field_mapping).reset_index(drop=True)
+
+    # Rows without key stay on their own
+    keys = keys.where(keys.notna(), pd.Series([f"row:{i}" for i in range(len(df))]))
+    groups = [list(positions) for positions in
+              pd.Series(range(len(df))).groupby(keys.values, sort=False).groups.values()]
+    groups.sort(key=lambda positions: positions[0])
+
+    merged_rows = []
+    conflicts = {}
+    # Further tags of merged single-tag cells go to extra single-tag columns, so
+    # unmerged rows (and tag names containing commas) are parsed as before
+    extra_tag_columns: Dict[str, List[str]] = {}
+    for position, members in enumerate(groups):
+        rows = df.iloc[members]
+        if len(members) == 1:
+            merged_rows.append(rows.iloc[0].to_dict())
+            continue
+
+        merged = {}
+        conflicting = []
+        for column in df.columns:
+            values = rows[column].tolist()
+
+            if column in tag_mappings:
+                tags = _merge_tags(values, tag_mappings[column])
+                merged[column] = tags[0]
+                extras = extra_tag_columns.setdefault(column, []) if len(tags) > 1 else []
+                for number, tag in enumerate(tags[1:], start=2):
+                    if len(extras) < number - 1:
+                        extras.append(_extra_tag_column(column, number, df.columns))
+                    merged[extras[number - 2]] = tag
+                continue
+
+            present = [v for v in values if _clean(v) is not None]
+            if not present:
+                merged[column] = values[0]
+                continue
+
+            # Only mapped columns are sent; others (e.g. joined contact columns) may differ
+            if column in mapped_columns and len({_clean(v) for v in present}) > 1:
+                conflicting.append(column)
+            merged[column] = present[-1] if policy == COLLAPSE_LAST else present[0]
+
+        if conflicting and policy == COLLAPSE_FAIL:
+            conflicts[position] = f"Widersprüchliche Werte in zusammengehörigen Zeilen: {', '.join(conflicting)}"
+        merged_rows.append(merged)
+
+    columns = list(df.columns)
+    for extras in extra_tag_columns.values():
+        for extra in extras:
+            columns.append(extra)
+            tag_mappings[extra] = 'single_tag'
+
+    return CollapsedRows(
+        df=pd.DataFrame(merged_rows, columns=columns),
+        groups=[[member + 1 for member in members] for members in groups],
+        conflicts=conflicts,
+        tag_mappings=tag_mappings or None,
+    )
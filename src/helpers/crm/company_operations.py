@@ -5,9 +5,14 @@ Handles company data preparation, bulk imports, country lookups,
 and complex field processing (addresses, contacts).
 """
 
+import threading
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from ..poool_api_client import PooolAPIClient
+from .collapse import COLLAPSE_FIRST
+
+# Serializes country creation when rows are processed concurrently
+_country_cache_lock = threading.Lock()
 
 
 def lookup_or_create_country_id(client: PooolAPIClient, country_name: str, country_cache: Dict[str, int]) -> Optional[int]:
@@ -15,7 +20,8 @@ def lookup_or_create_country_id(client: PooolAPIClient, country_name: str, count
     Look up country ID by name, or create country if it doesn't exist.
 
     Searches the country cache (case-insensitive) for the country name. If not found,
-    creates a new country via API and adds it to the cache.
+    creates a new country via API and adds it to the cache. Creation is serialized
+    so concurrent rows do not create the same country twice.
 
     Args:
         client: PooolAPIClient instance
@@ -35,7 +41,17 @@ def lookup_or_create_country_id(client: PooolAPIClient, country_name: str, count
     if normalized_name in country_cache:
         return country_cache[normalized_name]
 
-    # Country not found in cache, create it
+    with _country_cache_lock:
+        # Another row may have created the country in the meantime
+        if normalized_name in country_cache:
+            return country_cache[normalized_name]
+
+        return _create_and_cache_country(client, country_name, normalized_name, country_cache)
+
+
+def _create_and_cache_country(client: PooolAPIClient, country_name: str, normalized_name: str,
+                              country_cache: Dict[str, int]) -> Optional[int]:
+    """Create a country via API and add all its name variants to the cache."""
     created_country, error = client.create_country(country_name)
 
     if error:
@@ -211,10 +227,14 @@ def prepare_company_data(row_data: Dict, field_mapping: Dict, client: Optional[P
     return company_data
 
 
-def bulk_import_companies(api_key: str, df, field_mapping: Dict, environment: str = "production", custom_url: str = None, tag_mappings: Dict = None) -> Tuple[List[Dict], List[Dict]]:
-    """Import multiple companies from DataFrame."""
+def bulk_import_companies(api_key: str, df, field_mapping: Dict, environment: str = "production", custom_url: str = None, tag_mappings: Dict = None,
+                          result_store=None, progress_callback=None, collapse_duplicates: bool = False,
+                          conflict_policy: str = COLLAPSE_FIRST) -> Tuple[List[Dict], List[Dict]]:
+    """Import multiple companies from DataFrame (optionally merging in-file duplicates first)."""
     from . import create_api_client
     from .import_operations import bulk_import_generic
 
     client = create_api_client(api_key, environment, custom_url)
-    return bulk_import_generic(client, df, field_mapping, 'companies', tag_mappings)
+    return bulk_import_generic(client, df, field_mapping, 'companies', tag_mappings, result_store=result_store,
+                               progress_callback=progress_callback, collapse_duplicates=collapse_duplicates,
+                               conflict_policy=conflict_policy)
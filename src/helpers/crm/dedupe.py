@@ -0,0 +1,250 @@
+"""
+Batch duplicate detection of import files against the CRM company base.
+
+Fetches all companies once and matches the whole import file in one pass:
+candidate pairs come from blocking keys (name token, zip, city) and from
+nearest neighbours over TF-IDF character n-grams of the normalized names.
+All candidates are scored vectorized and returned as a ranked table for
+review before the import.
+"""
+
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.neighbors import NearestNeighbors
+
+
+# Legal form suffixes ignored when comparing company names
+LEGAL_FORMS = {
+    'gmbh', 'mbh', 'ag', 'kg', 'ug', 'ohg', 'gbr', 'ek', 'eg', 'ev', 'se', 'kgaa',
+    'co', 'cokg', 'haftungsbeschraenkt', 'ltd', 'llc', 'inc', 'corp', 'sarl', 'bv', 'plc',
+}
+
+_UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+# Weights of the final score (name similarity dominates, address keys confirm)
+NAME_WEIGHT = 0.8
+ZIP_WEIGHT = 0.15
+CITY_WEIGHT = 0.05
+
+
+def normalize_company_name(name) -> str:
+    """
+    Normalize a company name for matching.
+
+    Lower-cases, transliterates umlauts, strips punctuation and legal forms
+    (GmbH, AG, KG, ...).
+
+    Args:
+        name: Raw company name
+
+    Returns:
+        Normalized name (empty string for missing values)
+    """
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ''
+
+    text = str(name).lower().translate(_UMLAUTS)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = text.replace('&', ' ').replace('.', '')
+    tokens = [token for token in _NON_ALNUM.sub(' ', text).split() if token not in LEGAL_FORMS]
+    return ' '.join(tokens)
+
+
+def _normalize_key_series(series: pd.Series) -> pd.Series:
+    """Normalize zip/city values for exact blocking (vectorized)."""
+    return (
+        series.fillna('').astype(str).str.lower()
+        .str.replace(r'[^a-z0-9äöüß]+', '', regex=True)
+    )
+
+
+def _company_address(company: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """Return (zip, city) of the preferred (or first) address of a CRM company."""
+    addresses = company.get('addresses') or []
+    if not addresses:
+        return None, None
+
+    address = next((a for a in addresses if isinstance(a, dict) and a.get('is_preferred')), addresses[0])
+    if not isinstance(address, dict):
+        return None, None
+    return address.get('zip'), address.get('location')
+
+
+def _build_frame(names: pd.Series, zips: pd.Series, cities: pd.Series) -> pd.DataFrame:
+    """Build the normalized matching frame with blocking keys."""
+    frame = pd.DataFrame({
+        'name': names.fillna('').astype(str).values,
+        'zip': zips.fillna('').astype(str).values,
+        'city': cities.fillna('').astype(str).values,
+    })
+    frame['name_norm'] = frame['name'].map(normalize_company_name)
+    frame['token'] = frame['name_norm'].str.split().str[0].fillna('')
+    frame['zip_key'] = _normalize_key_series(frame['zip'])
+    frame['city_key'] = _normalize_key_series(frame['city'])
+    return frame
+
+
+def _blocking_pairs(left: pd.DataFrame, right: pd.DataFrame) -> pd.DataFrame:
+    """Candidate pairs sharing the name token, or both zip and city."""
+    left = left.reset_index().rename(columns={'index': 'left_pos'})
+    right = right.reset_index().rename(columns={'index': 'right_pos'})
+
+    pairs = []
+
+    token_left = left[left['token'].str.len() >= 2]
+    pairs.append(token_left[['left_pos', 'token']].merge(right[['right_pos', 'token']], on='token')[['left_pos', 'right_pos']])
+
+    address_left = left[(left['zip_key'] != '') & (left['city_key'] != '')]
+    pairs.append(
+        address_left[['left_pos', 'zip_key', 'city_key']]
+        .merge(right[['right_pos', 'zip_key', 'city_key']], on=['zip_key', 'city_key'])[['left_pos', 'right_pos']]
+    )
+
+    return pd.concat(pairs, ignore_index=True)
+
+
+def _neighbour_pairs(left_matrix, right_matrix, n_neighbors: int) -> pd.DataFrame:
+    """Candidate pairs from cosine nearest neighbours (catches typos that break blocking)."""
+    n_neighbors = min(n_neighbors, right_matrix.shape[0])
+    if n_neighbors == 0 or left_matrix.shape[0] == 0:
+        return pd.DataFrame({'left_pos': [], 'right_pos': []}, dtype=int)
+
+    neighbours = NearestNeighbors(n_neighbors=n_neighbors, metric='cosine', algorithm='brute')
+    neighbours.fit(right_matrix)
+    _, indices = neighbours.kneighbors(left_matrix)
+
+    return pd.DataFrame({
+        'left_pos': np.repeat(np.arange(left_matrix.shape[0]), n_neighbors),
+        'right_pos': indices.ravel(),
+    })
+
+
+def find_crm_duplicates(df: pd.DataFrame, field_mapping: Dict, crm_companies: List[Dict],
+                        threshold: float = 0.75, top_k: int = 3, n_neighbors: int = 5) -> pd.DataFrame:
+    """
+    Match all rows of an import file against CRM companies in one pass.
+
+    Args:
+        df: Import DataFrame
+        field_mapping: API field to CSV column mapping ('name' required; 'address_zip'/'address_city' optional)
+        crm_companies: All CRM companies (e.g. from PooolAPIClient.get_all_companies)
+        threshold: Minimum name similarity (cosine over char n-grams, 0-1)
+        top_k: Maximum number of candidates per import row
+        n_neighbors: Nearest neighbours retrieved per row in addition to blocking
+
+    Returns:
+        Ranked candidate DataFrame (one row per import row/CRM company pair)
+    """
+    columns = ['row', 'import_name', 'import_zip', 'import_city', 'crm_id', 'crm_name',
+               'crm_zip', 'crm_city', 'name_similarity', 'zip_match', 'city_match', 'score', 'rank']
+
+    name_col = field_mapping.get('name')
+    if not name_col or name_col not in df.columns or not crm_companies:
+        return pd.DataFrame(columns=columns)
+
+    def mapped(field: str) -> pd.Series:
+        column = field_mapping.get(field)
+        if column and column in df.columns:
+            return df[column]
+        return pd.Series([None] * len(df), index=df.index)
+
+    left = _build_frame(df[name_col], mapped('address_zip'), mapped('address_city'))
+
+    crm_addresses = [_company_address(company) for company in crm_companies]
+    right = _build_frame(
+        pd.Series([company.get('name') for company in crm_companies]),
+        pd.Series([address[0] for address in crm_addresses]),
+        pd.Series([address[1] for address in crm_addresses]),
+    )
+    right['crm_id'] = [company.get('id') for company in crm_companies]
+
+    # Shared vocabulary so import and CRM vectors are comparable
+    vectorizer = TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 4), min_df=1)
+    vectorizer.fit(pd.concat([left['name_norm'], right['name_norm']]))
+    left_matrix = vectorizer.transform(left['name_norm'])
+    right_matrix = vectorizer.transform(right['name_norm'])
+
+    pairs = pd.concat([
+        _blocking_pairs(left, right),
+        _neighbour_pairs(left_matrix, right_matrix, n_neighbors),
+    ], ignore_index=True).drop_duplicates()
+
+    if pairs.empty:
+        return pd.DataFrame(columns=columns)
+
+    left_pos = pairs['left_pos'].to_numpy()
+    right_pos = pairs['right_pos'].to_numpy()
+
+    # Row-wise cosine similarity (TF-IDF rows are L2-normalized)
+    similarity = np.asarray(left_matrix[left_pos].multiply(right_matrix[right_pos]).sum(axis=1)).ravel()
+
+    zip_match = (left['zip_key'].to_numpy()[left_pos] == right['zip_key'].to_numpy()[right_pos]) & (left['zip_key'].to_numpy()[left_pos] != '')
+    city_match = (left['city_key'].to_numpy()[left_pos] == right['city_key'].to_numpy()[right_pos]) & (left['city_key'].to_numpy()[left_pos] != '')
+
+    candidates = pd.DataFrame({
+        'row': left_pos + 1,
+        'import_name': left['name'].to_numpy()[left_pos],
+        'import_zip': left['zip'].to_numpy()[left_pos],
+        'import_city': left['city'].to_numpy()[left_pos],
+        'crm_id': right['crm_id'].to_numpy()[right_pos],
+        'crm_name': right['name'].to_numpy()[right_pos],
+        'crm_zip': right['zip'].to_numpy()[right_pos],
+        'crm_city': right['city'].to_numpy()[right_pos],
+        'name_similarity': similarity.round(3),
+        'zip_match': zip_match,
+        'city_match': city_match,
+    })
+
+    candidates = candidates[candidates['name_similarity'] >= threshold]
+    if candidates.empty:
+        return pd.DataFrame(columns=columns)
+
+    candidates['score'] = (
+        NAME_WEIGHT * candidates['name_similarity']
+        + ZIP_WEIGHT * candidates['zip_match']
+        + CITY_WEIGHT * candidates['city_match']
+    ).round(3)
+
+    candidates = candidates.sort_values(['row', 'score'], ascending=[True, False])
+    candidates['rank'] = candidates.groupby('row').cumcount() + 1
+    candidates = candidates[candidates['rank'] <= top_k]
+
+    # Most likely duplicates first
+    return candidates.sort_values(['score', 'row'], ascending=[False, True]).reset_index(drop=True)[columns]
+
+
+def detect_crm_duplicates(api_key: str, df: pd.DataFrame, field_mapping: Dict,
+                          environment: str = "production", custom_url: str = None,
+                          threshold: float = 0.75, top_k: int = 3) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Fetch all CRM companies once and match the import file against them.
+
+    Args:
+        api_key: API key
+        df: Import DataFrame
+        field_mapping: API field to CSV column mapping
+        environment: API environment
+        custom_url: Custom URL if environment is custom
+        threshold: Minimum name similarity (0-1)
+        top_k: Maximum number of candidates per import row
+
+    Returns:
+        Tuple of (candidate DataFrame, error_message)
+    """
+    from . import create_api_client
+
+    client = create_api_client(api_key, environment, custom_url)
+    companies, error = client.get_all_companies()
+    if error:
+        return pd.DataFrame(), error
+
+    try:
+        return find_crm_duplicates(df, field_mapping, companies, threshold=threshold, top_k=top_k), None
+    except Exception as e:
+        return pd.DataFrame(), f"Fehler beim Duplikatabgleich: {str(e)}"
@@ -0,0 +1,127 @@
+"""
+Payload diffing for CRM updates.
+
+Compares prepared update payloads with the current CRM record so updates
+only send fields whose values actually change.
+"""
+
+import math
+from typing import Dict, Optional
+
+
+# Bookkeeping keys of address/contact items that do not carry data
+_IGNORED_ITEM_KEYS = {'pos', 'is_preferred'}
+
+
+def _normalize_scalar(value) -> Optional[str]:
+    """Normalize a scalar for comparison (None for empty values, '1'/'0' for booleans)."""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float) and math.isnan(value):
+        return None
+
+    normalized = str(value).strip()
+    if normalized.lower() == 'true':
+        return '1'
+    if normalized.lower() == 'false':
+        return '0'
+    return normalized or None
+
+
+def _as_number(value: str) -> Optional[float]:
+    """Parse a normalized string as number; keeps leading-zero codes (e.g. zip '01234') as strings."""
+    if len(value) > 1 and value.startswith('0') and value[1].isdigit():
+        return None
+    try:
+        return float(value.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def _scalars_equal(desired, current) -> bool:
+    desired_norm = _normalize_scalar(desired)
+    current_norm = _normalize_scalar(current)
+
+    if desired_norm == current_norm:
+        return True
+    if desired_norm is None or current_norm is None:
+        return False
+
+    desired_num = _as_number(desired_norm)
+    current_num = _as_number(current_norm)
+    return desired_num is not None and desired_num == current_num
+
+
+def _item_matches(desired: Dict, current: Dict) -> bool:
+    """Whether a current list item contains all data keys of the desired item."""
+    return all(
+        _scalars_equal(value, current.get(key))
+        for key, value in desired.items()
+        if key not in _IGNORED_ITEM_KEYS
+    )
+
+
+def _lists_equal(desired: list, current) -> bool:
+    if not isinstance(current, list):
+        return not desired
+
+    # Lists of objects (addresses, contacts): every desired item must exist
+    if any(isinstance(item, dict) for item in desired):
+        current_items = [item for item in current if isinstance(item, dict)]
+        return all(
+            any(_item_matches(item, existing) for existing in current_items)
+            for item in desired if isinstance(item, dict)
+        )
+
+    # Lists of scalars (e.g. tag IDs): compare as sets, current objects by their ID
+    desired_set = {_normalize_scalar(item) for item in desired}
+    current_set = {
+        _normalize_scalar(item.get('id') if isinstance(item, dict) else item)
+        for item in current
+    }
+    return desired_set == current_set
+
+
+def values_equal(desired, current) -> bool:
+    """
+    Compare a desired payload value with the current CRM value.
+
+    Args:
+        desired: Value from the prepared payload
+        current: Value from the current record
+
+    Returns:
+        True if sending the desired value would not change the record
+    """
+    if isinstance(desired, list):
+        return _lists_equal(desired, current)
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        return all(values_equal(value, current.get(key)) for key, value in desired.items())
+    return _scalars_equal(desired, current)
+
+
+def diff_payload(desired: Dict, current: Optional[Dict]) -> Dict:
+    """
+    Reduce a payload to the fields whose values differ from the current record.
+
+    Args:
+        desired: Prepared payload for an endpoint
+        current: Current record for that endpoint (None if unknown)
+
+    Returns:
+        Dict with the changed fields only (the full payload if current is None)
+    """
+    if not desired:
+        return {}
+    if current is None:
+        return dict(desired)
+
+    return {
+        field: value
+        for field, value in desired.items()
+        if not values_equal(value, current.get(field))
+    }
@@ -0,0 +1,191 @@
+"""
+In-memory index over a snapshot of CRM records.
+
+A snapshot is fetched once (all companies or persons) and indexed by ID and
+by normalized identifier fields, so bulk operations can match rows and read
+current values without one search request per row.
+"""
+
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..poool_api_client import PooolAPIClient
+
+
+# Identifier fields indexed by default
+DEFAULT_COMPANY_INDEX_FIELDS = ('name', 'name_token', 'customer_number')
+DEFAULT_PERSON_INDEX_FIELDS = ('email', 'firstname', 'lastname')
+
+
+def normalize_key(value) -> Optional[str]:
+    """
+    Normalize an identifier value for index lookups.
+
+    Args:
+        value: Raw value (string, number or None)
+
+    Returns:
+        Stripped, lower-cased string or None for empty values
+    """
+    if value is None:
+        return None
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if value.is_integer():
+            value = int(value)
+
+    normalized = str(value).strip().lower()
+    return normalized or None
+
+
+def _record_values(record: Dict, field: str) -> List:
+    """Return all values of a field in a record (including contact values for email/phone)."""
+    values = []
+
+    current = record
+    for part in field.split('.'):
+        current = current.get(part) if isinstance(current, dict) else None
+    if current is not None:
+        values.append(current)
+
+    # Emails are often only stored as contacts
+    if field == 'email':
+        for contact in record.get('contacts') or []:
+            value = contact.get('value') if isinstance(contact, dict) else None
+            if value and '@' in str(value):
+                values.append(value)
+
+    return values
+
+
+class EntityIndex:
+    """
+    Lookup index over CRM records by ID and by normalized identifier fields.
+
+    Lookups are read-only and lock-free; `add` is synchronized so the index can
+    be extended while bulk operations create records.
+    """
+
+    def __init__(self, records: Iterable[Dict], key_fields: Iterable[str] = DEFAULT_COMPANY_INDEX_FIELDS,
+                 entity_type: str = "companies"):
+        """
+        Build the index.
+
+        Args:
+            records: CRM records (dicts with at least an 'id')
+            key_fields: Fields to index for lookups (dotted paths allowed)
+            entity_type: "companies" or "persons"
+        """
+        self.entity_type = entity_type
+        self.key_fields = tuple(key_fields)
+        self._lock = threading.Lock()
+        self._by_id: Dict[int, Dict] = {}
+        self._by_field: Dict[str, Dict[str, List[Dict]]] = {field: {} for field in self.key_fields}
+
+        for record in records:
+            self._add(record)
+
+    def _add(self, record: Dict) -> None:
+        record_id = record.get('id')
+        if record_id is None:
+            return
+
+        try:
+            self._by_id[int(record_id)] = record
+        except (TypeError, ValueError):
+            return
+
+        for field in self.key_fields:
+            for value in _record_values(record, field):
+                key = normalize_key(value)
+                if key:
+                    self._by_field[field].setdefault(key, []).append(record)
+
+    def add(self, record: Dict) -> None:
+        """Add a record (e.g. one created during an import) to the index."""
+        with self._lock:
+            self._add(record)
+
+    def get_by_id(self, entity_id) -> Optional[Dict]:
+        """Return the record with the given ID (None if not in the snapshot)."""
+        try:
+            return self._by_id.get(int(entity_id))
+        except (TypeError, ValueError):
+            return None
+
+    def lookup(self, field: str, value) -> List[Dict]:
+        """
+        Return all records whose field matches the value (case-insensitive).
+
+        Args:
+            field: Identifier field ('id' is supported as well)
+            value: Value to look up
+
+        Returns:
+            List of matching records (empty if none or field not indexed)
+        """
+        if field.lower() == 'id':
+            record = self.get_by_id(normalize_key(value))
+            return [record] if record else []
+
+        key = normalize_key(value)
+        if key is None or field not in self._by_field:
+            return []
+        return list(self._by_field[field].get(key, []))
+
+    def find_one(self, field: str, value) -> Optional[Dict]:
+        """Return the first record matching the value (None if no match)."""
+        matches = self.lookup(field, value)
+        return matches[0] if matches else None
+
+    def indexes(self, field: str) -> bool:
+        """Whether lookups on the field are served by this index."""
+        return field.lower() == 'id' or field in self._by_field
+
+    def records(self) -> List[Dict]:
+        """All records in the snapshot."""
+        return list(self._by_id.values())
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, entity_id) -> bool:
+        return self.get_by_id(entity_id) is not None
+
+
+def build_company_index(client: PooolAPIClient,
+                        key_fields: Iterable[str] = DEFAULT_COMPANY_INDEX_FIELDS) -> Tuple[Optional[EntityIndex], Optional[str]]:
+    """
+    Fetch all companies once and build an EntityIndex.
+
+    Args:
+        client: PooolAPIClient instance
+        key_fields: Fields to index
+
+    Returns:
+        Tuple of (index, error_message)
+    """
+    companies, error = client.get_all_companies()
+    if error:
+        return None, error
+    return EntityIndex(companies, key_fields, entity_type="companies"), None
+
+
+def build_person_index(client: PooolAPIClient,
+                       key_fields: Iterable[str] = DEFAULT_PERSON_INDEX_FIELDS) -> Tuple[Optional[EntityIndex], Optional[str]]:
+    """
+    Fetch all persons once and build an EntityIndex.
+
+    Args:
+        client: PooolAPIClient instance
+        key_fields: Fields to index
+
+    Returns:
+        Tuple of (index, error_message)
+    """
+    persons, error = client.get_all_persons()
+    if error:
+        return None, error
+    return EntityIndex(persons, key_fields, entity_type="persons"), None
@@ -296,3 +296,102 @@ def get_person_field_tabs() -> Dict[str, List[str]]:
             "tags"
         ]
     }
+
+
+def get_company_field_types() -> Dict[str, str]:
+    """
+    Return the value type of company fields for import validation.
+
+    Types: 'email', 'email_list', 'phone', 'url', 'integer', 'decimal',
+    'boolean' and 'flag' (any non-empty value counts as set). Fields not
+    listed are free text.
+    """
+    return {
+        # Relationship flags (any non-empty value activates)
+        "is_client": "flag",
+        "is_supplier": "flag",
+
+        # Boolean API fields
+        "is_operator": "boolean",
+        "reference_number_required": "boolean",
+        "dunning_blocked": "boolean",
+        "dunning_document_blocked": "boolean",
+        "send_by_email": "boolean",
+        "send_by_mail": "boolean",
+        "datev_is_client_collection": "boolean",
+
+        # Day counts and percentages
+        "payment_time_day_num_client": "integer",
+        "payment_time_day_num_supplier": "integer",
+        "discount_day_num": "integer",
+        "discount_percentage": "decimal",
+
+        # Contact data
+        "contact_email": "email",
+        "contact_phone": "phone",
+        "contact_website": "url",
+        "send_bill_to_email_to": "email_list",
+        "send_bill_to_email_cc": "email_list",
+        "send_bill_to_email_bcc": "email_list",
+    }
+
+
+def get_person_field_types() -> Dict[str, str]:
+    """Return the value type of person fields for import validation (see get_company_field_types)."""
+    return {
+        "email": "email",
+        "phone": "phone",
+        "company_id": "integer",
+        "company_subsidiary_id": "integer",
+    }
+
+
+def get_field_max_lengths() -> Dict[str, int]:
+    """
+    Return the maximum value length of text fields documented by the API.
+
+    Rows exceeding these limits are skipped. docs/api_docs.json documents
+    no limits yet, so nothing is enforced; see get_field_length_hints for
+    lengths that only produce warnings.
+    """
+    return {}
+
+
+def get_field_length_hints() -> Dict[str, int]:
+    """Return usual maximum lengths of text fields; longer values are reported as warnings, not skipped."""
+    return {
+        "name": 255,
+        "name_legal": 255,
+        "name_token": 50,
+        "uid": 50,
+        "commercial_register": 100,
+        "jurisdiction": 100,
+        "management": 255,
+        "data_privacy_number": 100,
+        "salutation": 50,
+        "title": 50,
+        "firstname": 100,
+        "middlename": 100,
+        "middle_name": 100,
+        "lastname": 100,
+        "nickname": 100,
+        "position": 255,
+        "function": 255,
+        "department": 255,
+        "client_number": 50,
+        "supplier_number": 50,
+        "datev_account_client": 20,
+        "datev_account_supplier": 20,
+        "leitweg_id": 46,
+        "address_street": 255,
+        "address_house_number": 20,
+        "address_zip": 20,
+        "address_city": 100,
+        "address_country": 100,
+        "address_title": 255,
+        "contact_email": 255,
+        "contact_phone": 50,
+        "contact_website": 255,
+        "email": 255,
+        "phone": 50,
+    }
@@ -7,6 +7,11 @@ Handles single and bulk import processing for companies and persons.
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from ..poool_api_client import PooolAPIClient
+from .result_store import ResultStore
+from .progress import ProgressTracker, ProgressCallback
+from .validation import validate_rows
+from .collapse import COLLAPSE_FIRST, collapse_duplicate_rows
+from .rows import MappedRows, mapped_columns
 
 
 def process_single_import(client: PooolAPIClient, index: int, row_data: Dict, field_mapping: Dict, import_type: str, country_cache: Optional[Dict[str, int]] = None, tag_mappings: Optional[Dict] = None, tag_cache: Optional[Dict[str, int]] = None, client_number_range_id: Optional[int] = None, supplier_number_range_id: Optional[int] = None) -> Dict:
@@ -168,11 +173,46 @@ def process_single_import(client: PooolAPIClient, index: int, row_data: Dict, fi
         }
 
 
-def bulk_import_generic(client: PooolAPIClient, df, field_mapping: Dict, import_type: str, tag_mappings: Dict = None) -> Tuple[List[Dict], List[Dict]]:
-    """Generic bulk import function for companies or persons."""
+def _for_source_row(result: Dict, row: int, source_rows: List[int]) -> Dict:
+    """Return the outcome of a collapsed row as recorded for one of its source rows."""
+    if len(source_rows) == 1:
+        return result
+
+    note = f"Zusammengeführt mit Zeile(n) {', '.join(str(r) for r in source_rows if r != row)}"
+    if not result['success']:
+        return {**result, 'error': f"{result['error']} ({note})"}
+    return {**result, 'result': {**result['result'], 'row': row, 'warnings': [note]}}
+
+
+def bulk_import_generic(client: PooolAPIClient, df, field_mapping: Dict, import_type: str, tag_mappings: Dict = None,
+                        result_store: Optional[ResultStore] = None,
+                        progress_callback: Optional[ProgressCallback] = None,
+                        collapse_duplicates: bool = False,
+                        conflict_policy: str = COLLAPSE_FIRST) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Generic bulk import function for companies or persons.
+
+    If a result_store is given, outcomes are recorded there in columnar form
+    and the returned lists stay empty. If a progress_callback is given, it is
+    called with ProgressEvent snapshots while rows are processed.
+
+    With collapse_duplicates, company rows describing the same company are
+    merged first (see collapse_duplicate_rows); each company is created once
+    and its outcome is recorded for every source row.
+    """
     successful = []
     failed = []
 
+    # Merge in-file duplicates into one row per company
+    source_df = df
+    groups = None
+    conflicts = {}
+    if collapse_duplicates and import_type == 'companies':
+        collapsed = collapse_duplicate_rows(df, field_mapping, tag_mappings, conflict_policy)
+        df, groups, conflicts, tag_mappings = collapsed.df, collapsed.groups, collapsed.conflicts, collapsed.tag_mappings
+        if collapsed.collapsed_count:
+            print(f"Collapsed {collapsed.collapsed_count} duplicate rows into {len(df)} companies")
+
     # Initialize country cache for address country lookups
     country_cache = {}
     if import_type == 'companies':
@@ -204,19 +244,39 @@ def bulk_import_generic(client: PooolAPIClient, df, field_mapping: Dict, import_
         if error:
             print(f"Warning: Could not fetch supplier number range: {error}")
 
-    # Pre-convert DataFrame to dict for better performance
-    records = df.to_dict('records')
+    # Rows failing field validation are reported without sending any request
+    row_errors = validate_rows(df, field_mapping, import_type).tolist()
 
-    for index, row_data in enumerate(records, 1):
-        result = process_single_import(client, index, row_data, field_mapping, import_type, country_cache, tag_mappings, tag_cache, client_number_range_id, supplier_number_range_id)
+    # Rows are read lazily, restricted to the mapped columns
+    columns = mapped_columns(field_mapping, tag_mappings)
+    source_rows_reader = MappedRows(source_df, columns)
+    tracker = ProgressTracker(len(source_df), progress_callback)
 
-        if result['success']:
-            successful.append(result['result'])
+    for position, row_data in enumerate(MappedRows(df, columns)):
+        source_rows = groups[position] if groups is not None else [position + 1]
+
+        if position in conflicts:
+            result = {'success': False, 'error': conflicts[position]}
+        elif row_errors[position] is not None:
+            result = {'success': False, 'error': f"Validation failed: {row_errors[position]}"}
         else:
-            failed.append({
-                'row': index,
-                'data': {k: v for k, v in row_data.items() if pd.notna(v)},
-                'error': result['error']
-            })
+            result = process_single_import(client, source_rows[0], row_data, field_mapping, import_type, country_cache, tag_mappings, tag_cache, client_number_range_id, supplier_number_range_id)
+
+        for index in source_rows:
+            outcome = _for_source_row(result, index, source_rows)
+            source_data = source_rows_reader.row(index - 1) if groups is not None else row_data
+
+            if result_store is not None:
+                result_store.add_outcome(index, outcome, source_data)
+            elif outcome['success']:
+                successful.append(outcome['result'])
+            else:
+                failed.append({
+                    'row': index,
+                    'data': {k: v for k, v in source_data.items() if pd.notna(v)},
+                    'error': outcome['error']
+                })
+
+        tracker.update(result['success'], count=len(source_rows))
 
     return successful, failed
@@ -74,10 +74,12 @@ def prepare_person_data_with_company_lookup(client: PooolAPIClient, row_data: Di
     return person_data, warnings
 
 
-def bulk_import_persons(api_key: str, df, field_mapping: Dict, environment: str = "production", custom_url: str = None, tag_mappings: Dict = None) -> Tuple[List[Dict], List[Dict]]:
+def bulk_import_persons(api_key: str, df, field_mapping: Dict, environment: str = "production", custom_url: str = None, tag_mappings: Dict = None,
+                        result_store=None, progress_callback=None) -> Tuple[List[Dict], List[Dict]]:
     """Import multiple persons from DataFrame."""
     from . import create_api_client
     from .import_operations import bulk_import_generic
 
     client = create_api_client(api_key, environment, custom_url)
-    return bulk_import_generic(client, df, field_mapping, 'persons', tag_mappings)
+    return bulk_import_generic(client, df, field_mapping, 'persons', tag_mappings, result_store=result_store,
+                               progress_callback=progress_callback)
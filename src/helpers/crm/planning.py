@@ -0,0 +1,243 @@
+"""
+Pre-flight request budget for CRM imports, updates and upserts.
+
+Analyzes the mapped input file without any network call and estimates how
+many API requests a run will send (lookups, tag and country creation,
+company/person writes, client/supplier activations) and how long it will
+take, based on the latency recently measured by the API client.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import pandas as pd
+
+from ..request_metrics import RequestMetrics, get_request_metrics
+from .field_definitions import get_client_fields, get_supplier_fields
+from .tag_operations import parse_comma_separated_tags
+from .update_operations import UPDATE_MAX_WORKERS
+
+# Latency assumed when no requests have been measured yet (seconds)
+DEFAULT_REQUEST_LATENCY = 0.3
+
+# Page size of the bulk listing endpoints (snapshot index, countries, tags)
+LIST_PAGE_SIZE = 100
+
+# Labels of the request categories, in display order
+REQUEST_CATEGORY_LABELS = {
+    'setup': "Vorab geladene Listen",
+    'index': "Bestandsabgleich (Index, Untergrenze)",
+    'lookups': "Abgleich pro Zeile",
+    'company_lookups': "Firmen-Suche für Personen",
+    'tags': "Neue Tags",
+    'countries': "Neue Länder",
+    'writes': "Schreibzugriffe",
+    'activations': "Kunden-/Lieferanten-Aktivierungen",
+}
+
+
+@dataclass
+class RequestBudget:
+    """
+    Estimated requests and duration of a bulk run.
+
+    Requests sent once per run (list prefetches, tag and country creation)
+    run sequentially; per-row requests are spread over `concurrency` workers.
+    Tag and country counts are upper bounds: names already in the CRM do not
+    cause a request, which is only known once the run loads the lists.
+    The index pages are a lower bound: the run pages through all records of
+    the CRM, whose size is not known before the run.
+    """
+    rows: int
+    requests: Dict[str, int] = field(default_factory=dict)
+    distinct: Dict[str, int] = field(default_factory=dict)
+    per_row_requests: int = 0
+    concurrency: int = 1
+    latency_seconds: float = DEFAULT_REQUEST_LATENCY
+    latency_measured: bool = False
+    index_lower_bound: bool = False
+
+    @property
+    def total_requests(self) -> int:
+        """Total number of requests of the run."""
+        return sum(self.requests.values())
+
+    @property
+    def estimated_seconds(self) -> float:
+        """Expected duration in seconds."""
+        sequential = self.total_requests - self.per_row_requests
+        return (sequential + self.per_row_requests / max(1, self.concurrency)) * self.latency_seconds
+
+    def breakdown(self) -> Dict[str, int]:
+        """Non-zero request counts keyed by their display label."""
+        return {REQUEST_CATEGORY_LABELS.get(k, k): v for k, v in self.requests.items() if v}
+
+
+def _non_empty(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """Boolean mask of rows with a non-empty value in column (all False if unmapped)."""
+    if not column or column not in df.columns:
+        return pd.Series(False, index=df.index)
+    values = df[column]
+    return values.notna() & values.astype(str).str.strip().ne('') & values.astype(str).str.lower().ne('nan')
+
+
+def _distinct_values(df: pd.DataFrame, column: Optional[str]) -> int:
+    """Number of distinct non-empty values of a column (case-insensitive)."""
+    mask = _non_empty(df, column)
+    if not mask.any():
+        return 0
+    return df.loc[mask, column].astype(str).str.strip().str.lower().nunique()
+
+
+def count_distinct_tags(df: pd.DataFrame, tag_mappings: Optional[Dict[str, str]]) -> int:
+    """
+    Count the distinct tag names a file assigns (case-insensitive).
+
+    Parses the tag columns the same way as the import: comma separated,
+    single tag per cell, or one-hot columns (one tag per column).
+
+    Args:
+        df: Input DataFrame
+        tag_mappings: Dict mapping CSV column to tag format
+
+    Returns:
+        Number of distinct tag names
+    """
+    names = set()
+    for column, format_type in (tag_mappings or {}).items():
+        if column not in df.columns:
+            continue
+
+        values = df[column].dropna().unique()
+        if format_type == 'comma_separated':
+            for value in values:
+                names.update(tag.lower() for tag in parse_comma_separated_tags(value))
+        elif format_type == 'single_tag':
+            for value in values:
+                tag = str(value).strip()
+                if tag and tag.lower() not in ['nan', 'none', '']:
+                    names.add(tag.lower())
+        elif format_type == 'one_hot':
+            if any(str(value).lower() in ['1', 'true', 'yes', '1.0'] for value in values):
+                names.add(f"one_hot:{column.lower()}")
+
+    return len(names)
+
+
+def _recent_latency(metrics: Optional[RequestMetrics], base_url: Optional[str]) -> Optional[float]:
+    """Median latency of recent requests, if any were measured."""
+    if metrics is None:
+        if not base_url:
+            return None
+        metrics = get_request_metrics(base_url)
+    return metrics.recent_latency()
+
+
+def estimate_request_budget(df: pd.DataFrame, field_mapping: Dict, entity_type: str = "companies",
+                            operation: str = "import", tag_mappings: Optional[Dict[str, str]] = None,
+                            identifier_field: Optional[str] = None, skip_unchanged: bool = False,
+                            max_workers: int = UPDATE_MAX_WORKERS,
+                            metrics: Optional[RequestMetrics] = None,
+                            base_url: Optional[str] = None) -> RequestBudget:
+    """
+    Estimate the requests and duration of an import, update or upsert.
+
+    Works on the file alone: distinct tags, countries and company names are
+    counted locally and no request is sent. Writes of update rows are upper
+    bounds when only changed fields are sent.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        entity_type: "companies" or "persons"
+        operation: "import", "update" or "upsert"
+        tag_mappings: Tag column mappings (imports and upserts)
+        identifier_field: API field used to match existing records (updates and upserts)
+        skip_unchanged: Updates fetch a snapshot of all records instead of per-row lookups
+        max_workers: Rows processed concurrently by updates and upserts
+        metrics: Request metrics to take the latency from (default: metrics of base_url)
+        base_url: API base URL the operation will run against (default latency without metrics or base URL)
+
+    Returns:
+        RequestBudget with request counts per category and the expected duration
+    """
+    rows = len(df)
+    requests: Dict[str, int] = {key: 0 for key in REQUEST_CATEGORY_LABELS}
+    distinct: Dict[str, int] = {}
+    is_companies = entity_type == 'companies'
+    creates = operation in ('import', 'upsert')
+
+    # Lists loaded once per run (at least one page each)
+    if is_companies:
+        requests['setup'] += 1  # countries
+        if creates:
+            requests['setup'] += 4  # client and supplier number ranges (groups + ranges each)
+    if creates and tag_mappings:
+        requests['setup'] += 1  # tags
+
+    # Snapshot of all existing records (upsert always, update when diffing). The CRM size is
+    # unknown here; assuming it holds at least the file's records gives a lower bound.
+    uses_index = operation == 'upsert' or (operation == 'update' and skip_unchanged)
+    if uses_index:
+        requests['index'] = max(1, math.ceil(rows / LIST_PAGE_SIZE))
+
+    # Per-row matching of updates without snapshot
+    if operation == 'update' and not uses_index and identifier_field:
+        requests['lookups'] = int(_non_empty(df, field_mapping.get(identifier_field)).sum())
+
+    # New tags: each costs a tag list check plus the creation
+    if creates:
+        distinct['tags'] = count_distinct_tags(df, tag_mappings)
+        requests['tags'] = 2 * distinct['tags']
+
+    if is_companies:
+        # New countries are created once and cached for the run
+        distinct['countries'] = _distinct_values(df, field_mapping.get('address_country'))
+        requests['countries'] = distinct['countries']
+
+        client_field_names = set(get_client_fields())
+        supplier_field_names = set(get_supplier_fields())
+
+        if creates:
+            requests['writes'] = int(_non_empty(df, field_mapping.get('name')).sum())
+            requests['activations'] = int(
+                _non_empty(df, field_mapping.get('is_client')).sum() +
+                _non_empty(df, field_mapping.get('is_supplier')).sum()
+            )
+        else:
+            # One write per endpoint with at least one non-empty mapped field
+            endpoint_masks = {'company': pd.Series(False, index=df.index),
+                              'client': pd.Series(False, index=df.index),
+                              'supplier': pd.Series(False, index=df.index)}
+            for api_field, column in field_mapping.items():
+                if api_field == identifier_field:
+                    continue
+                endpoint = ('client' if api_field in client_field_names
+                            else 'supplier' if api_field in supplier_field_names
+                            else 'company')
+                endpoint_masks[endpoint] |= _non_empty(df, column)
+            requests['writes'] = int(sum(mask.sum() for mask in endpoint_masks.values()))
+    else:
+        # Persons: the linked company is searched by name for every row
+        company_column = field_mapping.get('company')
+        if creates:
+            requests['company_lookups'] = int(_non_empty(df, company_column).sum())
+            distinct['company_names'] = _distinct_values(df, company_column)
+        requests['writes'] = rows
+
+    per_row = requests['lookups'] + requests['company_lookups'] + requests['writes'] + requests['activations']
+    concurrency = 1 if operation == 'import' else max(1, max_workers)
+
+    latency = _recent_latency(metrics, base_url)
+
+    return RequestBudget(
+        rows=rows,
+        requests=requests,
+        distinct=distinct,
+        per_row_requests=per_row,
+        concurrency=concurrency,
+        latency_seconds=latency if latency is not None else DEFAULT_REQUEST_LATENCY,
+        latency_measured=latency is not None,
+        index_lower_bound=uses_index,
+    )
@@ -0,0 +1,161 @@
+"""
+Progress tracking for CRM bulk operations.
+
+Bulk import/update functions report per-row progress through a callback that
+receives ProgressEvent snapshots (rows completed, success/failure counts,
+current throughput and a moving-average ETA).
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class ProgressEvent:
+    """Snapshot of a running bulk operation."""
+    completed: int
+    total: int
+    successful: int
+    failed: int
+    rows_per_second: float
+    eta_seconds: Optional[float]
+    elapsed_seconds: float
+
+    @property
+    def fraction(self) -> float:
+        """Completed fraction between 0.0 and 1.0."""
+        return min(self.completed / self.total, 1.0) if self.total else 1.0
+
+    @property
+    def finished(self) -> bool:
+        """Whether all rows have been processed."""
+        return self.completed >= self.total
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """
+    Format a duration in seconds for display.
+
+    Args:
+        seconds: Duration in seconds (None if unknown)
+
+    Returns:
+        Human readable duration (e.g. "45s", "3m 12s", "1h 05m")
+    """
+    if seconds is None:
+        return "–"
+
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {(seconds % 3600) // 60:02d}m"
+
+
+class ProgressTracker:
+    """
+    Thread-safe per-row progress counter.
+
+    Throughput is measured over a sliding window of the most recent updates
+    (each weighted by its row count, so batched updates report the real row
+    rate), and the ETA follows the current API speed instead of the average
+    since start.
+    Callbacks are throttled to `min_interval` seconds; the final event is always
+    emitted.
+    """
+
+    def __init__(self, total: int, callback: Optional[ProgressCallback] = None,
+                 window: int = 50, min_interval: float = 0.25):
+        """
+        Initialize the tracker.
+
+        Args:
+            total: Total number of rows to process
+            callback: Optional function called with ProgressEvent snapshots
+            window: Number of recent updates used for the moving-average rate
+            min_interval: Minimum seconds between two callback invocations
+        """
+        self.total = total
+        self.callback = callback
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        # (timestamp, rows) per update; the oldest entry only marks the window start
+        self._updates = deque([(self._start, 0)], maxlen=window + 1)
+        self._last_emit = 0.0
+        self.completed = 0
+        self.successful = 0
+        self.failed = 0
+
+    def update(self, success: bool, count: int = 1) -> None:
+        """
+        Record processed rows and notify the callback if due.
+
+        Args:
+            success: Whether the rows succeeded
+            count: Number of rows processed
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self.completed += count
+            if success:
+                self.successful += count
+            else:
+                self.failed += count
+            self._updates.append((now, count))
+
+            if self.callback is None:
+                return
+
+            due = now - self._last_emit >= self.min_interval or self.completed >= self.total
+            if not due:
+                return
+
+            self._last_emit = now
+            event = self._snapshot(now)
+
+        # Call outside the lock so slow renderers never block other workers
+        try:
+            self.callback(event)
+        except Exception as e:
+            print(f"Warning: Progress callback failed: {str(e)}")
+
+    def snapshot(self) -> ProgressEvent:
+        """Return the current progress without notifying the callback."""
+        with self._lock:
+            return self._snapshot(time.monotonic())
+
+    def _snapshot(self, now: float) -> ProgressEvent:
+        """Build a ProgressEvent. Caller must hold the lock."""
+        elapsed = now - self._start
+
+        rows_in_window = sum(count for _, count in self._updates) - self._updates[0][1]
+        window_seconds = self._updates[-1][0] - self._updates[0][0]
+        if rows_in_window > 0 and window_seconds > 0:
+            rate = rows_in_window / window_seconds
+        elif elapsed > 0:
+            rate = self.completed / elapsed
+        else:
+            rate = 0.0
+
+        remaining = max(self.total - self.completed, 0)
+        eta = remaining / rate if rate > 0 else None
+
+        return ProgressEvent(
+            completed=self.completed,
+            total=self.total,
+            successful=self.successful,
+            failed=self.failed,
+            rows_per_second=rate,
+            eta_seconds=eta,
+            elapsed_seconds=elapsed
+        )
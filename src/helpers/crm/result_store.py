@@ -0,0 +1,628 @@
+"""
+Columnar result store for CRM import and update operations.
+
+Keeps one compact row per processed record (row number, status, entity ID,
+endpoints, error code/message) in Arrow record batches instead of holding
+full row data and API responses in Python dicts. Full payloads can optionally
+be spilled to local Parquet files and loaded on demand.
+"""
+
+import io
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Iterable
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+RESULT_SCHEMA = pa.schema([
+    ('row', pa.int64()),
+    ('status', pa.string()),
+    ('action', pa.string()),
+    ('entity_id', pa.int64()),
+    ('entity_name', pa.string()),
+    ('identifier', pa.string()),
+    ('endpoints', pa.string()),
+    ('endpoints_skipped', pa.string()),
+    ('fields', pa.string()),
+    ('partial_success', pa.bool_()),
+    ('error_code', pa.int32()),
+    ('error_class', pa.string()),
+    ('error_message', pa.string()),
+    ('data_preview', pa.string()),
+    ('warnings', pa.string()),
+])
+
+PAYLOAD_SCHEMA = pa.schema([
+    ('row', pa.int64()),
+    ('payload', pa.string()),
+])
+
+# German client messages without an explicit HTTP status (see PooolAPIClient._handle_api_response)
+_ERROR_CODE_PREFIXES = {
+    'Validierungsfehler': 422,
+    'Ungültige Anfrage': 400,
+    'Authentifizierung fehlgeschlagen': 401,
+    'Zugriff verweigert': 403,
+    'Ratenlimit überschritten': 429,
+}
+
+# Status codes only in the client's own formats ("HTTP 503", "Serverfehler (500)", "…: 404 - …").
+# Bare numbers are ignored: exception texts contain ports and other numbers (e.g. "port=443").
+_STATUS_CODE_PATTERN = re.compile(
+    r'\bHTTP ([1-5]\d{2})\b'
+    r'|(?:Serverfehler|API-Fehler|Ungültige Anfrage) \(([1-5]\d{2})\)'
+    r'|: ([1-5]\d{2}) - '
+)
+
+# Error classes: transient failures may succeed when retried, permanent ones need data fixes.
+# Uncertain failures are creates that timed out, lost the connection or got a server error: the record may
+# already exist in the CRM, so they are never retried automatically.
+ERROR_CLASS_TRANSIENT = 'transient'
+ERROR_CLASS_PERMANENT = 'permanent'
+ERROR_CLASS_UNCERTAIN = 'uncertain'
+
+TRANSIENT_ERROR_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+# Statuses of a create that may have been applied before the response was lost
+# (server or proxy errors can be returned after the record was written)
+UNCERTAIN_CREATE_CODES = {500, 502, 504}
+
+# Network-level failures surfaced as exception text (requests/urllib3) or client messages
+_TRANSIENT_PATTERN = re.compile(
+    r'timeout|timed out|zeitüberschreitung|connection|verbindung|max retries|temporarily|ratenlimit',
+    re.IGNORECASE
+)
+
+
+def extract_error_code(error_message: Optional[str]) -> Optional[int]:
+    """
+    Derive an HTTP-like error code from a client error message.
+
+    Args:
+        error_message: Error message as returned by PooolAPIClient
+
+    Returns:
+        Status code if one can be determined, None otherwise
+    """
+    if not error_message:
+        return None
+
+    match = _STATUS_CODE_PATTERN.search(error_message)
+    if match:
+        return int(next(group for group in match.groups() if group))
+
+    for prefix, code in _ERROR_CODE_PREFIXES.items():
+        if prefix in error_message:
+            return code
+
+    return None
+
+
+def classify_error(error_message: Optional[str], error_code: Optional[int] = None,
+                   create: bool = False) -> Optional[str]:
+    """
+    Classify a client error message as transient, permanent or uncertain.
+
+    Rate limits, server errors and network failures (timeouts, connection
+    errors) are transient; validation, authentication and other client
+    errors are permanent. For creates, network failures and server or
+    gateway errors (500, 502, 504) are uncertain instead: the POST may have
+    reached the server, and sending it again could create a duplicate.
+
+    Args:
+        error_message: Error message as returned by PooolAPIClient
+        error_code: Status code if already known (derived from the message otherwise)
+        create: Whether the failed request created a record
+
+    Returns:
+        ERROR_CLASS_TRANSIENT, ERROR_CLASS_PERMANENT, ERROR_CLASS_UNCERTAIN
+        or None if there is no error
+    """
+    if not error_message:
+        return None
+
+    code = error_code if error_code is not None else extract_error_code(error_message)
+    if create and (code in UNCERTAIN_CREATE_CODES or (code is None and _TRANSIENT_PATTERN.search(error_message))):
+        return ERROR_CLASS_UNCERTAIN
+    if code in TRANSIENT_ERROR_CODES:
+        return ERROR_CLASS_TRANSIENT
+    if code is None and _TRANSIENT_PATTERN.search(error_message):
+        return ERROR_CLASS_TRANSIENT
+    return ERROR_CLASS_PERMANENT
+
+
+def _build_data_preview(row_data: Optional[Dict], max_fields: int = 3) -> Optional[str]:
+    """Build a short 'key: value' preview of the first non-empty fields of a row."""
+    if not row_data:
+        return None
+
+    sample = []
+    for key, value in row_data.items():
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            continue
+        sample.append(f"{key}: {value}")
+        if len(sample) >= max_fields:
+            break
+
+    return " | ".join(sample) if sample else None
+
+
+class ResultStore:
+    """
+    Columnar store for per-row outcomes of bulk CRM operations.
+
+    Rows are buffered in plain column lists and flushed into Arrow record
+    batches every `batch_size` rows. Readers get an Arrow table (or a pandas
+    view of it) that is only materialized when requested.
+    """
+
+    def __init__(self,
+                 operation_type: str = "import",
+                 entity_type: str = "companies",
+                 spill_path: Optional[str] = None,
+                 batch_size: int = 1000,
+                 dry_run: bool = False):
+        """
+        Initialize the result store.
+
+        Args:
+            operation_type: "import" or "update"
+            entity_type: "companies" or "persons"
+            spill_path: Optional directory for spilling full payloads as Parquet files
+            batch_size: Number of rows buffered before flushing to an Arrow batch
+            dry_run: Whether the results come from a dry run
+        """
+        self.operation_type = operation_type
+        self.entity_type = entity_type
+        self.spill_path = spill_path
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+        self._lock = threading.Lock()
+        self._batches: List[pa.RecordBatch] = []
+        self._buffer: Dict[str, list] = {name: [] for name in RESULT_SCHEMA.names}
+        self._payload_buffer: Dict[str, list] = {name: [] for name in PAYLOAD_SCHEMA.names}
+        self._payload_parts = 0
+        self._table_cache: Optional[pa.Table] = None
+        self._success_count = 0
+        self._failure_count = 0
+        self._skipped_count = 0
+        self._writes_avoided = 0
+
+        if spill_path:
+            os.makedirs(spill_path, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def add_success(self,
+                    row: int,
+                    entity_id: Optional[int] = None,
+                    entity_name: Optional[str] = None,
+                    identifier: Optional[str] = None,
+                    endpoints: Optional[Iterable[str]] = None,
+                    fields: Optional[Iterable[str]] = None,
+                    warnings: Optional[Iterable[str]] = None,
+                    payload: Optional[Dict] = None,
+                    endpoints_skipped: Optional[Iterable[str]] = None,
+                    skipped: bool = False,
+                    action: Optional[str] = None) -> None:
+        """Record a successful row (status 'skipped' if nothing had to be written)."""
+        self._append(
+            action=action,
+            row=row,
+            status='skipped' if skipped else 'success',
+            entity_id=entity_id,
+            entity_name=entity_name,
+            identifier=identifier,
+            endpoints=endpoints,
+            endpoints_skipped=endpoints_skipped,
+            fields=fields,
+            warnings=warnings,
+            payload=payload
+        )
+
+    def add_failure(self,
+                    row: int,
+                    error: str,
+                    row_data: Optional[Dict] = None,
+                    partial_success: bool = False,
+                    identifier: Optional[str] = None,
+                    payload: Optional[Dict] = None,
+                    action: Optional[str] = None) -> None:
+        """Record a failed row."""
+        self._append(
+            action=action,
+            row=row,
+            status='failed',
+            identifier=identifier,
+            partial_success=partial_success,
+            error_message=error,
+            data_preview=_build_data_preview(row_data),
+            payload=payload
+        )
+
+    def add_outcome(self, row: int, outcome: Dict, row_data: Dict) -> None:
+        """
+        Record the dict returned by process_single_import or process_single_update.
+
+        Args:
+            row: 1-based row number in the source file
+            outcome: Result dict with 'success' and 'result' or 'error'
+            row_data: Original row data (used for previews and payload spilling)
+        """
+        clean_data = {k: v for k, v in row_data.items() if v is not None and not (not isinstance(v, str) and pd.isna(v))}
+
+        if not outcome.get('success'):
+            self.add_failure(
+                row,
+                outcome.get('error', 'Unbekannter Fehler'),
+                row_data=clean_data,
+                partial_success=outcome.get('partial_success', False),
+                payload={'data': clean_data} if self.spill_path else None
+            )
+            return
+
+        result = outcome.get('result', {})
+        created = result.get('created') or {}
+
+        if self.entity_type == 'companies':
+            entity_id = result.get('company_id') or created.get('id')
+            entity_name = created.get('name')
+        else:
+            entity_id = result.get('person_id') or created.get('id')
+            entity_name = f"{created.get('firstname', '')} {created.get('lastname', '')}".strip() or None
+
+        endpoints = result.get('endpoints_updated') or result.get('activated')
+        fields = result.get('fields_updated') or result.get('fields_to_update')
+
+        payload = None
+        if self.spill_path:
+            payload = {'data': clean_data, 'result': result}
+
+        self.add_success(
+            row,
+            entity_id=entity_id,
+            entity_name=entity_name,
+            identifier=result.get('identifier'),
+            endpoints=endpoints,
+            fields=fields,
+            warnings=list(result.get('activation_warnings') or []) + list(result.get('warnings') or []),
+            payload=payload,
+            endpoints_skipped=result.get('endpoints_skipped'),
+            skipped=result.get('skipped', False)
+        )
+
+    def _append(self, row: int, status: str, entity_id: Optional[int] = None,
+                entity_name: Optional[str] = None, identifier: Optional[str] = None,
+                endpoints: Optional[Iterable[str]] = None, endpoints_skipped: Optional[Iterable[str]] = None,
+                fields: Optional[Iterable[str]] = None, partial_success: bool = False, error_message: Optional[str] = None,
+                data_preview: Optional[str] = None, warnings: Optional[Iterable[str]] = None,
+                payload: Optional[Dict] = None, action: Optional[str] = None) -> None:
+        """Append a single row to the column buffers (thread-safe)."""
+        with self._lock:
+            buffer = self._buffer
+            buffer['row'].append(int(row))
+            buffer['status'].append(status)
+            buffer['action'].append(action)
+            buffer['entity_id'].append(int(entity_id) if entity_id not in (None, '') else None)
+            buffer['entity_name'].append(str(entity_name) if entity_name is not None else None)
+            buffer['identifier'].append(str(identifier) if identifier is not None else None)
+            buffer['endpoints'].append(','.join(endpoints) if endpoints else None)
+            buffer['endpoints_skipped'].append(','.join(endpoints_skipped) if endpoints_skipped else None)
+            buffer['fields'].append(','.join(fields) if fields else None)
+            buffer['partial_success'].append(bool(partial_success))
+            error_code = extract_error_code(error_message)
+            buffer['error_code'].append(error_code)
+            buffer['error_class'].append(classify_error(error_message, error_code, create=self.operation_type == 'import'))
+            buffer['error_message'].append(error_message)
+            buffer['data_preview'].append(data_preview)
+            buffer['warnings'].append('; '.join(warnings) if warnings else None)
+
+            if status == 'success':
+                self._success_count += 1
+            elif status == 'skipped':
+                self._skipped_count += 1
+            else:
+                self._failure_count += 1
+            if endpoints_skipped:
+                self._writes_avoided += len(list(endpoints_skipped))
+
+            if payload is not None and self.spill_path:
+                self._payload_buffer['row'].append(int(row))
+                self._payload_buffer['payload'].append(json.dumps(payload, default=str, ensure_ascii=False))
+
+            self._table_cache = None
+
+            if len(buffer['row']) >= self.batch_size:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Move buffered rows into an Arrow record batch. Caller must hold the lock."""
+        if self._buffer['row']:
+            self._batches.append(pa.RecordBatch.from_pydict(self._buffer, schema=RESULT_SCHEMA))
+            self._buffer = {name: [] for name in RESULT_SCHEMA.names}
+
+        if self._payload_buffer['row']:
+            part_file = os.path.join(self.spill_path, f"payloads-{self._payload_parts:05d}.parquet")
+            pq.write_table(pa.Table.from_pydict(self._payload_buffer, schema=PAYLOAD_SCHEMA), part_file)
+            self._payload_parts += 1
+            self._payload_buffer = {name: [] for name in PAYLOAD_SCHEMA.names}
+
+    def flush(self) -> None:
+        """Flush buffered rows and payloads."""
+        with self._lock:
+            self._flush_locked()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._success_count + self._skipped_count + self._failure_count
+
+    @property
+    def success_count(self) -> int:
+        """Number of successful rows."""
+        return self._success_count
+
+    @property
+    def skipped_count(self) -> int:
+        """Number of rows skipped because nothing changed."""
+        return self._skipped_count
+
+    @property
+    def writes_avoided(self) -> int:
+        """Number of endpoint write requests avoided by diffing."""
+        return self._writes_avoided
+
+    @property
+    def failure_count(self) -> int:
+        """Number of failed rows."""
+        return self._failure_count
+
+    @property
+    def table(self) -> pa.Table:
+        """All recorded rows as an Arrow table (sorted by row number)."""
+        with self._lock:
+            if self._table_cache is None:
+                self._flush_locked()
+                if self._batches:
+                    table = pa.Table.from_batches(self._batches, schema=RESULT_SCHEMA)
+                    table = table.sort_by('row')
+                else:
+                    table = RESULT_SCHEMA.empty_table()
+                self._table_cache = table
+            return self._table_cache
+
+    def filter(self, status: Optional[str] = None) -> pa.Table:
+        """Return recorded rows, optionally filtered by status."""
+        table = self.table
+        if status:
+            table = table.filter(pc.equal(table['status'], status))
+        return table
+
+    def transient_failure_rows(self) -> List[int]:
+        """
+        Row numbers of failures that may succeed when retried.
+
+        Partially successful imports (and upserts) are excluded, as retrying
+        them could create the record a second time.
+        """
+        table = self.filter('failed')
+        mask = pc.equal(table['error_class'], ERROR_CLASS_TRANSIENT)
+        if self.operation_type in ('import', 'upsert'):
+            mask = pc.and_(mask, pc.invert(table['partial_success']))
+        return table.filter(mask)['row'].to_pylist()
+
+    def uncertain_failure_rows(self) -> List[int]:
+        """Row numbers of creates that failed with a lost response (the record may exist)."""
+        table = self.filter('failed')
+        return table.filter(pc.equal(table['error_class'], ERROR_CLASS_UNCERTAIN))['row'].to_pylist()
+
+    def to_pandas(self, status: Optional[str] = None, limit: Optional[int] = None,
+                  columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Materialize (a slice of) the results as a DataFrame.
+
+        Args:
+            status: Optional status filter ('success', 'skipped' or 'failed')
+            limit: Optional maximum number of rows
+            columns: Optional subset of columns
+
+        Returns:
+            DataFrame with the requested rows
+        """
+        table = self.filter(status)
+        if limit is not None:
+            table = table.slice(0, limit)
+        if columns:
+            table = table.select(columns)
+        return table.to_pandas()
+
+    def records(self, status: Optional[str] = None) -> List[Dict]:
+        """Return rows as a list of dicts (for callers that need plain Python objects)."""
+        return self.filter(status).to_pylist()
+
+    def load_payloads(self, rows: Optional[List[int]] = None) -> Dict[int, Dict]:
+        """
+        Load spilled payloads from the Parquet files.
+
+        Args:
+            rows: Optional list of row numbers to load (all rows if None)
+
+        Returns:
+            Dict mapping row number to payload dict (empty if spilling is disabled)
+        """
+        if not self.spill_path:
+            return {}
+
+        self.flush()
+        if self._payload_parts == 0:
+            return {}
+
+        filters = [('row', 'in', list(rows))] if rows else None
+        table = pq.read_table(self.spill_path, schema=PAYLOAD_SCHEMA, filters=filters)
+
+        return {
+            row: json.loads(payload)
+            for row, payload in zip(table['row'].to_pylist(), table['payload'].to_pylist())
+        }
+
+    def to_csv_bytes(self, status: Optional[str] = None) -> bytes:
+        """Serialize results to CSV directly from Arrow."""
+        output = io.BytesIO()
+        pa_csv.write_csv(self.filter(status), output)
+        return output.getvalue()
+
+    def to_parquet_bytes(self, status: Optional[str] = None) -> bytes:
+        """Serialize results to Parquet directly from Arrow."""
+        output = io.BytesIO()
+        pq.write_table(self.filter(status), output)
+        return output.getvalue()
+
+    def merge(self, other: 'ResultStore', row_numbers: Optional[List[int]] = None,
+              action: Optional[str] = None) -> None:
+        """
+        Merge the outcomes of another store, replacing rows with the same number.
+
+        Used to fold the results of a retry run or of an upsert group back into
+        the combined results.
+
+        Args:
+            other: Store with the new outcomes
+            row_numbers: Original row numbers for other's rows 1..n (if other ran on a subset)
+            action: Optional action label set on all merged rows (e.g. 'create', 'update')
+        """
+        incoming = other.table
+        if row_numbers is not None:
+            mapping = pa.array(row_numbers, type=pa.int64())
+            original_rows = pc.take(mapping, pc.subtract(incoming['row'], 1))
+            incoming = incoming.set_column(incoming.schema.get_field_index('row'), 'row', original_rows)
+        if action is not None:
+            actions = pa.array([action] * incoming.num_rows, type=pa.string())
+            incoming = incoming.set_column(incoming.schema.get_field_index('action'), 'action', actions)
+
+        with self._lock:
+            self._flush_locked()
+            current = pa.Table.from_batches(self._batches, schema=RESULT_SCHEMA) if self._batches else RESULT_SCHEMA.empty_table()
+            keep = pc.invert(pc.is_in(current['row'], value_set=incoming['row'].combine_chunks()))
+            merged = pa.concat_tables([current.filter(keep), incoming.cast(RESULT_SCHEMA)]).sort_by('row')
+
+            self._batches = merged.combine_chunks().to_batches()
+            self._recount(merged)
+            self._table_cache = None
+
+    def _recount(self, table: pa.Table) -> None:
+        """Recompute the status counters from a results table."""
+        self._success_count = pc.sum(pc.equal(table['status'], 'success')).as_py() or 0
+        self._skipped_count = pc.sum(pc.equal(table['status'], 'skipped')).as_py() or 0
+        self._failure_count = pc.sum(pc.equal(table['status'], 'failed')).as_py() or 0
+
+        skipped_endpoints = pc.split_pattern(pc.drop_null(table['endpoints_skipped']), ',')
+        self._writes_avoided = pc.sum(pc.list_value_length(skipped_endpoints)).as_py() or 0
+
+    def write(self, path: str) -> None:
+        """Write results to a CSV or Parquet file (chosen by file extension)."""
+        if path.lower().endswith('.parquet'):
+            pq.write_table(self.table, path)
+        else:
+            pa_csv.write_csv(self.table, path)
+
+    @classmethod
+    def from_table(cls, table: pa.Table, operation_type: str = "import",
+                   entity_type: str = "companies", dry_run: bool = False,
+                   spill_path: Optional[str] = None) -> 'ResultStore':
+        """
+        Build a store from an existing results table (e.g. one written by `write`).
+
+        Args:
+            table: Arrow table with the RESULT_SCHEMA columns
+            operation_type: "import" or "update"
+            entity_type: "companies" or "persons"
+            dry_run: Whether the results come from a dry run
+            spill_path: Directory with previously spilled payload files
+
+        Returns:
+            Populated ResultStore
+        """
+        store = cls(operation_type=operation_type, entity_type=entity_type, dry_run=dry_run)
+
+        # Reclassify errors, so results written by older versions never retry uncertain creates
+        actions = table['action'].to_pylist() if 'action' in table.column_names else [None] * table.num_rows
+        error_classes = pa.array([
+            classify_error(message, code, create=operation_type == 'import' or action == 'create')
+            for message, code, action in zip(table['error_message'].to_pylist(), table['error_code'].to_pylist(), actions)
+        ], type=pa.string())
+        if 'error_class' in table.column_names:
+            table = table.set_column(table.schema.get_field_index('error_class'), 'error_class', error_classes)
+        else:
+            table = table.append_column('error_class', error_classes)
+
+        # Columns added later are empty in older results
+        for schema_field in RESULT_SCHEMA:
+            if schema_field.name not in table.column_names:
+                table = table.append_column(schema_field, pa.nulls(table.num_rows, type=schema_field.type))
+
+        table = table.select(RESULT_SCHEMA.names).cast(RESULT_SCHEMA)
+
+        store._batches = table.to_batches()
+        store._recount(table)
+
+        if spill_path and os.path.isdir(spill_path):
+            store.spill_path = spill_path
+            store._payload_parts = len([f for f in os.listdir(spill_path) if f.endswith('.parquet')])
+
+        return store
+
+    @classmethod
+    def read(cls, path: str, **kwargs) -> 'ResultStore':
+        """
+        Load a store from a Parquet file written by `write`.
+
+        Args:
+            path: Path to the Parquet results file
+            **kwargs: Passed to `from_table`
+
+        Returns:
+            Populated ResultStore
+        """
+        return cls.from_table(pq.read_table(path), **kwargs)
+
+    @classmethod
+    def from_lists(cls, successful: List[Dict], failed: List[Dict], operation_type: str = "import",
+                   entity_type: str = "companies", dry_run: bool = False) -> 'ResultStore':
+        """
+        Build a store from the legacy (successful, failed) list results.
+
+        Args:
+            successful: List of successful result dicts
+            failed: List of failure dicts with 'row', 'data', 'error'
+            operation_type: "import" or "update"
+            entity_type: "companies" or "persons"
+            dry_run: Whether the results come from a dry run
+
+        Returns:
+            Populated ResultStore
+        """
+        store = cls(operation_type=operation_type, entity_type=entity_type, dry_run=dry_run)
+
+        for item in successful:
+            store.add_outcome(item.get('row', 0), {'success': True, 'result': item}, item.get('data', {}))
+
+        for item in failed:
+            store.add_outcome(
+                item.get('row', 0),
+                {'success': False, 'error': item.get('error'), 'partial_success': item.get('partial_success', False)},
+                item.get('data', {})
+            )
+
+        return store
@@ -0,0 +1,100 @@
+"""
+Targeted retry of transient failures from CRM bulk operations.
+
+Only rows whose failure was classified as transient (rate limit, server
+error, timeout) are resubmitted, with exponential backoff between rounds.
+Creates whose response was lost are classified as uncertain and never
+resubmitted, as the record may already exist.
+The new outcomes replace the failed rows in the result store, keeping the
+original row numbers.
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .result_store import ResultStore
+from .progress import ProgressCallback
+
+# Retry rounds and backoff bounds (seconds)
+RETRY_MAX_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2.0
+RETRY_MAX_DELAY = 60.0
+
+
+def backoff_delay(attempt: int, base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY) -> float:
+    """
+    Exponential backoff with jitter.
+
+    Args:
+        attempt: 1-based retry round
+        base_delay: Delay before the first round
+        max_delay: Upper bound for the delay
+
+    Returns:
+        Delay in seconds (between half and the full exponential delay)
+    """
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+
+def retry_transient_failures(source_store: ResultStore, df, bulk_function: Callable, bulk_kwargs: Dict[str, Any],
+                             result_store: Optional[ResultStore] = None,
+                             progress_callback: Optional[ProgressCallback] = None,
+                             max_attempts: int = RETRY_MAX_ATTEMPTS,
+                             base_delay: float = RETRY_BASE_DELAY,
+                             max_delay: float = RETRY_MAX_DELAY) -> Dict[str, int]:
+    """
+    Resubmit transient failures through a bulk function and merge the outcomes.
+
+    The bulk function (e.g. bulk_import_companies or bulk_update_persons) is
+    called with the failed subset of df plus bulk_kwargs. Without result_store
+    the outcomes are merged into source_store in place; with result_store
+    (as passed by the JobManager) that store receives all rows of
+    source_store with the retried rows replaced.
+
+    Args:
+        source_store: Results of the original run
+        df: The original input DataFrame (row N of the results is df row N-1)
+        bulk_function: Bulk import/update function accepting df, result_store and progress_callback
+        bulk_kwargs: Remaining arguments for the bulk function (api_key, field_mapping, ...)
+        result_store: Optional store receiving the merged results
+        progress_callback: Called with ProgressEvents of each retry round
+        max_attempts: Maximum number of retry rounds
+        base_delay: Backoff delay before the first round
+        max_delay: Maximum backoff delay
+
+    Returns:
+        Dict with 'retried', 'recovered', 'still_failing' and 'attempts'
+    """
+    target = source_store
+    if result_store is not None:
+        result_store.merge(source_store)
+        target = result_store
+
+    initial_rows = target.transient_failure_rows()
+    attempts = 0
+
+    for attempt in range(1, max_attempts + 1):
+        rows = target.transient_failure_rows()
+        if not rows:
+            break
+
+        time.sleep(backoff_delay(attempt, base_delay, max_delay))
+
+        retry_store = ResultStore(operation_type=target.operation_type, entity_type=target.entity_type,
+                                  dry_run=target.dry_run)
+        subset = df.iloc[[row - 1 for row in rows]]
+        bulk_function(df=subset, result_store=retry_store, progress_callback=progress_callback, **bulk_kwargs)
+
+        target.merge(retry_store, row_numbers=rows)
+        attempts = attempt
+
+    still_failing = set(target.filter('failed')['row'].to_pylist()).intersection(initial_rows)
+
+    return {
+        'retried': len(initial_rows),
+        'recovered': len(initial_rows) - len(still_failing),
+        'still_failing': len(still_failing),
+        'attempts': attempts,
+    }
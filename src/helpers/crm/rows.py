@@ -0,0 +1,79 @@
+"""
+Lazy row access for CRM bulk operations.
+
+Bulk imports and updates only need the mapped columns of each row. Instead
+of materializing the whole DataFrame as a list of dicts up front, rows are
+produced one at a time from itertuples, with the positions of the mapped
+columns resolved once.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def mapped_columns(field_mapping: Dict, tag_mappings: Optional[Dict] = None) -> List[str]:
+    """
+    Return the CSV columns a bulk operation reads (mapped fields and tag columns).
+
+    Args:
+        field_mapping: API field to CSV column mapping
+        tag_mappings: Optional tag column mappings
+
+    Returns:
+        Column names in mapping order, without duplicates
+    """
+    columns = [column for column in field_mapping.values() if column]
+    columns.extend(tag_mappings or {})
+    return list(dict.fromkeys(columns))
+
+
+def _native(value):
+    """Convert numpy scalars to Python values (as DataFrame.to_dict does)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class MappedRows:
+    """
+    Row dicts restricted to selected columns, produced lazily.
+
+    Iterating yields one dict per row (column name to value) in DataFrame
+    order; only the current row is held in memory. Selected columns missing
+    from the DataFrame are left out.
+    """
+
+    def __init__(self, df: pd.DataFrame, columns: Iterable[str]):
+        """
+        Resolve the column positions once.
+
+        Args:
+            df: Input DataFrame
+            columns: Columns to include in the row dicts
+        """
+        all_columns = list(df.columns)
+        self._df = df
+        self.columns = [column for column in dict.fromkeys(columns) if column in all_columns]
+        self._positions = [all_columns.index(column) for column in self.columns]
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def __iter__(self) -> Iterator[Dict]:
+        columns = self.columns
+        positions = self._positions
+        for values in self._df.itertuples(index=False, name=None):
+            yield {column: _native(values[position]) for column, position in zip(columns, positions)}
+
+    def row(self, position: int) -> Dict:
+        """
+        Return a single row dict by 0-based position.
+
+        Args:
+            position: Row position in the DataFrame
+
+        Returns:
+            Dict of the selected columns
+        """
+        values = self._df.iloc[position]
+        return {column: _native(values.iloc[p]) for column, p in zip(self.columns, self._positions)}
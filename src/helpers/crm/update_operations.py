@@ -5,9 +5,26 @@ Handles bulk updates, matching, preview functions for companies and persons.
 """
 
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional
 from ..poool_api_client import PooolAPIClient
 from .field_definitions import get_client_fields, get_supplier_fields, get_api_field_name
+from .result_store import ResultStore
+from .progress import ProgressTracker, ProgressCallback
+from .entity_index import EntityIndex, build_company_index, build_person_index
+from .diff import diff_payload
+from .validation import validate_rows, summarize_length_warnings
+from .rows import MappedRows, mapped_columns
+from ..concurrency import run_concurrently, ordered_map
+
+# Previews with more rows than this resolve matches from a prefetched snapshot
+PREVIEW_INDEX_THRESHOLD = 50
+
+# Concurrent lookups for previews resolved via the API
+PREVIEW_MAX_WORKERS = 8
+
+# Rows processed concurrently by bulk updates
+UPDATE_MAX_WORKERS = 4
 
 
 def separate_update_fields_by_endpoint(row_data: Dict, field_mapping: Dict) -> Tuple[Dict, Dict, Dict]:
@@ -80,10 +97,13 @@ def prepare_supplier_update_data(supplier_data: Dict) -> Dict:
     return prepared
 
 
-def match_company_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[int], Optional[str]]:
+def match_company_record_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[Dict], Optional[str]]:
     """
-    Find a company by identifier field and value.
-    Returns: (company_id, error_message)
+    Find a company by identifier field and value and return its record.
+
+    Returns: (company_record, message)
+        message is None for exact matches, a warning for the closest
+        non-exact match, or the error if no company was found.
     """
     try:
         if not identifier_value or not str(identifier_value).strip():
@@ -95,14 +115,16 @@ def match_company_by_identifier(client: PooolAPIClient, identifier_field: str, i
         if identifier_field.lower() == 'id':
             try:
                 company_id = int(identifier_value)
-                # Verify company exists
-                company_data, error = client.get_company_by_id(company_id)
-                if error:
-                    return None, f"Firmen-ID {company_id} nicht gefunden"
-                return company_id, None
             except ValueError:
                 return None, f"Ungültiger ID-Wert: {identifier_value}"
 
+            # Verify company exists
+            company_data, error = client.get_company_by_id(company_id)
+            if error or not company_data:
+                return None, f"Firmen-ID {company_id} nicht gefunden"
+            company_data.setdefault('id', company_id)
+            return company_data, None
+
         # Search by other fields
         results, error = client.search_companies_by_field(identifier_field, identifier_value)
 
@@ -116,19 +138,31 @@ def match_company_by_identifier(client: PooolAPIClient, identifier_field: str, i
         for company in results:
             company_value = company.get(identifier_field)
             if company_value and str(company_value).lower() == identifier_value.lower():
-                return company.get('id'), None
+                return company, None
 
         # If no exact match, return first result with warning
-        return results[0].get('id'), f"Keine exakte Übereinstimmung, verwende nächste: {results[0].get('name', 'Unbekannt')}"
+        return results[0], f"Keine exakte Übereinstimmung, verwende nächste: {results[0].get('name', 'Unbekannt')}"
 
     except Exception as e:
         return None, f"Fehler beim Abgleichen der Firma: {str(e)}"
 
 
-def match_person_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[int], Optional[str]]:
+def match_company_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[int], Optional[str]]:
     """
-    Find a person by identifier field and value.
-    Returns: (person_id, error_message)
+    Find a company by identifier field and value.
+    Returns: (company_id, error_message)
+    """
+    company, message = match_company_record_by_identifier(client, identifier_field, identifier_value)
+    return (company.get('id') if company else None), message
+
+
+def match_person_record_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Find a person by identifier field and value and return its record.
+
+    Returns: (person_record, message)
+        message is None for exact matches, a warning for the closest
+        non-exact match, or the error if no person was found.
     """
     try:
         if not identifier_value or not str(identifier_value).strip():
@@ -140,14 +174,16 @@ def match_person_by_identifier(client: PooolAPIClient, identifier_field: str, id
         if identifier_field.lower() == 'id':
             try:
                 person_id = int(identifier_value)
-                # Verify person exists
-                person_data, error = client.get_person_by_id(person_id)
-                if error:
-                    return None, f"Personen-ID {person_id} nicht gefunden"
-                return person_id, None
             except ValueError:
                 return None, f"Ungültiger ID-Wert: {identifier_value}"
 
+            # Verify person exists
+            person_data, error = client.get_person_by_id(person_id)
+            if error or not person_data:
+                return None, f"Personen-ID {person_id} nicht gefunden"
+            person_data.setdefault('id', person_id)
+            return person_data, None
+
         # Search by other fields (name, email, etc.)
         results, error = client.search_persons_by_field(identifier_field, identifier_value)
 
@@ -161,21 +197,75 @@ def match_person_by_identifier(client: PooolAPIClient, identifier_field: str, id
         for person in results:
             person_value = person.get(identifier_field)
             if person_value and str(person_value).lower() == identifier_value.lower():
-                return person.get('id'), None
+                return person, None
 
         # If no exact match, return first result with warning
         first_person = results[0]
         name = f"{first_person.get('firstname', '')} {first_person.get('lastname', '')}".strip() or 'Unbekannt'
-        return first_person.get('id'), f"Keine exakte Übereinstimmung, verwende nächste: {name}"
+        return first_person, f"Keine exakte Übereinstimmung, verwende nächste: {name}"
 
     except Exception as e:
         return None, f"Fehler beim Abgleichen der Person: {str(e)}"
 
 
+def match_person_by_identifier(client: PooolAPIClient, identifier_field: str, identifier_value: str) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Find a person by identifier field and value.
+    Returns: (person_id, error_message)
+    """
+    person, message = match_person_record_by_identifier(client, identifier_field, identifier_value)
+    return (person.get('id') if person else None), message
+
+
+def _resolve_current_record(client: PooolAPIClient, identifier_field: str, identifier_value,
+                            update_type: str, snapshot: Optional[EntityIndex] = None,
+                            fetch_record: bool = False) -> Tuple[Optional[int], Optional[Dict], Optional[str]]:
+    """
+    Match a row to an existing entity and return its current record if available.
+
+    Uses the snapshot index first and falls back to the API matchers for
+    identifiers that are not (or no longer) in the snapshot.
+
+    Returns: (entity_id, current_record, error_message)
+    """
+    if snapshot is not None and snapshot.indexes(identifier_field):
+        record = snapshot.find_one(identifier_field, identifier_value)
+        if record is not None:
+            return record.get('id'), record, None
+
+    if update_type == 'companies':
+        record, match_error = match_company_record_by_identifier(client, identifier_field, identifier_value)
+    else:
+        record, match_error = match_person_record_by_identifier(client, identifier_field, identifier_value)
+
+    if record is None or not record.get('id'):
+        return None, None, match_error
+
+    entity_id = record['id']
+
+    # Prefer the full snapshot record; search results may be abbreviated
+    if snapshot is not None and snapshot.get_by_id(entity_id) is not None:
+        return entity_id, snapshot.get_by_id(entity_id), None
+
+    if fetch_record and identifier_field.lower() != 'id':
+        if update_type == 'companies':
+            record, _ = client.get_company_by_id(entity_id)
+        else:
+            record, _ = client.get_person_by_id(entity_id)
+
+    return entity_id, record, None
+
+
 def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, field_mapping: Dict,
-                         identifier_field: str, update_type: str, dry_run: bool = False, country_cache: Optional[Dict[str, int]] = None) -> Dict:
+                         identifier_field: str, update_type: str, dry_run: bool = False, country_cache: Optional[Dict[str, int]] = None,
+                         snapshot: Optional[EntityIndex] = None, skip_unchanged: bool = False) -> Dict:
     """
     Process a single row update for companies or persons.
+
+    With skip_unchanged, each prepared payload is compared with the current
+    record (from the snapshot, or fetched once if missing) and only changed
+    fields are sent. Rows without any change are returned with 'skipped': True.
+
     Returns: Dict with success status and details
     """
     from .company_operations import prepare_company_data
@@ -197,7 +287,9 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
             identifier_value = clean_data[identifier_col]
 
             # Match existing company
-            company_id, match_error = match_company_by_identifier(client, identifier_field, identifier_value)
+            company_id, current_record, match_error = _resolve_current_record(
+                client, identifier_field, identifier_value, 'companies', snapshot, fetch_record=skip_unchanged
+            )
 
             if not company_id:
                 return {
@@ -216,6 +308,41 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
             else:
                 prepared_company_data = {}
 
+            prepared_supplier_data = prepare_supplier_update_data(supplier_fields) if supplier_fields else {}
+            send_supplier = bool(supplier_fields)
+
+            # Reduce payloads to changed fields
+            skipped_endpoints = []
+            if skip_unchanged and current_record is not None:
+                payloads = {
+                    'company': (prepared_company_data, current_record),
+                    'client': (client_fields, current_record.get('client')),
+                    'supplier': (prepared_supplier_data, current_record.get('supplier')),
+                }
+                changed = {}
+                for endpoint, (payload, current) in payloads.items():
+                    changed[endpoint] = diff_payload(payload, current)
+                    if payload and not changed[endpoint]:
+                        skipped_endpoints.append(endpoint)
+
+                prepared_company_data = changed['company']
+                client_fields = changed['client']
+                prepared_supplier_data = changed['supplier']
+                send_supplier = bool(prepared_supplier_data)
+
+                if not (prepared_company_data or client_fields or send_supplier):
+                    return {
+                        'success': True,
+                        'result': {
+                            'row': index,
+                            'company_id': company_id,
+                            'endpoints_updated': [],
+                            'endpoints_skipped': skipped_endpoints,
+                            'identifier': identifier_value,
+                            'skipped': True
+                        }
+                    }
+
             # Track results
             results = {'company_id': company_id, 'updates': [], 'dry_run': dry_run}
             errors = []
@@ -228,35 +355,24 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
                 if client_fields:
                     results['updates'].append('client')
                     results['client_fields'] = list(client_fields.keys())
-                if supplier_fields:
+                if send_supplier:
                     results['updates'].append('supplier')
-                    results['supplier_fields'] = list(supplier_fields.keys())
+                    results['supplier_fields'] = list(prepared_supplier_data.keys())
             else:
-                # Actual update mode
-                # Update company endpoint if needed
+                # Actual update mode - the endpoints are independent, so write them concurrently
+                writes = {}
                 if prepared_company_data:
-                    updated_data, error = client.update_company(company_id, prepared_company_data)
-                    if error:
-                        errors.append(f"Company update failed: {error}")
-                    else:
-                        results['updates'].append('company')
-
-                # Update client endpoint if needed
+                    writes['company'] = lambda: client.update_company(company_id, prepared_company_data)
                 if client_fields:
-                    updated_data, error = client.update_client(company_id, client_fields)
-                    if error:
-                        errors.append(f"Client update failed: {error}")
-                    else:
-                        results['updates'].append('client')
+                    writes['client'] = lambda: client.update_client(company_id, client_fields)
+                if send_supplier:
+                    writes['supplier'] = lambda: client.update_supplier(company_id, prepared_supplier_data)
 
-                # Update supplier endpoint if needed
-                if supplier_fields:
-                    prepared_supplier_data = prepare_supplier_update_data(supplier_fields)
-                    updated_data, error = client.update_supplier(company_id, prepared_supplier_data)
+                for endpoint, (updated_data, error) in run_concurrently(writes).items():
                     if error:
-                        errors.append(f"Supplier update failed: {error}")
+                        errors.append(f"{endpoint.capitalize()} update failed: {error}")
                     else:
-                        results['updates'].append('supplier')
+                        results['updates'].append(endpoint)
 
             if errors:
                 return {
@@ -272,6 +388,7 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
                     'row': index,
                     'company_id': company_id,
                     'endpoints_updated': results['updates'],
+                    'endpoints_skipped': skipped_endpoints,
                     'identifier': identifier_value
                 }
             }
@@ -288,7 +405,9 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
             identifier_value = clean_data[identifier_col]
 
             # Match existing person
-            person_id, match_error = match_person_by_identifier(client, identifier_field, identifier_value)
+            person_id, current_record, match_error = _resolve_current_record(
+                client, identifier_field, identifier_value, 'persons', snapshot, fetch_record=skip_unchanged
+            )
 
             if not person_id:
                 return {
@@ -305,6 +424,22 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
                     'error': 'No valid person data to update'
                 }
 
+            # Reduce payload to changed fields
+            if skip_unchanged and current_record is not None:
+                person_data = diff_payload(person_data, current_record)
+
+                if not person_data:
+                    return {
+                        'success': True,
+                        'result': {
+                            'row': index,
+                            'person_id': person_id,
+                            'identifier': identifier_value,
+                            'endpoints_skipped': ['person'],
+                            'skipped': True
+                        }
+                    }
+
             if dry_run:
                 # Dry run mode - simulate update without API call
                 return {
@@ -346,8 +481,27 @@ def process_single_update(client: PooolAPIClient, index: int, row_data: Dict, fi
 
 def bulk_update_companies(api_key: str, df, field_mapping: Dict, identifier_field: str,
                          environment: str = "production", custom_url: str = None,
-                         dry_run: bool = False) -> Tuple[List[Dict], List[Dict]]:
-    """Bulk update companies from DataFrame."""
+                         dry_run: bool = False,
+                         result_store: Optional[ResultStore] = None,
+                         progress_callback: Optional[ProgressCallback] = None,
+                         skip_unchanged: bool = False,
+                         max_workers: int = UPDATE_MAX_WORKERS,
+                         snapshot: Optional[EntityIndex] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Bulk update companies from DataFrame.
+
+    If a result_store is given, outcomes are recorded there in columnar form
+    and the returned lists stay empty. If a progress_callback is given, it is
+    called with ProgressEvent snapshots while rows are processed.
+
+    With skip_unchanged, a snapshot of all companies is fetched once and each row
+    only sends fields that differ from the current record; unchanged rows are
+    skipped without any write request.
+
+    Up to max_workers rows are processed concurrently; outcomes are still
+    recorded in row order. A prefetched snapshot (e.g. from an upsert) is used
+    for matching and diffing instead of fetching one.
+    """
     from . import create_api_client
 
     client = create_api_client(api_key, environment, custom_url)
@@ -361,13 +515,34 @@ def bulk_update_companies(api_key: str, df, field_mapping: Dict, identifier_fiel
         print(f"Warning: Could not fetch countries: {error}. Country lookups will be disabled.")
         country_cache = {}
 
-    # Pre-convert DataFrame to dict for better performance
-    records = df.to_dict('records')
-
-    for index, row_data in enumerate(records, 1):
-        result = process_single_update(client, index, row_data, field_mapping, identifier_field, 'companies', dry_run, country_cache)
-
-        if result['success']:
+    # Fetch a snapshot of all companies once for diffing (unless the caller already has one)
+    if snapshot is None and skip_unchanged:
+        snapshot, error = build_company_index(client)
+        if error:
+            print(f"Warning: Could not fetch company snapshot: {error}. Current records will be fetched per row.")
+
+    # Rows with malformed values are reported without sending any request
+    row_errors = validate_rows(df, field_mapping, 'companies', check_required=False).tolist()
+    length_warning = summarize_length_warnings(df, field_mapping)
+    if length_warning:
+        print(length_warning)
+
+    # Rows are read lazily, restricted to the mapped columns
+    rows = enumerate(MappedRows(df, mapped_columns(field_mapping)), 1)
+    tracker = ProgressTracker(len(df), progress_callback)
+
+    def update_row(item: Tuple[int, Dict]) -> Tuple[int, Dict, Dict]:
+        index, row_data = item
+        if row_errors[index - 1] is not None:
+            return index, row_data, {'success': False, 'error': f"Validation failed: {row_errors[index - 1]}"}
+        return index, row_data, process_single_update(client, index, row_data, field_mapping, identifier_field, 'companies', dry_run, country_cache,
+                                                      snapshot=snapshot, skip_unchanged=skip_unchanged)
+
+    for index, row_data, result in ordered_map(update_row, rows, max_workers):
+
+        if result_store is not None:
+            result_store.add_outcome(index, result, row_data)
+        elif result['success']:
             successful.append(result['result'])
         else:
             failed.append({
@@ -377,32 +552,94 @@ def bulk_update_companies(api_key: str, df, field_mapping: Dict, identifier_fiel
                 'partial_success': result.get('partial_success', False)
             })
 
+        tracker.update(result['success'])
+
     return successful, failed
 
 
-def preview_company_matches(api_key: str, df, field_mapping: Dict, identifier_field: str,
-                            environment: str = "production", custom_url: str = None,
-                            preview_limit: int = 20) -> List[Dict]:
+def bulk_update_persons(api_key: str, df, field_mapping: Dict, identifier_field: str,
+                       environment: str = "production", custom_url: str = None,
+                       dry_run: bool = False,
+                       result_store: Optional[ResultStore] = None,
+                       progress_callback: Optional[ProgressCallback] = None,
+                       skip_unchanged: bool = False,
+                       max_workers: int = UPDATE_MAX_WORKERS,
+                       snapshot: Optional[EntityIndex] = None) -> Tuple[List[Dict], List[Dict]]:
     """
-    Preview how records will be matched without updating.
+    Bulk update persons from DataFrame.
 
-    Args:
-        api_key: API key
-        df: DataFrame with records
-        field_mapping: CSV column to API field mapping
-        identifier_field: Field to use for matching
-        environment: API environment
-        custom_url: Custom URL if environment is custom
-        preview_limit: Number of records to preview (default 20)
+    If a result_store is given, outcomes are recorded there in columnar form
+    and the returned lists stay empty. If a progress_callback is given, it is
+    called with ProgressEvent snapshots while rows are processed.
 
-    Returns:
-        List of match preview results
+    With skip_unchanged, a snapshot of all persons is fetched once and each row
+    only sends fields that differ from the current record; unchanged rows are
+    skipped without any write request.
+
+    Up to max_workers rows are processed concurrently; outcomes are still
+    recorded in row order. A prefetched snapshot (e.g. from an upsert) is used
+    for matching and diffing instead of fetching one.
     """
     from . import create_api_client
 
     client = create_api_client(api_key, environment, custom_url)
 
-    preview_results = []
+    successful = []
+    failed = []
+
+    # Fetch a snapshot of all persons once for diffing (unless the caller already has one)
+    if snapshot is None and skip_unchanged:
+        snapshot, error = build_person_index(client)
+        if error:
+            print(f"Warning: Could not fetch person snapshot: {error}. Current records will be fetched per row.")
+
+    # Rows with malformed values are reported without sending any request
+    row_errors = validate_rows(df, field_mapping, 'persons', check_required=False).tolist()
+    length_warning = summarize_length_warnings(df, field_mapping)
+    if length_warning:
+        print(length_warning)
+
+    # Rows are read lazily, restricted to the mapped columns
+    rows = enumerate(MappedRows(df, mapped_columns(field_mapping)), 1)
+    tracker = ProgressTracker(len(df), progress_callback)
+
+    def update_row(item: Tuple[int, Dict]) -> Tuple[int, Dict, Dict]:
+        index, row_data = item
+        if row_errors[index - 1] is not None:
+            return index, row_data, {'success': False, 'error': f"Validation failed: {row_errors[index - 1]}"}
+        return index, row_data, process_single_update(client, index, row_data, field_mapping, identifier_field, 'persons', dry_run, None,
+                                                      snapshot=snapshot, skip_unchanged=skip_unchanged)
+
+    for index, row_data, result in ordered_map(update_row, rows, max_workers):
+
+        if result_store is not None:
+            result_store.add_outcome(index, result, row_data)
+        elif result['success']:
+            successful.append(result['result'])
+        else:
+            failed.append({
+                'row': index,
+                'data': {k: v for k, v in row_data.items() if pd.notna(v)},
+                'error': result['error']
+            })
+
+        tracker.update(result['success'])
+
+    return successful, failed
+
+
+def _preview_matches(client: PooolAPIClient, df, field_mapping: Dict, identifier_field: str,
+                     update_type: str, preview_limit: Optional[int] = 20) -> List[Dict]:
+    """
+    Resolve preview matches for companies or persons in a single pass.
+
+    Each row is matched once and the matched record is reused for the name.
+    Large previews first build a snapshot index (one paginated fetch) and only
+    fall back to per-row API lookups for identifiers missing from it; the
+    remaining lookups run concurrently.
+    """
+    entity_key = 'company' if update_type == 'companies' else 'person'
+    record_matcher = match_company_record_by_identifier if update_type == 'companies' else match_person_record_by_identifier
 
     # Get identifier column from mapping
     identifier_col = field_mapping.get(identifier_field)
@@ -411,95 +648,103 @@ def preview_company_matches(api_key: str, df, field_mapping: Dict, identifier_fi
             'error': f'Identifier field "{identifier_field}" not found in field mapping'
         }]
 
-    # Preview first N records
-    records = df.head(preview_limit).to_dict('records')
+    preview_df = df if preview_limit is None else df.head(preview_limit)
+    identifier_values = preview_df[identifier_col].tolist() if identifier_col in preview_df.columns else [None] * len(preview_df)
 
-    for index, row_data in enumerate(records, 1):
-        # Clean data
-        clean_data = {k: v for k, v in row_data.items() if pd.notna(v)}
+    snapshot = None
+    if len(preview_df) > PREVIEW_INDEX_THRESHOLD:
+        if update_type == 'companies':
+            snapshot, error = build_company_index(client)
+        else:
+            snapshot, error = build_person_index(client)
+        if error:
+            print(f"Warning: Could not fetch snapshot for preview: {error}. Falling back to per-row lookups.")
+
+    def resolve(identifier_value) -> Tuple[Optional[Dict], Optional[str]]:
+        if snapshot is not None and snapshot.indexes(identifier_field):
+            record = snapshot.find_one(identifier_field, identifier_value)
+            if record is not None:
+                return record, None
+        return record_matcher(client, identifier_field, identifier_value)
+
+    lookups = [(i, value) for i, value in enumerate(identifier_values) if pd.notna(value)]
+    with ThreadPoolExecutor(max_workers=PREVIEW_MAX_WORKERS) as executor:
+        resolved = dict(zip(
+            (i for i, _ in lookups),
+            executor.map(lambda item: resolve(item[1]), lookups)
+        ))
+
+    preview_results = []
+    for i, identifier_value in enumerate(identifier_values):
+        index = i + 1
 
-        if identifier_col not in clean_data:
+        if i not in resolved:
             preview_results.append({
                 'row': index,
                 'identifier_value': 'N/A',
                 'status': '❌ Missing',
-                'company_id': None,
-                'company_name': None,
+                f'{entity_key}_id': None,
+                f'{entity_key}_name': None,
                 'message': f'Identifier column "{identifier_col}" not found in row'
             })
             continue
 
-        identifier_value = clean_data[identifier_col]
+        record, message = resolved[i]
 
-        # Try to match
-        company_id, error = match_company_by_identifier(client, identifier_field, identifier_value)
-
-        if company_id:
-            # Get company name
-            company_data, get_error = client.get_company_by_id(company_id)
-            company_name = company_data.get('name', 'Unknown') if company_data else 'Unknown'
-
-            # Check if it was a fuzzy match
-            if error:
-                status = '⚠️ Fuzzy Match'
-                message = error
+        if record is not None and record.get('id'):
+            if update_type == 'companies':
+                name = record.get('name') or 'Unknown'
             else:
-                status = '✅ Found'
-                message = 'Exact match'
+                name = f"{record.get('firstname', '')} {record.get('lastname', '')}".strip() or 'Unknown'
 
             preview_results.append({
                 'row': index,
                 'identifier_value': str(identifier_value),
-                'status': status,
-                'company_id': company_id,
-                'company_name': company_name,
-                'message': message
+                'status': '⚠️ Fuzzy Match' if message else '✅ Found',
+                f'{entity_key}_id': record.get('id'),
+                f'{entity_key}_name': name,
+                'message': message or 'Exact match'
             })
         else:
             preview_results.append({
                 'row': index,
                 'identifier_value': str(identifier_value),
                 'status': '❌ Not Found',
-                'company_id': None,
-                'company_name': None,
-                'message': error or 'No match found'
+                f'{entity_key}_id': None,
+                f'{entity_key}_name': None,
+                'message': message or 'No match found'
             })
 
     return preview_results
 
 
-def bulk_update_persons(api_key: str, df, field_mapping: Dict, identifier_field: str,
-                       environment: str = "production", custom_url: str = None,
-                       dry_run: bool = False) -> Tuple[List[Dict], List[Dict]]:
-    """Bulk update persons from DataFrame."""
-    from . import create_api_client
-
-    client = create_api_client(api_key, environment, custom_url)
-
-    successful = []
-    failed = []
-
-    # Pre-convert DataFrame to dict for better performance
-    records = df.to_dict('records')
+def preview_company_matches(api_key: str, df, field_mapping: Dict, identifier_field: str,
+                            environment: str = "production", custom_url: str = None,
+                            preview_limit: Optional[int] = 20) -> List[Dict]:
+    """
+    Preview how records will be matched without updating.
 
-    for index, row_data in enumerate(records, 1):
-        result = process_single_update(client, index, row_data, field_mapping, identifier_field, 'persons', dry_run, None)
+    Args:
+        api_key: API key
+        df: DataFrame with records
+        field_mapping: CSV column to API field mapping
+        identifier_field: Field to use for matching
+        environment: API environment
+        custom_url: Custom URL if environment is custom
+        preview_limit: Number of records to preview (default 20, None for the whole file)
 
-        if result['success']:
-            successful.append(result['result'])
-        else:
-            failed.append({
-                'row': index,
-                'data': {k: v for k, v in row_data.items() if pd.notna(v)},
-                'error': result['error']
-            })
+    Returns:
+        List of match preview results
+    """
+    from . import create_api_client
 
-    return successful, failed
+    client = create_api_client(api_key, environment, custom_url)
+    return _preview_matches(client, df, field_mapping, identifier_field, 'companies', preview_limit)
 
 
 def preview_person_matches(api_key: str, df, field_mapping: Dict, identifier_field: str,
                           environment: str = "production", custom_url: str = None,
-                          preview_limit: int = 20) -> List[Dict]:
+                          preview_limit: Optional[int] = 20) -> List[Dict]:
     """
     Preview how person records will be matched without updating.
 
@@ -510,7 +755,7 @@ def preview_person_matches(api_key: str, df, field_mapping: Dict, identifier_fie
         identifier_field: Field to use for matching (e.g., 'id', 'email', 'firstname')
         environment: API environment
         custom_url: Custom URL if environment is custom
-        preview_limit: Number of records to preview (default 20)
+        preview_limit: Number of records to preview (default 20, None for the whole file)
 
     Returns:
         List of match preview results
@@ -518,71 +763,4 @@ def preview_person_matches(api_key: str, df, field_mapping: Dict, identifier_fie
     from . import create_api_client
 
     client = create_api_client(api_key, environment, custom_url)
-
-    preview_results = []
-
-    # Get identifier column from mapping
-    identifier_col = field_mapping.get(identifier_field)
-    if not identifier_col:
-        return [{
-            'error': f'Identifier field "{identifier_field}" not found in field mapping'
-        }]
-
-    # Preview first N records
-    records = df.head(preview_limit).to_dict('records')
-
-    for index, row_data in enumerate(records, 1):
-        # Clean data
-        clean_data = {k: v for k, v in row_data.items() if pd.notna(v)}
-
-        if identifier_col not in clean_data:
-            preview_results.append({
-                'row': index,
-                'identifier_value': 'N/A',
-                'status': '❌ Missing',
-                'person_id': None,
-                'person_name': None,
-                'message': f'Identifier column "{identifier_col}" not found in row'
-            })
-            continue
-
-        identifier_value = clean_data[identifier_col]
-
-        # Try to match
-        person_id, error = match_person_by_identifier(client, identifier_field, identifier_value)
-
-        if person_id:
-            # Get person name
-            person_data, get_error = client.get_person_by_id(person_id)
-            if person_data:
-                person_name = f"{person_data.get('firstname', '')} {person_data.get('lastname', '')}".strip() or 'Unknown'
-            else:
-                person_name = 'Unknown'
-
-            # Check if it was a fuzzy match
-            if error:
-                status = '⚠️ Fuzzy Match'
-                message = error
-            else:
-                status = '✅ Found'
-                message = 'Exact match'
-
-            preview_results.append({
-                'row': index,
-                'identifier_value': str(identifier_value),
-                'status': status,
-                'person_id': person_id,
-                'person_name': person_name,
-                'message': message
-            })
-        else:
-            preview_results.append({
-                'row': index,
-                'identifier_value': str(identifier_value),
-                'status': '❌ Not Found',
-                'person_id': None,
-                'person_name': None,
-                'message': error or 'No match found'
-            })
-
-    return preview_results
+    return _preview_matches(client, df, field_mapping, identifier_field, 'persons', preview_limit)
@@ -0,0 +1,195 @@
+"""
+Upsert (create-or-update) operations for CRM system.
+
+Loads an index of existing companies or persons once, classifies every row
+as create, update or skip in memory and dispatches the groups through the
+bulk import and bulk update paths. Outcomes of all groups end up in a single
+result store under their original row numbers.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .entity_index import (
+    EntityIndex, normalize_key, build_company_index, build_person_index,
+    DEFAULT_COMPANY_INDEX_FIELDS, DEFAULT_PERSON_INDEX_FIELDS
+)
+from .result_store import ResultStore
+from .progress import ProgressEvent, ProgressTracker, ProgressCallback
+from .update_operations import UPDATE_MAX_WORKERS
+
+# Row actions of an upsert
+UPSERT_CREATE = 'create'
+UPSERT_UPDATE = 'update'
+UPSERT_SKIP = 'skip'
+
+# Identifier fields offered for upserts
+COMPANY_UPSERT_IDENTIFIERS = ['name', 'name_token', 'customer_number', 'id']
+PERSON_UPSERT_IDENTIFIERS = ['email', 'id']
+
+
+def classify_upsert_rows(df: pd.DataFrame, field_mapping: Dict, identifier_field: str,
+                         index: EntityIndex) -> pd.DataFrame:
+    """
+    Classify every row as create, update or skip against an entity index.
+
+    Rows without identifier value and rows matching several existing records
+    are skipped. Of several rows sharing a new identifier only the first is
+    created; the others are skipped so no duplicates are created.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        identifier_field: API field used to match existing records
+        index: EntityIndex over the existing records
+
+    Returns:
+        DataFrame with columns row (1-based), action, entity_id and reason
+    """
+    identifier_col = field_mapping.get(identifier_field)
+    if identifier_col and identifier_col in df.columns:
+        keys = df[identifier_col].map(normalize_key).reset_index(drop=True)
+    else:
+        keys = pd.Series([None] * len(df))
+
+    # Resolve each distinct key once
+    matches = {key: index.lookup(identifier_field, key) for key in keys.dropna().unique()}
+    match_counts = keys.map(lambda key: len(matches.get(key, [])) if key is not None else 0)
+    entity_ids = keys.map(lambda key: matches[key][0].get('id') if key is not None and len(matches.get(key, [])) == 1 else None)
+
+    missing = keys.isna()
+    ambiguous = match_counts > 1
+    existing = match_counts == 1
+    repeated_new = ~missing & (match_counts == 0) & keys.duplicated(keep='first')
+
+    action = pd.Series(UPSERT_CREATE, index=keys.index)
+    action.loc[existing] = UPSERT_UPDATE
+    action.loc[missing | ambiguous | repeated_new] = UPSERT_SKIP
+
+    reason = pd.Series(None, index=keys.index, dtype=object)
+    reason.loc[missing] = f'Kein Wert für Identifikator "{identifier_field}"'
+    reason.loc[ambiguous] = "Mehrere bestehende Datensätze mit diesem Identifikator"
+    reason.loc[repeated_new] = "Identifikator mehrfach in der Datei (nur die erste Zeile wird erstellt)"
+
+    # IDs that do not exist cannot be created with that ID
+    if identifier_field.lower() == 'id':
+        unknown_id = ~missing & (match_counts == 0)
+        action.loc[unknown_id] = UPSERT_SKIP
+        reason.loc[unknown_id] = "ID nicht im CRM gefunden"
+
+    return pd.DataFrame({
+        'row': range(1, len(df) + 1),
+        'action': action.values,
+        'entity_id': entity_ids.values,
+        'reason': reason.values,
+    })
+
+
+class _GroupProgress:
+    """Forwards the progress of one dispatch group into the combined tracker."""
+
+    def __init__(self, tracker: ProgressTracker):
+        self.tracker = tracker
+        self.successful = 0
+        self.failed = 0
+
+    def __call__(self, event: ProgressEvent) -> None:
+        if event.successful > self.successful:
+            self.tracker.update(True, count=event.successful - self.successful)
+        if event.failed > self.failed:
+            self.tracker.update(False, count=event.failed - self.failed)
+        self.successful = event.successful
+        self.failed = event.failed
+
+
+def bulk_upsert(api_key: str, df: pd.DataFrame, field_mapping: Dict, identifier_field: str,
+                entity_type: str = "companies", environment: str = "production", custom_url: str = None,
+                tag_mappings: Dict = None, dry_run: bool = False, skip_unchanged: bool = True,
+                max_workers: int = UPDATE_MAX_WORKERS,
+                result_store: Optional[ResultStore] = None,
+                progress_callback: Optional[ProgressCallback] = None) -> Tuple[Optional[Dict[str, int]], Optional[str]]:
+    """
+    Create missing and update existing companies or persons in one pass.
+
+    Existing records are fetched once into an index keyed by the identifier
+    field. Rows to update go through the bulk update path (matching and
+    diffing against the same index, no per-row lookups); new rows go through
+    the bulk import path. Tags are only assigned to created records. In
+    dry-run mode creates are reported but not sent.
+
+    Args:
+        api_key: API key
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        identifier_field: API field used to match existing records
+        entity_type: "companies" or "persons"
+        environment: API environment
+        custom_url: Custom URL if environment is custom
+        tag_mappings: Tag column mappings for created records
+        dry_run: Simulate updates and creates without writing
+        skip_unchanged: Only send changed fields for existing records
+        max_workers: Rows updated concurrently
+        result_store: Store receiving the outcomes of all rows (with an 'action' column)
+        progress_callback: Called with combined ProgressEvents of all groups
+
+    Returns:
+        Tuple of (counts per action, error_message)
+    """
+    from . import create_api_client
+    from .import_operations import bulk_import_generic
+    from .update_operations import bulk_update_companies, bulk_update_persons
+
+    client = create_api_client(api_key, environment, custom_url)
+    store = result_store if result_store is not None else ResultStore(operation_type="upsert", entity_type=entity_type, dry_run=dry_run)
+
+    # Load existing records once, indexed by the identifier field
+    extra_fields = () if identifier_field.lower() == 'id' else (identifier_field,)
+    if entity_type == 'companies':
+        index, error = build_company_index(client, tuple(dict.fromkeys(DEFAULT_COMPANY_INDEX_FIELDS + extra_fields)))
+    else:
+        index, error = build_person_index(client, tuple(dict.fromkeys(DEFAULT_PERSON_INDEX_FIELDS + extra_fields)))
+    if error:
+        return None, f"Fehler beim Laden der bestehenden Datensätze: {error}"
+
+    plan = classify_upsert_rows(df, field_mapping, identifier_field, index)
+    tracker = ProgressTracker(len(plan), progress_callback)
+    counts = plan['action'].value_counts().to_dict()
+
+    # Skipped rows are recorded directly
+    identifier_col = field_mapping.get(identifier_field)
+    for item in plan[plan['action'] == UPSERT_SKIP].itertuples(index=False):
+        identifier = df.iloc[item.row - 1][identifier_col] if identifier_col in df.columns else None
+        store.add_success(item.row, identifier=None if pd.isna(identifier) else identifier,
+                          warnings=[item.reason], skipped=True, action=UPSERT_SKIP)
+    if counts.get(UPSERT_SKIP):
+        tracker.update(True, count=int(counts[UPSERT_SKIP]))
+
+    # Existing records: bulk update path with the prefetched index
+    update_rows: List[int] = plan.loc[plan['action'] == UPSERT_UPDATE, 'row'].tolist()
+    if update_rows:
+        group_store = ResultStore(operation_type="update", entity_type=entity_type, dry_run=dry_run)
+        bulk_update = bulk_update_companies if entity_type == 'companies' else bulk_update_persons
+        bulk_update(api_key, df.iloc[[row - 1 for row in update_rows]], field_mapping, identifier_field,
+                    environment, custom_url, dry_run=dry_run, result_store=group_store,
+                    progress_callback=_GroupProgress(tracker), skip_unchanged=skip_unchanged,
+                    max_workers=max_workers, snapshot=index)
+        store.merge(group_store, row_numbers=update_rows, action=UPSERT_UPDATE)
+
+    # New records: bulk import path
+    create_rows: List[int] = plan.loc[plan['action'] == UPSERT_CREATE, 'row'].tolist()
+    if create_rows:
+        if dry_run:
+            fields = list(field_mapping.keys())
+            for row in create_rows:
+                identifier = df.iloc[row - 1][identifier_col] if identifier_col in df.columns else None
+                store.add_success(row, identifier=identifier, fields=fields,
+                                  warnings=["Test-Modus: Datensatz würde erstellt"], action=UPSERT_CREATE)
+            tracker.update(True, count=len(create_rows))
+        else:
+            group_store = ResultStore(operation_type="import", entity_type=entity_type)
+            bulk_import_generic(client, df.iloc[[row - 1 for row in create_rows]], field_mapping, entity_type,
+                                tag_mappings, result_store=group_store, progress_callback=_GroupProgress(tracker))
+            store.merge(group_store, row_numbers=create_rows, action=UPSERT_CREATE)
+
+    return {action: int(counts.get(action, 0)) for action in (UPSERT_CREATE, UPSERT_UPDATE, UPSERT_SKIP)}, None
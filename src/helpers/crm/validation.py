@@ -1,10 +1,46 @@
 """
 Validation functions for CRM imports.
 
-Handles data validation before import operations.
+Handles data validation before import operations: mapping checks and a
+vectorized per-row validation of all mapped values, so invalid rows are
+skipped before any request is sent.
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .field_definitions import (
+    get_company_field_types,
+    get_person_field_types,
+    get_field_max_lengths,
+    get_field_length_hints,
+)
+
+# Value patterns per field type (applied to stripped cell values)
+_EMAIL_PATTERN = r"[^@\s]+@[^@\s]+\.[^@\s]+"
+_FIELD_TYPE_PATTERNS = {
+    'email': rf"^{_EMAIL_PATTERN}$",
+    'email_list': rf"^{_EMAIL_PATTERN}(\s*[,;]\s*{_EMAIL_PATTERN})*$",
+    'phone': r"^\+?[\d\s\-/().]*\d[\d\s\-/().]*$",
+    'url': r"^(https?://)?[\w\-]+(\.[\w\-]+)+(:\d+)?([/?#]\S*)?$",
+    'integer': r"^\d+$",
+    'decimal': r"^\d+([.,]\d+)?$",
+    'boolean': r"^(?i:true|false|yes|no|1|0|1\.0|0\.0)$",
+}
+
+_FIELD_TYPE_MESSAGES = {
+    'email': "invalid email address",
+    'email_list': "invalid email address list",
+    'phone': "invalid phone number",
+    'url': "invalid URL",
+    'integer': "must be a whole number",
+    'decimal': "must be a decimal number",
+    'boolean': "must be true/false, yes/no or 1/0",
+}
+
+# Minimum digits of a phone number
+_PHONE_MIN_DIGITS = 4
 
 
 def validate_import_data(df, field_mapping: Dict, import_type: str) -> Tuple[bool, List[str]]:
@@ -51,6 +87,145 @@ def validate_import_data(df, field_mapping: Dict, import_type: str) -> Tuple[boo
                 if empty_count > 0:
                     all_messages.append(f"Warning: {empty_count} rows have empty {required_field}s and will be skipped")
 
+    # Per-row field validation (only once the mapped columns exist)
+    if not df.empty and not missing_columns:
+        summary = summarize_row_errors(validate_rows(df, field_mapping, import_type))
+        if summary:
+            all_messages.append(summary)
+        length_warning = summarize_length_warnings(df, field_mapping)
+        if length_warning:
+            all_messages.append(length_warning)
+
     # Determine if validation passed
     has_errors = any(not msg.startswith("Warning:") for msg in all_messages)
     return not has_errors, all_messages
+
+
+def _non_empty(values: pd.Series) -> pd.Series:
+    """Boolean mask of non-empty cells."""
+    text = values.astype(str).str.strip()
+    return values.notna() & text.ne('') & text.str.lower().ne('nan')
+
+
+def validate_rows(df, field_mapping: Dict, import_type: str, check_required: bool = True) -> pd.Series:
+    """
+    Validate every mapped value of every row at once.
+
+    Each mapped column is checked as a whole against the field type
+    (email, phone, URL, whole number, decimal, boolean) and the maximum
+    lengths documented by the API (get_field_max_lengths). Required fields are checked for imports, as is
+    client_number for rows activated as client when client numbers are mapped.
+    Empty optional cells are always valid.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        import_type: "companies" or "persons"
+        check_required: Check required fields (disable for updates)
+
+    Returns:
+        Series aligned with df holding the row's error messages joined by
+        "; ", or None for valid rows (`.notna()` is the invalid-row mask)
+    """
+    field_types = get_company_field_types() if import_type == 'companies' else get_person_field_types()
+    max_lengths = get_field_max_lengths()
+    errors = pd.Series('', index=df.index, dtype=object)
+
+    def flag(mask: pd.Series, message: str) -> None:
+        if mask.any():
+            errors.loc[mask] = errors.loc[mask] + message + "; "
+
+    for api_field, column in field_mapping.items():
+        if not column or column not in df.columns:
+            continue
+
+        values = df[column]
+        present = _non_empty(values)
+        if not present.any():
+            continue
+        text = values.astype(str).str.strip()
+
+        field_type = field_types.get(api_field)
+        pattern = _FIELD_TYPE_PATTERNS.get(field_type)
+        if pattern:
+            invalid = ~text.str.match(pattern)
+            if field_type == 'phone':
+                invalid |= text.str.count(r"\d") < _PHONE_MIN_DIGITS
+            flag(present & invalid, f"{api_field}: {_FIELD_TYPE_MESSAGES[field_type]}")
+        if field_type == 'decimal':
+            number = pd.to_numeric(text.str.replace(',', '.', regex=False), errors='coerce')
+            flag(present & ((number < 0) | (number > 100)), f"{api_field}: must be between 0 and 100")
+
+        max_length = max_lengths.get(api_field)
+        if max_length:
+            flag(present & (text.str.len() > max_length), f"{api_field}: longer than {max_length} characters")
+
+    if check_required:
+        required_fields = ['name'] if import_type == 'companies' else ['firstname', 'lastname']
+        for required_field in required_fields:
+            column = field_mapping.get(required_field)
+            if column and column in df.columns:
+                flag(~_non_empty(df[column]), f"Missing required field: {required_field}")
+
+        # Rows activated as client need a client number once client numbers are mapped
+        client_flag = field_mapping.get('is_client')
+        number_column = field_mapping.get('client_number')
+        if import_type == 'companies' and client_flag in df.columns and number_column in df.columns:
+            flag(_non_empty(df[client_flag]) & ~_non_empty(df[number_column]),
+                 "Missing required field: client_number (row is activated as client)")
+
+    errors = errors.str.rstrip('; ')
+    return errors.where(errors.ne(''), None)
+
+
+def summarize_row_errors(row_errors: pd.Series, max_examples: int = 5) -> Optional[str]:
+    """
+    Summarize the result of validate_rows as a single warning message.
+
+    Args:
+        row_errors: Series returned by validate_rows
+        max_examples: Number of rows listed as examples
+
+    Returns:
+        Warning message, or None if all rows are valid
+    """
+    invalid = [(row, message) for row, message in enumerate(row_errors.tolist(), 1) if message is not None]
+    if not invalid:
+        return None
+
+    examples = "; ".join(f"row {row}: {message}" for row, message in invalid[:max_examples])
+    more = f" (and {len(invalid) - max_examples} more)" if len(invalid) > max_examples else ""
+    return f"Warning: {len(invalid)} rows fail field validation and will be skipped - {examples}{more}"
+
+
+def summarize_length_warnings(df, field_mapping: Dict, max_examples: int = 5) -> Optional[str]:
+    """
+    Report values longer than the usual field lengths as a single warning.
+
+    The lengths of get_field_length_hints are not documented API limits,
+    so these rows are still imported; the API rejects them if needed.
+
+    Args:
+        df: Input DataFrame
+        field_mapping: API field to CSV column mapping
+        max_examples: Number of fields listed as examples
+
+    Returns:
+        Warning message, or None if no value exceeds its usual length
+    """
+    hints = get_field_length_hints()
+    enforced = get_field_max_lengths()
+    overruns = []
+    for api_field, column in field_mapping.items():
+        max_length = hints.get(api_field)
+        if not max_length or api_field in enforced or not column or column not in df.columns:
+            continue
+        values = df[column]
+        count = int((_non_empty(values) & (values.astype(str).str.strip().str.len() > max_length)).sum())
+        if count:
+            overruns.append(f"{api_field}: {count} values longer than {max_length} characters")
+    if not overruns:
+        return None
+
+    more = f" (and {len(overruns) - max_examples} more fields)" if len(overruns) > max_examples else ""
+    return f"Warning: unusually long values may be rejected by the API - {'; '.join(overruns[:max_examples])}{more}"
@@ -0,0 +1,114 @@
+"""
+Data Profiling
+
+Column profiles (fill rate, distinct values, dtype) of DataFrames, computed
+in one vectorized pass and cached by a fingerprint of the DataFrame content,
+so Streamlit reruns with unchanged data reuse the previous result.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Profiles kept in memory (least recently used are dropped first)
+PROFILE_CACHE_SIZE = 16
+
+# Profile columns
+PROFILE_NON_EMPTY = 'Nicht-leer Anzahl'
+PROFILE_EMPTY = 'Leer Anzahl'
+PROFILE_DISTINCT = 'Eindeutige Werte'
+PROFILE_DTYPE = 'Datentyp'
+
+_profile_cache: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+
+def dataframe_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a DataFrame (shape, column names, dtypes and values).
+
+    Args:
+        df: DataFrame to fingerprint
+
+    Returns:
+        Hex digest that changes whenever the content changes
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode('utf-8'))
+
+    try:
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # Unhashable cell values (lists, dicts) are hashed by their text
+        row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+
+    digest.update(row_hashes.to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _empty_strings(df: pd.DataFrame) -> np.ndarray:
+    """Boolean matrix marking blank strings (only text columns can hold them)."""
+    empty = np.zeros(df.shape, dtype=bool)
+    for position, dtype in enumerate(df.dtypes):
+        if dtype == object or pd.api.types.is_string_dtype(dtype):
+            try:
+                blank = df.iloc[:, position].str.strip().eq('')
+            except AttributeError:
+                # Object column without any strings
+                continue
+            empty[:, position] = blank.fillna(False).to_numpy(dtype=bool)
+    return empty
+
+
+def _distinct_counts(df: pd.DataFrame) -> List[int]:
+    """Distinct non-null values per column (unhashable values compared by text)."""
+    counts = []
+    for _, column in df.items():
+        try:
+            counts.append(column.nunique(dropna=True))
+        except TypeError:
+            counts.append(column.dropna().astype(str).nunique())
+    return counts
+
+
+def profile_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Profile all columns of a DataFrame.
+
+    A value counts as empty if it is null or a blank string. Results are
+    cached by dataframe_fingerprint; callers must not modify the returned
+    frame.
+
+    Args:
+        df: DataFrame to profile
+
+    Returns:
+        DataFrame indexed by column name with PROFILE_NON_EMPTY, PROFILE_EMPTY,
+        PROFILE_DISTINCT and PROFILE_DTYPE
+    """
+    fingerprint = dataframe_fingerprint(df)
+    with _profile_cache_lock:
+        if fingerprint in _profile_cache:
+            _profile_cache.move_to_end(fingerprint)
+            return _profile_cache[fingerprint]
+
+    empty = df.isna().to_numpy() | _empty_strings(df)
+    empty_counts = empty.sum(axis=0)
+
+    profile = pd.DataFrame({
+        PROFILE_NON_EMPTY: len(df) - empty_counts,
+        PROFILE_EMPTY: empty_counts,
+        PROFILE_DISTINCT: _distinct_counts(df),
+        PROFILE_DTYPE: [str(dtype) for dtype in df.dtypes],
+    }, index=df.columns)
+
+    with _profile_cache_lock:
+        _profile_cache[fingerprint] = profile
+        while len(_profile_cache) > PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+
+    return profile
@@ -0,0 +1,22 @@
+"""
+Background Jobs
+
+Job queue and worker pool for long-running bulk operations that must survive
+Streamlit reruns.
+"""
+
+from .manager import (
+    Job,
+    JobStatus,
+    JobManager,
+    get_job_manager,
+    job_owner,
+)
+
+__all__ = [
+    'Job',
+    'JobStatus',
+    'JobManager',
+    'get_job_manager',
+    'job_owner',
+]
@@ -0,0 +1,369 @@
+"""
+Background job manager for long-running bulk operations.
+
+Jobs run in a shared worker pool outside the Streamlit script thread, so
+reruns and widget interactions do not interrupt them. Each job gets an ID,
+a status and a ResultStore; finished results are persisted under
+`.jobs/<job_id>/` and can be reloaded after a page reload or restart.
+
+The manager is shared by all sessions, so every job records an owner (a
+hash of the submitting user's API key). Listing and loading jobs is
+filtered by owner; jobs without owner are not visible to anyone.
+
+Worker threads never call Streamlit APIs. Pages submit jobs and poll their
+status instead.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional
+
+from ..crm.progress import ProgressEvent
+from ..crm.result_store import ResultStore
+
+
+DEFAULT_JOBS_DIR = os.environ.get('POOOL_JOBS_DIR', '.jobs')
+DEFAULT_MAX_WORKERS = int(os.environ.get('POOOL_JOB_WORKERS', '3'))
+
+
+class JobStatus(Enum):
+    """Lifecycle states of a background job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the job is still waiting or running."""
+        return self in (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+@dataclass
+class Job:
+    """State of a single background job."""
+    job_id: str
+    job_type: str
+    label: str
+    operation_type: str
+    entity_type: str
+    total: int = 0
+    dry_run: bool = False
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: Optional[ProgressEvent] = None
+    error: Optional[str] = None
+    owner: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    store: Optional[ResultStore] = field(default=None, repr=False)
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Runtime in seconds (up to now for running jobs)."""
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable job metadata (without the result store)."""
+        return {
+            'job_id': self.job_id,
+            'job_type': self.job_type,
+            'label': self.label,
+            'operation_type': self.operation_type,
+            'entity_type': self.entity_type,
+            'total': self.total,
+            'dry_run': self.dry_run,
+            'status': self.status.value,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'progress': asdict(self.progress) if self.progress else None,
+            'error': self.error,
+            'owner': self.owner,
+            'metadata': self.metadata,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Job':
+        """Rebuild job metadata from `to_dict` output."""
+        progress = data.get('progress')
+        return cls(
+            job_id=data['job_id'],
+            job_type=data.get('job_type', ''),
+            label=data.get('label', ''),
+            operation_type=data.get('operation_type', 'import'),
+            entity_type=data.get('entity_type', 'companies'),
+            total=data.get('total', 0),
+            dry_run=data.get('dry_run', False),
+            status=JobStatus(data.get('status', JobStatus.FAILED.value)),
+            created_at=data.get('created_at', 0.0),
+            started_at=data.get('started_at'),
+            finished_at=data.get('finished_at'),
+            progress=ProgressEvent(**progress) if progress else None,
+            error=data.get('error'),
+            owner=data.get('owner'),
+            metadata=data.get('metadata', {}),
+        )
+
+
+def job_owner(api_key: Optional[str]) -> Optional[str]:
+    """
+    Owner ID of the jobs submitted with an API key.
+
+    Only a hash is stored, so job metadata on disk never contains the key.
+
+    Args:
+        api_key: API key of the current session
+
+    Returns:
+        Owner ID, or None if no API key is set
+    """
+    if not api_key:
+        return None
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:32]
+
+
+class JobManager:
+    """
+    Job queue with a bounded worker pool and on-disk result persistence.
+
+    Submitted functions must accept `result_store` and `progress_callback`
+    keyword arguments (as the CRM bulk import/update functions do).
+    """
+
+    def __init__(self, jobs_dir: str = DEFAULT_JOBS_DIR, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize the job manager.
+
+        Args:
+            jobs_dir: Directory for persisted job metadata and results
+            max_workers: Number of jobs that may run at the same time
+        """
+        self.jobs_dir = jobs_dir
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="poool-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load_persisted_jobs()
+
+    def submit(self,
+               job_type: str,
+               label: str,
+               func: Callable,
+               kwargs: Dict[str, Any],
+               total: int,
+               operation_type: str = "import",
+               entity_type: str = "companies",
+               dry_run: bool = False,
+               spill_payloads: bool = False,
+               metadata: Optional[Dict[str, Any]] = None,
+               owner: Optional[str] = None) -> str:
+        """
+        Queue a bulk operation as background job.
+
+        Args:
+            job_type: Job category used for filtering (e.g. "crm_import", "company_update")
+            label: Human readable description
+            func: Bulk function to run
+            kwargs: Keyword arguments for func (result_store/progress_callback are added)
+            total: Number of rows to process
+            operation_type: "import" or "update"
+            entity_type: "companies" or "persons"
+            dry_run: Whether the job is a dry run
+            spill_payloads: Whether full row payloads are spilled to the job directory
+            metadata: Optional extra metadata persisted with the job
+            owner: Owner ID from job_owner (required to list or load the job later)
+
+        Returns:
+            Job ID
+        """
+        job_id = uuid.uuid4().hex[:12]
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        job = Job(
+            job_id=job_id,
+            job_type=job_type,
+            label=label,
+            operation_type=operation_type,
+            entity_type=entity_type,
+            total=total,
+            dry_run=dry_run,
+            owner=owner,
+            metadata=metadata or {},
+        )
+        job.store = ResultStore(
+            operation_type=operation_type,
+            entity_type=entity_type,
+            spill_path=os.path.join(job_dir, 'payloads') if spill_payloads else None,
+            dry_run=dry_run
+        )
+
+        with self._lock:
+            self._jobs[job_id] = job
+        self._persist(job)
+
+        self._executor.submit(self._run, job, func, dict(kwargs))
+        return job_id
+
+    def get_job(self, job_id: Optional[str], owner: Optional[str]) -> Optional[Job]:
+        """
+        Return a job of an owner.
+
+        Args:
+            job_id: Job ID
+            owner: Owner ID from job_owner
+
+        Returns:
+            Job, or None if unknown or owned by someone else
+        """
+        if not job_id or not owner:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job if job is not None and job.owner == owner else None
+
+    def list_jobs(self, owner: Optional[str], job_type: Optional[str] = None,
+                  limit: Optional[int] = None) -> List[Job]:
+        """
+        List the jobs of an owner, newest first.
+
+        Args:
+            owner: Owner ID from job_owner (no jobs are listed without owner)
+            job_type: Optional job type filter
+            limit: Optional maximum number of jobs
+
+        Returns:
+            List of jobs
+        """
+        if not owner:
+            return []
+        with self._lock:
+            jobs = [job for job in self._jobs.values()
+                    if job.owner == owner and (job_type is None or job.job_type == job_type)]
+        jobs.sort(key=lambda job: job.created_at, reverse=True)
+        return jobs[:limit] if limit else jobs
+
+    def get_result_store(self, job_id: str, owner: Optional[str]) -> Optional[ResultStore]:
+        """
+        Return the results of a job, loading them from disk if necessary.
+
+        Args:
+            job_id: Job ID
+            owner: Owner ID from job_owner
+
+        Returns:
+            ResultStore or None if the job has no results or belongs to someone else
+        """
+        job = self.get_job(job_id, owner)
+        if job is None:
+            return None
+
+        if job.store is None:
+            results_path = os.path.join(self._job_dir(job_id), 'results.parquet')
+            if not os.path.exists(results_path):
+                return None
+            job.store = ResultStore.read(
+                results_path,
+                operation_type=job.operation_type,
+                entity_type=job.entity_type,
+                dry_run=job.dry_run,
+                spill_path=os.path.join(self._job_dir(job_id), 'payloads')
+            )
+
+        return job.store
+
+    def _run(self, job: Job, func: Callable, kwargs: Dict[str, Any]) -> None:
+        """Execute a job in a worker thread."""
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        self._persist(job)
+
+        def on_progress(event: ProgressEvent):
+            job.progress = event
+
+        status = JobStatus.COMPLETED
+        try:
+            func(**kwargs, result_store=job.store, progress_callback=on_progress)
+        except Exception as e:
+            job.error = f"Job fehlgeschlagen: {str(e)}"
+            status = JobStatus.FAILED
+
+        # Persist whatever was processed (also partial results of failed jobs)
+        try:
+            job.store.write(os.path.join(self._job_dir(job.job_id), 'results.parquet'))
+            # Release the in-memory copy; get_result_store reloads it on demand
+            job.store = None
+        except Exception as e:
+            print(f"Warning: Could not persist results of job {job.job_id}: {str(e)}")
+
+        job.finished_at = time.time()
+        job.status = status
+        self._persist(job)
+
+    def _job_dir(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _persist(self, job: Job) -> None:
+        """Write job metadata to disk."""
+        try:
+            with open(os.path.join(self._job_dir(job.job_id), 'job.json'), 'w', encoding='utf-8') as f:
+                json.dump(job.to_dict(), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"Warning: Could not persist job {job.job_id}: {str(e)}")
+
+    def _load_persisted_jobs(self) -> None:
+        """Load job metadata from previous runs."""
+        for job_id in os.listdir(self.jobs_dir):
+            job_file = os.path.join(self._job_dir(job_id), 'job.json')
+            if not os.path.isfile(job_file):
+                continue
+
+            try:
+                with open(job_file, encoding='utf-8') as f:
+                    job = Job.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Warning: Could not load job {job_id}: {str(e)}")
+                continue
+
+            # Jobs that were still active belonged to a process that no longer exists
+            if job.status.is_active:
+                job.status = JobStatus.FAILED
+                job.error = "Job wurde durch einen Neustart der Anwendung unterbrochen"
+                job.finished_at = job.finished_at or time.time()
+                self._persist(job)
+
+            self._jobs[job.job_id] = job
+
+
+_job_manager: Optional[JobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """
+    Get the process-wide job manager.
+
+    Streamlit reruns re-execute page scripts but keep imported modules, so the
+    manager (and its running jobs) is shared across reruns and sessions.
+
+    Returns:
+        JobManager instance
+    """
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            _job_manager = JobManager()
+        return _job_manager
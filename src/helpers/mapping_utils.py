@@ -6,7 +6,6 @@ and configuration import/export in JSON format.
 """
 
 import json
-import streamlit as st
 from typing import Dict, List, Tuple
 
 
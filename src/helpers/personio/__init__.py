@@ -4,7 +4,35 @@ Personio helper functions and API client.
 Provides centralized API client and helper functions for interacting with the Personio HR API.
 """
 
-from .api_client import PersonioAPIClient
+from .api_client import PersonioAPIClient, TokenRefreshError
+from .retry import RetryPolicy, RateGovernor
+from .sharding import (
+    SHARD_MONTH,
+    SHARD_WEEK,
+    split_date_range,
+    merge_window_records,
+    fetch_sharded,
+)
+from .cache import (
+    DATASET_EMPLOYEES,
+    DATASET_ABSENCES,
+    DATASET_ATTENDANCES,
+    CACHE_RETENTION,
+    PersonioCache,
+    cache_path,
+    remove_cache,
+    purge_expired,
+    date_scope,
+    sync_dataset,
+)
+from .absence_aggregation import (
+    GROUP_BY_DEPARTMENT,
+    GROUP_BY_POSITION,
+    absence_types,
+    absence_date_range,
+    default_absence_types,
+    aggregate_absences,
+)
 from .helpers import (
     create_personio_client,
     get_employees,
@@ -13,10 +41,36 @@ from .helpers import (
     process_employees_data,
     process_absences_data,
     process_attendances_data,
+    flatten_records,
+    add_employee_id_column,
 )
 
 __all__ = [
     'PersonioAPIClient',
+    'TokenRefreshError',
+    'RetryPolicy',
+    'RateGovernor',
+    'SHARD_MONTH',
+    'SHARD_WEEK',
+    'split_date_range',
+    'merge_window_records',
+    'fetch_sharded',
+    'DATASET_EMPLOYEES',
+    'DATASET_ABSENCES',
+    'DATASET_ATTENDANCES',
+    'CACHE_RETENTION',
+    'PersonioCache',
+    'cache_path',
+    'remove_cache',
+    'purge_expired',
+    'date_scope',
+    'sync_dataset',
+    'GROUP_BY_DEPARTMENT',
+    'GROUP_BY_POSITION',
+    'absence_types',
+    'absence_date_range',
+    'default_absence_types',
+    'aggregate_absences',
     'create_personio_client',
     'get_employees',
     'get_absences',
@@ -24,4 +78,6 @@ __all__ = [
     'process_employees_data',
     'process_absences_data',
     'process_attendances_data',
+    'flatten_records',
+    'add_employee_id_column',
 ]
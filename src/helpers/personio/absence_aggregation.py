@@ -0,0 +1,348 @@
+"""
+Absence aggregation for the cost calculator.
+
+Turns the absences (time-offs) and employees DataFrames of the Personio page
+into vacation and sick days per employee and per group (department and/or
+position), annualized over a date range. Absence periods are clipped to the
+range and counted in working days (Mon-Fri) with vectorized pandas/numpy
+operations, so years of history for hundreds of employees aggregate in one
+pass.
+
+Columns are found by their JSON path (the "(path)" suffix of the column
+names built by flatten_records), which does not depend on the labels of the
+Personio account language. Absences are matched to employees by employee ID
+(names are not unique); only data without IDs falls back to the name.
+"""
+
+import re
+from datetime import date
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Absence type names counted as vacation or sickness by default (whole names, case-insensitive,
+# ignoring a trailing "(...)" note). Special leave such as "Sonderurlaub" is not preselected.
+VACATION_TYPE_NAMES = ('urlaub', 'erholungsurlaub', 'jahresurlaub', 'vacation', 'paid vacation',
+                       'holiday', 'holidays', 'annual leave')
+SICK_TYPE_NAMES = ('krankheit', 'krank', 'krankmeldung', 'arbeitsunfähigkeit', 'sick', 'sick leave',
+                   'sick day', 'sickness', 'illness')
+
+# Employee status of people who left (without termination date their period is unknown)
+INACTIVE_STATUS = 'inactive'
+
+# Absences with these statuses are ignored
+EXCLUDED_STATUSES = ('rejected', 'canceled', 'cancelled')
+
+# Grouping options (employee attributes)
+GROUP_BY_DEPARTMENT = 'department'
+GROUP_BY_POSITION = 'position'
+
+# Result columns
+COLUMN_EMPLOYEE = 'Mitarbeiter'
+COLUMN_DEPARTMENT = 'Abteilung'
+COLUMN_POSITION = 'Position'
+COLUMN_VACATION_DAYS = 'Urlaubstage'
+COLUMN_SICK_DAYS = 'Krankheitstage'
+COLUMN_EMPLOYED_DAYS = 'Beschäftigungstage'
+COLUMN_EMPLOYEE_COUNT = 'Anzahl Mitarbeiter'
+COLUMN_AVG_VACATION_DAYS = 'Ø Urlaubstage'
+COLUMN_AVG_SICK_DAYS = 'Ø Krankheitstage'
+
+# Group label of employees without department/position
+UNASSIGNED_GROUP = 'Ohne Zuordnung'
+
+_GROUP_COLUMNS = {GROUP_BY_DEPARTMENT: COLUMN_DEPARTMENT, GROUP_BY_POSITION: COLUMN_POSITION}
+_DAYS_PER_YEAR = 365.25
+
+# Internal join key (employee ID, or name for data without IDs)
+_KEY = '_employee_key'
+
+
+def find_column(df: pd.DataFrame, json_path: str) -> Optional[str]:
+    """
+    Find a flattened Personio column by its JSON path.
+
+    Args:
+        df: DataFrame from process_*_data
+        json_path: Attribute path, e.g. 'start_date' or 'department.value'
+
+    Returns:
+        Column name, or None if the attribute is not present
+    """
+    suffix = f"({json_path})"
+    return next((column for column in df.columns if str(column).endswith(suffix)), None)
+
+
+def _text(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """Column as stripped strings ('' for missing column or null values)."""
+    if column is None:
+        return pd.Series('', index=df.index)
+    values = df[column].astype(object)
+    return values.where(values.notna(), '').astype(str).str.strip()
+
+
+def _dates(df: pd.DataFrame, column: Optional[str]) -> pd.Series:
+    """Day part of date or date-time values (NaT if missing or invalid)."""
+    return pd.to_datetime(_text(df, column).str[:10], format='%Y-%m-%d', errors='coerce')
+
+
+def _ids(df: pd.DataFrame, *json_paths: str) -> pd.Series:
+    """IDs of the first present column as strings ('' if missing; '12.0' becomes '12')."""
+    column = next((c for c in map(lambda path: find_column(df, path), json_paths) if c is not None), None)
+    return _text(df, column).str.replace(r'\.0$', '', regex=True)
+
+
+def _flags(df: pd.DataFrame, column: Optional[str]) -> np.ndarray:
+    """Truthy half-day flags (1, true, yes) as booleans."""
+    return _text(df, column).str.lower().isin(['1', '1.0', 'true', 'yes']).to_numpy()
+
+
+def absence_types(absences_df: pd.DataFrame) -> List[str]:
+    """
+    Distinct absence type names of the absences DataFrame.
+
+    Args:
+        absences_df: DataFrame from process_absences_data
+
+    Returns:
+        Sorted type names
+    """
+    types = _text(absences_df, find_column(absences_df, 'time_off_type'))
+    return sorted(t for t in types.unique() if t)
+
+
+def absence_date_range(absences_df: pd.DataFrame) -> Tuple[Optional[date], Optional[date]]:
+    """
+    First start and last end date of the absences.
+
+    Args:
+        absences_df: DataFrame from process_absences_data
+
+    Returns:
+        Tuple of (first day, last day); None if no dates are present
+    """
+    starts = _dates(absences_df, find_column(absences_df, 'start_date'))
+    ends = _dates(absences_df, find_column(absences_df, 'end_date')).fillna(starts)
+    first, last = starts.min(), ends.max()
+    return (first.date() if pd.notna(first) else None,
+            last.date() if pd.notna(last) else None)
+
+
+def _type_key(type_name: str) -> str:
+    """Lower-cased type name without a trailing "(...)" note and extra whitespace."""
+    return ' '.join(re.sub(r'\s*\([^)]*\)\s*$', '', type_name).lower().split())
+
+
+def default_absence_types(types: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Preselect vacation and sickness types by their whole name.
+
+    Args:
+        types: Absence type names
+
+    Returns:
+        Tuple of (vacation types, sick types)
+    """
+    types = list(types)
+    vacation = [t for t in types if _type_key(t) in VACATION_TYPE_NAMES]
+    sick = [t for t in types if _type_key(t) in SICK_TYPE_NAMES and t not in vacation]
+    return vacation, sick
+
+
+def employee_names(employees_df: pd.DataFrame) -> pd.Series:
+    """
+    Employee names as shown in the absences' employee column.
+
+    Uses the preferred name, otherwise first and last name (same rule as
+    the flattening of nested Employee objects).
+
+    Args:
+        employees_df: DataFrame from process_employees_data
+
+    Returns:
+        Series of names aligned with employees_df
+    """
+    preferred = _text(employees_df, find_column(employees_df, 'preferred_name.value'))
+    full = (_text(employees_df, find_column(employees_df, 'first_name.value')) + ' ' +
+            _text(employees_df, find_column(employees_df, 'last_name.value'))).str.strip()
+    return preferred.where(preferred.ne(''), full)
+
+
+def absence_days(absences_df: pd.DataFrame, start_date: date, end_date: date) -> pd.DataFrame:
+    """
+    Working days of every absence within a date range.
+
+    Periods are clipped to the range; half days at the start or end count
+    half if that boundary lies within the range. Weekends are not counted,
+    public holidays are.
+
+    Args:
+        absences_df: DataFrame from process_absences_data
+        start_date: First day of the range
+        end_date: Last day of the range (inclusive)
+
+    Returns:
+        DataFrame with COLUMN_EMPLOYEE, 'employee_id' ('' if unknown), 'type' and 'days'
+        (one row per absence overlapping the range)
+    """
+    range_start, range_end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+
+    starts = _dates(absences_df, find_column(absences_df, 'start_date'))
+    ends = _dates(absences_df, find_column(absences_df, 'end_date')).fillna(starts)
+    statuses = _text(absences_df, find_column(absences_df, 'status')).str.lower()
+
+    clipped_start = starts.clip(lower=range_start)
+    clipped_end = ends.clip(upper=range_end)
+    valid = (starts.notna() & (clipped_start <= clipped_end) & ~statuses.isin(EXCLUDED_STATUSES)).to_numpy()
+
+    first = clipped_start.to_numpy(dtype='datetime64[D]')[valid]
+    last = clipped_end.to_numpy(dtype='datetime64[D]')[valid]
+    days = np.busday_count(first, last + np.timedelta64(1, 'D')).astype(float)
+
+    # Half days only count where the original boundary is inside the range
+    half_start = _flags(absences_df, find_column(absences_df, 'half_day_start'))[valid] & \
+        (starts.to_numpy()[valid] >= np.datetime64(range_start))
+    half_end = _flags(absences_df, find_column(absences_df, 'half_day_end'))[valid] & \
+        (ends.to_numpy()[valid] <= np.datetime64(range_end))
+    single_day = first == last
+    reduction = np.where(single_day, 0.5 * (half_start | half_end), 0.5 * half_start + 0.5 * half_end)
+    days = np.maximum(days - reduction * (days > 0), 0.0)
+
+    return pd.DataFrame({
+        COLUMN_EMPLOYEE: _text(absences_df, find_column(absences_df, 'employee')).to_numpy()[valid],
+        'employee_id': _ids(absences_df, 'employee.attributes.id.value', 'employee.attributes.id').to_numpy()[valid],
+        'type': _text(absences_df, find_column(absences_df, 'time_off_type')).to_numpy()[valid],
+        'days': days,
+    })
+
+
+def aggregate_absences(absences_df: pd.DataFrame, employees_df: Optional[pd.DataFrame],
+                       start_date: date, end_date: date,
+                       vacation_types: Sequence[str], sick_types: Sequence[str],
+                       group_by: Sequence[str] = (GROUP_BY_DEPARTMENT,)
+                       ) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[str]]:
+    """
+    Vacation and sick days per employee and per group, annualized over a date range.
+
+    Employees of employees_df count from their hire date to their
+    termination date, clipped to the range; employees without overlap
+    (hired later, left earlier, or inactive without termination date) are
+    left out together with their absences. Employees without absences count
+    with 0 days, so group averages are not inflated. Each employee is
+    annualized over their own employment days, and group averages are total
+    days per total employment year. Employees are matched to absences by
+    employee ID (by name only if either side has no IDs); absences of
+    unknown employees count over the whole range and are kept in the
+    UNASSIGNED_GROUP group.
+
+    Args:
+        absences_df: DataFrame from process_absences_data
+        employees_df: DataFrame from process_employees_data (None: one group of all absent employees)
+        start_date: First day of the range
+        end_date: Last day of the range (inclusive)
+        vacation_types: Absence type names counted as vacation
+        sick_types: Absence type names counted as sickness
+        group_by: GROUP_BY_DEPARTMENT and/or GROUP_BY_POSITION
+
+    Returns:
+        Tuple of (per_employee, per_group, error); days are per year,
+        per_employee also holds COLUMN_EMPLOYED_DAYS
+    """
+    try:
+        if start_date > end_date:
+            return None, None, "Das Startdatum liegt nach dem Enddatum"
+        if find_column(absences_df, 'start_date') is None or find_column(absences_df, 'employee') is None:
+            return None, None, "Abwesenheitsdaten enthalten keine Start- oder Mitarbeiterspalte"
+
+        range_start, range_end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        range_days = (range_end - range_start).days + 1
+
+        has_employees = employees_df is not None and not employees_df.empty
+        employee_ids = _ids(employees_df, 'id.value', 'id') if has_employees else None
+
+        # Days per employee and category in one grouping
+        days = absence_days(absences_df, start_date, end_date)
+        by_id = days['employee_id'].ne('').any() and (employee_ids is None or employee_ids.ne('').any())
+        keys = days['employee_id'].where(days['employee_id'].ne(''), 'name:' + days[COLUMN_EMPLOYEE]) if by_id \
+            else 'name:' + days[COLUMN_EMPLOYEE]
+        is_vacation = days['type'].isin(vacation_types)
+        is_sick = days['type'].isin(sick_types) & ~is_vacation
+        totals = pd.DataFrame({
+            _KEY: keys,
+            COLUMN_EMPLOYEE: days[COLUMN_EMPLOYEE],
+            COLUMN_VACATION_DAYS: days['days'].where(is_vacation, 0.0),
+            COLUMN_SICK_DAYS: days['days'].where(is_sick, 0.0),
+        })[is_vacation | is_sick].groupby(_KEY).agg(**{
+            COLUMN_EMPLOYEE: (COLUMN_EMPLOYEE, 'first'),
+            COLUMN_VACATION_DAYS: (COLUMN_VACATION_DAYS, 'sum'),
+            COLUMN_SICK_DAYS: (COLUMN_SICK_DAYS, 'sum'),
+        })
+
+        group_columns = [_GROUP_COLUMNS[key] for key in group_by if key in _GROUP_COLUMNS]
+
+        if has_employees:
+            names = employee_names(employees_df)
+            employees = pd.DataFrame({_KEY: employee_ids if by_id else 'name:' + names, COLUMN_EMPLOYEE: names})
+            for key, column in _GROUP_COLUMNS.items():
+                employees[column] = _text(employees_df, find_column(employees_df, f'{key}.value'))
+
+            # Employment period within the range
+            hired = _dates(employees_df, find_column(employees_df, 'hire_date.value'))
+            left = _dates(employees_df, find_column(employees_df, 'termination_date.value'))
+            status = _text(employees_df, find_column(employees_df, 'status.value')).str.lower()
+            employed_from = hired.clip(lower=range_start).fillna(range_start)
+            employed_to = left.clip(upper=range_end).fillna(range_end)
+            employed_days = ((employed_to - employed_from).dt.days + 1).clip(lower=0)
+            employees[COLUMN_EMPLOYED_DAYS] = employed_days.where(~(status.eq(INACTIVE_STATUS) & left.isna()), 0)
+
+            employees = employees[employees[_KEY].ne('') & employees[_KEY].ne('name:')].drop_duplicates(_KEY)
+            not_employed = employees.loc[employees[COLUMN_EMPLOYED_DAYS] <= 0, _KEY]
+            employees = employees[employees[COLUMN_EMPLOYED_DAYS] > 0]
+            totals = totals.drop(index=not_employed, errors='ignore')
+            per_employee = employees.merge(totals, left_on=_KEY, right_index=True, how='outer',
+                                           suffixes=('', '_absences'))
+            # Employees only known from absences keep the name of the absence records
+            per_employee[COLUMN_EMPLOYEE] = per_employee[COLUMN_EMPLOYEE].fillna(
+                per_employee[f'{COLUMN_EMPLOYEE}_absences'])
+        else:
+            per_employee = totals.reset_index()
+            for column in _GROUP_COLUMNS.values():
+                per_employee[column] = ''
+
+        # Employees only known from absences count over the whole range
+        if COLUMN_EMPLOYED_DAYS not in per_employee.columns:
+            per_employee[COLUMN_EMPLOYED_DAYS] = range_days
+        per_employee[COLUMN_EMPLOYED_DAYS] = per_employee[COLUMN_EMPLOYED_DAYS].fillna(range_days).astype(int)
+        for column in _GROUP_COLUMNS.values():
+            per_employee[column] = per_employee[column].fillna('').replace('', UNASSIGNED_GROUP)
+        for column in (COLUMN_VACATION_DAYS, COLUMN_SICK_DAYS):
+            per_employee[column] = per_employee[column].fillna(0.0)
+
+        # Group averages: total days per total employment year (short employments weigh less)
+        grouping = per_employee.groupby(group_columns, sort=True) if group_columns else \
+            per_employee.groupby(np.zeros(len(per_employee)))
+        per_group = grouping.agg(**{
+            COLUMN_EMPLOYEE_COUNT: (COLUMN_EMPLOYEE, 'size'),
+            COLUMN_AVG_VACATION_DAYS: (COLUMN_VACATION_DAYS, 'sum'),
+            COLUMN_AVG_SICK_DAYS: (COLUMN_SICK_DAYS, 'sum'),
+            COLUMN_EMPLOYED_DAYS: (COLUMN_EMPLOYED_DAYS, 'sum'),
+        })
+        group_years = per_group.pop(COLUMN_EMPLOYED_DAYS) / _DAYS_PER_YEAR
+        for column in (COLUMN_AVG_VACATION_DAYS, COLUMN_AVG_SICK_DAYS):
+            per_group[column] = (per_group[column] / group_years).round(1)
+        per_group = per_group.reset_index() if group_columns else per_group.reset_index(drop=True)
+
+        employee_years = per_employee[COLUMN_EMPLOYED_DAYS] / _DAYS_PER_YEAR
+        for column in (COLUMN_VACATION_DAYS, COLUMN_SICK_DAYS):
+            per_employee[column] = (per_employee[column] / employee_years).round(1)
+
+        per_employee = per_employee[
+            [COLUMN_EMPLOYEE, COLUMN_DEPARTMENT, COLUMN_POSITION, COLUMN_EMPLOYED_DAYS,
+             COLUMN_VACATION_DAYS, COLUMN_SICK_DAYS]
+        ].sort_values(COLUMN_EMPLOYEE).reset_index(drop=True)
+
+        return per_employee, per_group, None
+
+    except Exception as e:
+        return None, None, f"Fehler beim Auswerten der Abwesenheiten: {str(e)}"
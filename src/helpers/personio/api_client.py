@@ -5,10 +5,36 @@ A centralized API client for the Personio HR API that handles OAuth2 authenticat
 token management, pagination, and common API operations.
 """
 
+import math
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 
+from ..concurrency import ordered_map
+from .retry import RateGovernor, RetryPolicy
+from .sharding import SHARD_MONTH, SHARD_MAX_WORKERS, split_date_range, fetch_sharded
+
+# Records per page and pages fetched concurrently
+PAGE_LIMIT = 200
+PAGINATION_MAX_WORKERS = 4
+
+# Sustained request rate shared by all page requests of a client (conservative
+# against Personio's per-minute API limits)
+PERSONIO_REQUESTS_PER_SECOND = 2.0
+
+# Seconds before a single request is aborted
+REQUEST_TIMEOUT = 60
+
+# Tokens are renewed this long before they expire, so no page request of a
+# long pull starts with a token that runs out mid-flight
+TOKEN_REFRESH_MARGIN = timedelta(minutes=2)
+
+
+class TokenRefreshError(requests.exceptions.RequestException):
+    """Raised when an expired or rejected token cannot be renewed."""
+
 
 class PersonioAPIClient:
     """
@@ -19,21 +45,35 @@ class PersonioAPIClient:
     """
 
     BASE_URL = "https://api.personio.de"
-    AUTH_URL = f"{BASE_URL}/v2/auth/token"
-    API_V1_URL = f"{BASE_URL}/v1"
 
-    def __init__(self, client_id: str, client_secret: str):
+    def __init__(self, client_id: str, client_secret: str, retry_policy: Optional[RetryPolicy] = None,
+                 base_url: Optional[str] = None, requests_per_second: float = PERSONIO_REQUESTS_PER_SECOND):
         """
         Initialize the Personio API client.
 
         Args:
             client_id: Personio API Client ID
             client_secret: Personio API Client Secret
+            retry_policy: Retry behavior for rate limited and transient failures (default: RetryPolicy())
+            base_url: API base URL (default: BASE_URL, e.g. a local mock server for benchmarks)
+            requests_per_second: Sustained request rate of the client
         """
         self.client_id = client_id
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+        self.auth_url = f"{self.base_url}/v2/auth/token"
+        self.api_v1_url = f"{self.base_url}/v1"
         self.client_secret = client_secret
         self.access_token = None
         self.token_expires_at = None
+        self._auth_lock = threading.Lock()
+
+        # Keep-alive connections shared by concurrent page requests
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=PAGINATION_MAX_WORKERS * SHARD_MAX_WORKERS)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._governor = RateGovernor(requests_per_second)
+        self.retry_policy = retry_policy or RetryPolicy()
 
     def authenticate(self) -> Tuple[Optional[str], Optional[datetime], Optional[str]]:
         """
@@ -53,7 +93,7 @@ class PersonioAPIClient:
         }
 
         try:
-            response = requests.post(self.AUTH_URL, headers=headers, data=data)
+            response = self._session.post(self.auth_url, headers=headers, data=data, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
 
             token_data = response.json()
@@ -80,62 +120,173 @@ class PersonioAPIClient:
             return False
         return datetime.now() < self.token_expires_at
 
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for API requests with current access token."""
+    def ensure_token(self, rejected_token: Optional[str] = None) -> Optional[str]:
+        """
+        Renew the access token if it expires soon or was rejected.
+
+        Thread-safe: concurrent callers wait for a single refresh. A caller
+        reporting a rejected token that another thread already replaced
+        does not refresh again.
+
+        Args:
+            rejected_token: Token the API answered with 401, if any
+
+        Returns:
+            Error message if the refresh failed, otherwise None
+        """
+        with self._auth_lock:
+            if rejected_token is not None:
+                if self.access_token != rejected_token:
+                    return None
+            elif self.access_token and self.token_expires_at and \
+                    datetime.now() + TOKEN_REFRESH_MARGIN < self.token_expires_at:
+                return None
+
+            _, _, error = self.authenticate()
+            return error
+
+    def _get_headers(self, token: Optional[str] = None) -> Dict[str, str]:
+        """Get headers for API requests with the given (default: current) access token."""
         return {
             'accept': 'application/json',
-            'authorization': f'Bearer {self.access_token}'
+            'authorization': f'Bearer {token or self.access_token}'
         }
 
+    def _get_page(self, url: str, params: Dict, offset: int, limit: int) -> Dict:
+        """
+        Fetch a single page (paced by the rate governor, on the shared session).
+
+        The token is renewed before it expires; a page answered with 401 is
+        requested once more with a fresh token. Rate limited and transient
+        failures are retried according to the retry policy. Either way the
+        pull continues at the offset that failed.
+
+        Raises:
+            TokenRefreshError: If the token cannot be renewed
+            requests.exceptions.RequestException: On connection or HTTP errors after all retries
+        """
+        token_refreshed = False
+        attempt = 0
+        while True:
+            error = self.ensure_token()
+            if error:
+                raise TokenRefreshError(f"Token konnte nicht erneuert werden: {error}")
+
+            token = self.access_token
+            self._governor.wait()
+            try:
+                response = self._session.get(
+                    url,
+                    headers=self._get_headers(token),
+                    params={**params, 'limit': limit, 'offset': offset},
+                    timeout=REQUEST_TIMEOUT
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                attempt += 1
+                if not self.retry_policy.should_retry(None, attempt):
+                    raise
+                self._governor.backoff(self.retry_policy.delay(attempt))
+                continue
+
+            self._governor.observe(response.headers)
+
+            if response.status_code == 401 and not token_refreshed:
+                token_refreshed = True
+                error = self.ensure_token(rejected_token=token)
+                if error:
+                    raise TokenRefreshError(f"Token konnte nicht erneuert werden: {error}")
+                continue
+
+            if response.status_code >= 400:
+                attempt += 1
+                if self.retry_policy.should_retry(response.status_code, attempt):
+                    self._governor.backoff(
+                        self.retry_policy.delay(attempt, response.headers),
+                        rate_limited=response.status_code == 429
+                    )
+                    continue
+
+            response.raise_for_status()
+            return response.json()
+
+    def pull_stats(self) -> Dict[str, float]:
+        """
+        Request statistics of the last get_employees/get_absences/get_attendances call.
+
+        Returns:
+            Dict with requests, retries, wait_seconds, elapsed_seconds and requests_per_second
+        """
+        return self._governor.stats()
+
+    @staticmethod
+    def _remaining_offsets(metadata: Dict, limit: int) -> Optional[List[int]]:
+        """
+        Offsets of the pages after the first, derived from the response metadata.
+
+        Returns:
+            List of offsets, or None if the metadata has no totals
+        """
+        if metadata.get('total_elements') is not None:
+            pages = math.ceil(int(metadata['total_elements']) / limit)
+        elif metadata.get('total_pages') is not None:
+            pages = int(metadata['total_pages'])
+        else:
+            return None
+
+        return [page * limit for page in range(1, pages)]
+
     def _make_paginated_request(
         self,
         endpoint: str,
         params: Optional[Dict] = None,
-        limit: int = 200
+        limit: int = PAGE_LIMIT,
+        max_workers: int = PAGINATION_MAX_WORKERS
     ) -> Tuple[Optional[List], Optional[str]]:
         """
         Make a paginated GET request to Personio API.
 
+        The first page is fetched alone; if its metadata reports the total
+        number of records, the remaining pages are fetched concurrently and
+        returned in offset order. Without totals, pages are fetched one after
+        another until a short page is returned.
+
         Args:
             endpoint: API endpoint path (e.g., '/company/employees')
             params: Optional query parameters (excluding limit/offset)
             limit: Number of records per page (default 200)
+            max_workers: Pages fetched concurrently
 
         Returns:
             Tuple of (all_records, error)
         """
-        if not self.is_token_valid():
-            return None, "Token ist ungültig oder abgelaufen. Bitte authentifizieren Sie sich zuerst."
-
-        url = f"{self.API_V1_URL}{endpoint}"
-        headers = self._get_headers()
-        all_records = []
-        offset = 0
-
-        # Prepare base parameters
-        if params is None:
-            params = {}
+        url = f"{self.api_v1_url}{endpoint}"
+        params = params or {}
 
         try:
-            while True:
-                # Add pagination parameters
-                page_params = {**params, 'limit': limit, 'offset': offset}
+            first_page = self._get_page(url, params, 0, limit)
+            all_records = list(first_page.get('data', []))
 
-                response = requests.get(url, headers=headers, params=page_params)
-                response.raise_for_status()
+            if len(all_records) < limit:
+                return all_records, None
 
-                data = response.json()
-                records = data.get('data', [])
+            offsets = self._remaining_offsets(first_page.get('metadata') or {}, limit)
 
-                if not records:
-                    break
+            if offsets is not None:
+                # Fan out the remaining pages; ordered_map keeps offset order
+                def fetch(offset: int) -> List:
+                    return self._get_page(url, params, offset, limit).get('data', [])
 
-                all_records.extend(records)
+                for records in ordered_map(fetch, offsets, max_workers):
+                    all_records.extend(records)
+                return all_records, None
 
-                # Check if there are more pages
+            # No totals in the metadata: fetch sequentially until a short page
+            offset = limit
+            while True:
+                records = self._get_page(url, params, offset, limit).get('data', [])
+                all_records.extend(records)
                 if len(records) < limit:
                     break
-
                 offset += limit
 
             return all_records, None
@@ -145,14 +296,49 @@ class PersonioAPIClient:
         except Exception as e:
             return None, f"Unerwarteter Fehler: {str(e)}"
 
-    def get_employees(self) -> Tuple[Optional[Dict], Optional[str]]:
+    def _get_date_range_records(
+        self,
+        endpoint: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        shard_by: Optional[str],
+        extra_params: Optional[Dict] = None
+    ) -> Tuple[Optional[List], Optional[str]]:
+        """
+        Fetch records of a date-filtered endpoint, sharded into windows if possible.
+
+        Ranges with both dates that span more than one window are fetched per
+        window in parallel and merged (see fetch_sharded); all other ranges
+        are fetched as a single paginated query.
+        """
+        params = dict(extra_params or {})
+        if start_date:
+            params['start_date'] = start_date
+        if end_date:
+            params['end_date'] = end_date
+
+        windows = split_date_range(start_date, end_date, shard_by) if shard_by and start_date and end_date else []
+        if len(windows) <= 1:
+            return self._make_paginated_request(endpoint, params)
+
+        def fetch_window(window: Tuple[str, str]) -> Tuple[Optional[List], Optional[str]]:
+            return self._make_paginated_request(endpoint, {**params, 'start_date': window[0], 'end_date': window[1]})
+
+        return fetch_sharded(fetch_window, windows)
+
+    def get_employees(self, updated_since: Optional[datetime] = None) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Retrieve all employees from Personio API with automatic pagination.
 
+        Args:
+            updated_since: Only return employees changed since this time (delta sync)
+
         Returns:
             Tuple of (employees_data, error) where employees_data is {'data': [employees]}
         """
-        records, error = self._make_paginated_request('/company/employees')
+        self._governor.reset_stats()
+        params = {'updated_since': updated_since.strftime('%Y-%m-%dT%H:%M:%S')} if updated_since else None
+        records, error = self._make_paginated_request('/company/employees', params)
 
         if error:
             return None, error
@@ -162,7 +348,9 @@ class PersonioAPIClient:
     def get_absences(
         self,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        shard_by: Optional[str] = SHARD_MONTH,
+        updated_from: Optional[datetime] = None
     ) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Retrieve all absences (time-offs) from Personio API with automatic pagination.
@@ -170,17 +358,15 @@ class PersonioAPIClient:
         Args:
             start_date: Optional start date in YYYY-MM-DD format
             end_date: Optional end date in YYYY-MM-DD format
+            shard_by: Split ranges into SHARD_MONTH or SHARD_WEEK windows fetched in parallel (None: single query)
+            updated_from: Only return records changed since this time (delta sync)
 
         Returns:
             Tuple of (absences_data, error) where absences_data is {'data': [absences]}
         """
-        params = {}
-        if start_date:
-            params['start_date'] = start_date
-        if end_date:
-            params['end_date'] = end_date
-
-        records, error = self._make_paginated_request('/company/time-offs', params)
+        self._governor.reset_stats()
+        extra_params = {'updated_from': updated_from.strftime('%Y-%m-%d')} if updated_from else None
+        records, error = self._get_date_range_records('/company/time-offs', start_date, end_date, shard_by, extra_params)
 
         if error:
             return None, error
@@ -190,7 +376,9 @@ class PersonioAPIClient:
     def get_attendances(
         self,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        shard_by: Optional[str] = SHARD_MONTH,
+        updated_from: Optional[datetime] = None
     ) -> Tuple[Optional[Dict], Optional[str]]:
         """
         Retrieve all attendances from Personio API with automatic pagination.
@@ -198,17 +386,15 @@ class PersonioAPIClient:
         Args:
             start_date: Optional start date in YYYY-MM-DD format
             end_date: Optional end date in YYYY-MM-DD format
+            shard_by: Split ranges into SHARD_MONTH or SHARD_WEEK windows fetched in parallel (None: single query)
+            updated_from: Only return records changed since this time (delta sync)
 
         Returns:
             Tuple of (attendances_data, error) where attendances_data is {'data': [attendances]}
         """
-        params = {}
-        if start_date:
-            params['start_date'] = start_date
-        if end_date:
-            params['end_date'] = end_date
-
-        records, error = self._make_paginated_request('/company/attendances', params)
+        self._governor.reset_stats()
+        extra_params = {'updated_from': updated_from.strftime('%Y-%m-%dT%H:%M:%S')} if updated_from else None
+        records, error = self._get_date_range_records('/company/attendances', start_date, end_date, shard_by, extra_params)
 
         if error:
             return None, error
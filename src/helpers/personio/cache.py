@@ -0,0 +1,249 @@
+"""
+Persistent local cache of Personio data with delta sync.
+
+Employees, absences and attendances are stored per Personio client ID in a
+SQLite file under `.personio_cache/`. The first fetch of a dataset (and date
+range) downloads everything; later fetches only request records changed
+since the last sync (Personio's `updated_since` / `updated_from` filters)
+and merge them into the cache, so the data also survives page reloads.
+
+The files hold HR data (including sick leave) unencrypted: they are only
+readable by the current user and are deleted once they have not been
+synced for CACHE_RETENTION.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .api_client import PersonioAPIClient
+from .sharding import SHARD_MONTH, record_id
+
+DEFAULT_CACHE_DIR = os.environ.get('POOOL_PERSONIO_CACHE_DIR', '.personio_cache')
+
+# Cache files not synced for this long are deleted
+CACHE_RETENTION = timedelta(days=int(os.environ.get('POOOL_PERSONIO_CACHE_RETENTION_DAYS', '7')))
+
+# Cached datasets
+DATASET_EMPLOYEES = 'employees'
+DATASET_ABSENCES = 'absences'
+DATASET_ATTENDANCES = 'attendances'
+
+# Changes are requested from slightly before the last sync to cover clock skew
+DELTA_OVERLAP = timedelta(minutes=10)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    dataset TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dataset, scope, record_key)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    dataset TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    synced_at TEXT NOT NULL,
+    PRIMARY KEY (dataset, scope)
+);
+"""
+
+
+def date_scope(start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+    """Return the cache scope of a date range (empty for unfiltered data)."""
+    if not start_date and not end_date:
+        return ''
+    return f"{start_date or ''}|{end_date or ''}"
+
+
+def cache_path(client_id: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Return the cache file of a client ID (hashed for the file name)."""
+    name = hashlib.sha256(client_id.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}.sqlite")
+
+
+def remove_cache(client_id: str, cache_dir: str = DEFAULT_CACHE_DIR) -> None:
+    """Delete the cache file of a client ID (if any)."""
+    path = cache_path(client_id, cache_dir)
+    for file_path in (path, f"{path}-journal"):
+        if os.path.exists(file_path):
+            os.remove(file_path)
+
+
+def purge_expired(cache_dir: str = DEFAULT_CACHE_DIR, retention: timedelta = CACHE_RETENTION) -> int:
+    """
+    Delete cache files that were not written for longer than the retention.
+
+    Args:
+        cache_dir: Directory holding the cache files
+        retention: Maximum age since the last sync
+
+    Returns:
+        Number of deleted cache files
+    """
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    cutoff = (datetime.now() - retention).timestamp()
+    removed = 0
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith('.sqlite') and os.path.getmtime(path) < cutoff:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                print(f"Warning: Could not delete expired Personio cache {path}: {e}")
+    return removed
+
+
+def _record_key(record: Dict) -> str:
+    """Stable key of a record: its id, or a hash of the payload for records without id."""
+    key = record_id(record)
+    if key is not None:
+        return str(key)
+    return 'sha:' + hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class PersonioCache:
+    """
+    SQLite-backed record cache for one Personio client ID.
+
+    Records are stored as JSON per dataset and scope (date range). Each
+    method opens its own connection, so the cache can be used from worker
+    threads; writes are serialized.
+    """
+
+    def __init__(self, client_id: str, cache_dir: str = DEFAULT_CACHE_DIR):
+        """
+        Open (or create) the cache file of a client ID.
+
+        Expired cache files are deleted first (see purge_expired); the
+        directory and file are only accessible by the current user.
+
+        Args:
+            client_id: Personio API client ID (hashed for the file name)
+            cache_dir: Directory holding the cache files
+        """
+        purge_expired(cache_dir)
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        self.path = cache_path(client_id, cache_dir)
+        self._lock = threading.Lock()
+
+        with closing(self._connect()) as conn:
+            conn.executescript(_SCHEMA)
+            conn.commit()
+        os.chmod(self.path, 0o600)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def last_synced(self, dataset: str, scope: str = '') -> Optional[datetime]:
+        """Return the time of the last successful sync, or None if never synced."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT synced_at FROM sync_state WHERE dataset = ? AND scope = ?", (dataset, scope)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def load(self, dataset: str, scope: str = '') -> List[Dict]:
+        """Return all cached records of a dataset and scope (in insertion order)."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT payload FROM records WHERE dataset = ? AND scope = ? ORDER BY rowid", (dataset, scope)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def store(self, dataset: str, scope: str, records: List[Dict], synced_at: datetime,
+              replace: bool = False) -> None:
+        """
+        Write records and the sync time in one transaction.
+
+        Args:
+            dataset: Dataset name
+            scope: Cache scope (see date_scope)
+            records: Records to insert or update (matched by id)
+            synced_at: Time the fetch started
+            replace: Drop all cached records of the scope first (full sync)
+        """
+        rows = [(dataset, scope, _record_key(r), json.dumps(r, default=str)) for r in records]
+        with self._lock, closing(self._connect()) as conn:
+            if replace:
+                conn.execute("DELETE FROM records WHERE dataset = ? AND scope = ?", (dataset, scope))
+            conn.executemany(
+                "INSERT INTO records (dataset, scope, record_key, payload) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (dataset, scope, record_key) DO UPDATE SET payload = excluded.payload",
+                rows
+            )
+            conn.execute(
+                "INSERT INTO sync_state (dataset, scope, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (dataset, scope) DO UPDATE SET synced_at = excluded.synced_at",
+                (dataset, scope, synced_at.isoformat())
+            )
+            conn.commit()
+
+    def clear(self, dataset: Optional[str] = None) -> None:
+        """Drop cached records and sync state (of one dataset, or all)."""
+        with self._lock, closing(self._connect()) as conn:
+            if dataset:
+                conn.execute("DELETE FROM records WHERE dataset = ?", (dataset,))
+                conn.execute("DELETE FROM sync_state WHERE dataset = ?", (dataset,))
+            else:
+                conn.execute("DELETE FROM records")
+                conn.execute("DELETE FROM sync_state")
+            conn.commit()
+
+
+def sync_dataset(client: PersonioAPIClient, cache: PersonioCache, dataset: str,
+                 start_date: Optional[str] = None, end_date: Optional[str] = None,
+                 shard_by: Optional[str] = SHARD_MONTH,
+                 full: bool = False) -> Tuple[Optional[Dict], Dict, Optional[str]]:
+    """
+    Bring the cached copy of a dataset up to date and return it.
+
+    Without earlier sync (or with full=True) everything is downloaded and
+    replaces the cached scope; otherwise only records changed since the last
+    sync are fetched and merged. Records deleted in Personio are only
+    removed by a full sync.
+
+    Args:
+        client: Authenticated PersonioAPIClient
+        cache: PersonioCache of the client ID
+        dataset: DATASET_EMPLOYEES, DATASET_ABSENCES or DATASET_ATTENDANCES
+        start_date: Optional start date (absences/attendances)
+        end_date: Optional end date (absences/attendances)
+        shard_by: Window size for long date ranges
+        full: Ignore the cache and download everything
+
+    Returns:
+        Tuple of (data in API response shape {'data': [...]}, stats, error).
+        Stats hold 'mode' ("full" or "delta"), 'fetched' and 'total'.
+    """
+    scope = '' if dataset == DATASET_EMPLOYEES else date_scope(start_date, end_date)
+    last_synced = None if full else cache.last_synced(dataset, scope)
+    synced_at = datetime.now()
+
+    changed_since = last_synced - DELTA_OVERLAP if last_synced else None
+    if dataset == DATASET_EMPLOYEES:
+        response, error = client.get_employees(updated_since=changed_since)
+    elif dataset == DATASET_ABSENCES:
+        response, error = client.get_absences(start_date, end_date, shard_by, updated_from=changed_since)
+    elif dataset == DATASET_ATTENDANCES:
+        response, error = client.get_attendances(start_date, end_date, shard_by, updated_from=changed_since)
+    else:
+        return None, {}, f"Unbekannter Datensatz: {dataset}"
+
+    if error:
+        return None, {}, error
+
+    records = response.get('data', [])
+    cache.store(dataset, scope, records, synced_at, replace=last_synced is None)
+
+    cached = cache.load(dataset, scope)
+    stats = {'mode': 'delta' if last_synced else 'full', 'fetched': len(records), 'total': len(cached)}
+    return {'data': cached}, stats, None
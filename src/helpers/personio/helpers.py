@@ -6,21 +6,28 @@ from the Personio HR API.
 """
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from .api_client import PersonioAPIClient
+from .sharding import SHARD_MONTH
 
+# Columns whose values are all plain ISO dates are stored as Arrow dates
+_ISO_DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}$'
 
-def create_personio_client(client_id: str, client_secret: str) -> PersonioAPIClient:
+
+def create_personio_client(client_id: str, client_secret: str, base_url: str = None) -> PersonioAPIClient:
     """
     Create and authenticate a Personio API client.
 
     Args:
         client_id: Personio API Client ID
         client_secret: Personio API Client Secret
+        base_url: Optional API base URL (default: Personio production API)
 
     Returns:
         Authenticated PersonioAPIClient instance, or None if authentication fails
     """
-    client = PersonioAPIClient(client_id, client_secret)
+    client = PersonioAPIClient(client_id, client_secret, base_url=base_url)
     _, _, error = client.authenticate()
 
     if error:
@@ -42,7 +49,7 @@ def get_employees(client: PersonioAPIClient):
     return client.get_employees()
 
 
-def get_absences(client: PersonioAPIClient, start_date=None, end_date=None):
+def get_absences(client: PersonioAPIClient, start_date=None, end_date=None, shard_by=SHARD_MONTH):
     """
     Retrieve all absences from Personio API with automatic pagination.
 
@@ -50,14 +57,15 @@ def get_absences(client: PersonioAPIClient, start_date=None, end_date=None):
         client: Authenticated PersonioAPIClient instance
         start_date: Optional start date (YYYY-MM-DD format)
         end_date: Optional end date (YYYY-MM-DD format)
+        shard_by: Fetch long ranges in month or week windows ("month", "week" or None)
 
     Returns:
         Tuple of (absences_data, error)
     """
-    return client.get_absences(start_date, end_date)
+    return client.get_absences(start_date, end_date, shard_by)
 
 
-def get_attendances(client: PersonioAPIClient, start_date=None, end_date=None):
+def get_attendances(client: PersonioAPIClient, start_date=None, end_date=None, shard_by=SHARD_MONTH):
     """
     Retrieve all attendances from Personio API with automatic pagination.
 
@@ -65,11 +73,12 @@ def get_attendances(client: PersonioAPIClient, start_date=None, end_date=None):
         client: Authenticated PersonioAPIClient instance
         start_date: Optional start date (YYYY-MM-DD format)
         end_date: Optional end date (YYYY-MM-DD format)
+        shard_by: Fetch long ranges in month or week windows ("month", "week" or None)
 
     Returns:
         Tuple of (attendances_data, error)
     """
-    return client.get_attendances(start_date, end_date)
+    return client.get_attendances(start_date, end_date, shard_by)
 
 
 def process_employees_data(employees_data):
@@ -83,22 +92,7 @@ def process_employees_data(employees_data):
             return pd.DataFrame(), {}, None
 
         # Extract employee information and build column mapping
-        processed_employees = []
-        column_mapping = {}
-
-        for employee in employees:
-            emp_data = {}
-
-            # Extract attributes
-            attributes = employee.get('attributes', {})
-            for key, value in attributes.items():
-                column_name, processed_value, json_path = process_attribute(key, value)
-                column_mapping[json_path] = column_name
-                emp_data[column_name] = processed_value
-
-            processed_employees.append(emp_data)
-
-        df = pd.DataFrame(processed_employees)
+        df, column_mapping = flatten_records(employees)
         return df, column_mapping, None
 
     except Exception as e:
@@ -123,22 +117,9 @@ def process_absences_data(absences_data):
             return pd.DataFrame(), {}, None
 
         # Extract absence information and build column mapping
-        processed_absences = []
-        column_mapping = {}
-
-        for absence in absences:
-            absence_record = {}
-
-            # Extract attributes
-            attributes = absence.get('attributes', {})
-            for key, value in attributes.items():
-                column_name, processed_value, json_path = process_attribute(key, value)
-                column_mapping[json_path] = column_name
-                absence_record[column_name] = processed_value
-
-            processed_absences.append(absence_record)
-
-        df = pd.DataFrame(processed_absences)
+        df, column_mapping = flatten_records(absences)
+        # The employee column only holds a name; keep the ID to join with employees
+        df, column_mapping = add_employee_id_column(df, column_mapping, absences)
         return df, column_mapping, None
 
     except Exception as e:
@@ -163,26 +144,163 @@ def process_attendances_data(attendances_data):
             return pd.DataFrame(), {}, None
 
         # Extract attendance information and build column mapping
-        processed_attendances = []
-        column_mapping = {}
+        df, column_mapping = flatten_records(attendances)
+        return df, column_mapping, None
+
+    except Exception as e:
+        return None, None, f"Fehler beim Verarbeiten der Anwesenheitsdaten: {str(e)}"
 
-        for attendance in attendances:
-            attendance_record = {}
 
-            # Extract attributes
-            attributes = attendance.get('attributes', {})
-            for key, value in attributes.items():
-                column_name, processed_value, json_path = process_attribute(key, value)
-                column_mapping[json_path] = column_name
-                attendance_record[column_name] = processed_value
+def _attribute_shape(key, value):
+    """Structure of an attribute value that decides its column name, JSON path and extraction"""
+    if not isinstance(value, dict):
+        return None
 
-            processed_attendances.append(attendance_record)
+    actual_value = value.get('value', value)
+    if isinstance(actual_value, list):
+        kind = 'list'
+    elif isinstance(actual_value, dict):
+        kind = 'object_attributes' if 'attributes' in actual_value else 'object'
+    else:
+        kind = 'scalar'
 
-        df = pd.DataFrame(processed_attendances)
-        return df, column_mapping, None
+    return value.get('label', key), 'value' in value, kind
 
-    except Exception as e:
-        return None, None, f"Fehler beim Verarbeiten der Anwesenheitsdaten: {str(e)}"
+
+def _compile_extractor(shape):
+    """Build the value extractor for an attribute shape (same result as process_attribute)"""
+    if shape is None:
+        return lambda value: value
+
+    _, has_value, kind = shape
+    if not has_value:
+        # Without 'value' field the attribute object itself is the value
+        return process_object_value
+    if kind == 'list':
+        return lambda value: process_list_value(value['value'])
+    if kind == 'scalar':
+        return lambda value: value['value']
+    return lambda value: process_object_value(value['value'])
+
+
+def _to_column(values):
+    """
+    Convert a column buffer to an Arrow-backed array (object column as fallback).
+
+    Strings, numbers and booleans become Arrow arrays; string columns holding
+    only YYYY-MM-DD dates become date32. Columns with mixed or nested values
+    keep the Python objects.
+    """
+    try:
+        array = pa.array(values)
+    except (pa.ArrowException, OverflowError):
+        return pd.array(values, dtype=object)
+
+    if pa.types.is_nested(array.type):
+        return pd.array(values, dtype=object)
+    if pa.types.is_null(array.type):
+        array = array.cast(pa.string())
+    elif pa.types.is_string(array.type) and array.null_count < len(array):
+        if pc.all(pc.match_substring_regex(array, _ISO_DATE_PATTERN)).as_py():
+            try:
+                array = array.cast(pa.date32())
+            except pa.ArrowException:
+                pass
+
+    return pd.arrays.ArrowExtensionArray(array)
+
+
+def flatten_records(records):
+    """
+    Flatten the attributes of Personio records into an Arrow-backed DataFrame.
+
+    The column name and JSON path of an attribute only depend on its key and
+    structure (label, value field, value type). They are derived once per
+    distinct structure with process_attribute, together with a compiled
+    extractor; all other values only run their extractor and are appended to
+    per-column buffers, which are converted to typed Arrow arrays once (see
+    _to_column). Column names, column order and mapping are the same as
+    processing every attribute with process_attribute; records without an
+    attribute hold a null value.
+
+    Args:
+        records: Records with an 'attributes' dict
+
+    Returns:
+        Tuple of (df, column_mapping)
+    """
+    row_count = len(records)
+    columns = {}
+    column_mapping = {}
+    schema = {}
+
+    for position, record in enumerate(records):
+        for key, value in record.get('attributes', {}).items():
+            shape = _attribute_shape(key, value)
+            field = schema.get((key, shape))
+            if field is None:
+                column_name, _, json_path = process_attribute(key, value)
+                field = schema[(key, shape)] = (column_name, json_path, _compile_extractor(shape))
+
+            column_name, json_path, extract = field
+            column_mapping[json_path] = column_name
+
+            values = columns.get(column_name)
+            if values is None:
+                values = columns[column_name] = [None] * row_count
+            values[position] = extract(value)
+
+    df = pd.DataFrame(
+        {column_name: _to_column(values) for column_name, values in columns.items()},
+        index=pd.RangeIndex(row_count)
+    )
+    return df, column_mapping
+
+
+def add_employee_id_column(df, column_mapping, records, key='employee'):
+    """
+    Add the ID of a nested Employee object next to its name column.
+
+    flatten_records turns nested Employee objects into a display name, which
+    is not unique. The ID column ("<label> (<key>.attributes.id.value)") is
+    inserted after the name column; records without the reference hold null.
+
+    Args:
+        df: DataFrame from flatten_records
+        column_mapping: Column mapping from flatten_records
+        records: The flattened records
+        key: Attribute holding the Employee object
+
+    Returns:
+        Tuple of (df, column_mapping); unchanged if no record has an employee ID
+    """
+    ids = [None] * len(records)
+    label, json_path = None, None
+    for position, record in enumerate(records):
+        employee = record.get('attributes', {}).get(key)
+        if not isinstance(employee, dict):
+            continue
+        employee_id = employee.get('attributes', {}).get('id')
+        if isinstance(employee_id, dict):
+            label = label or employee_id.get('label')
+            json_path = json_path or f"{key}.attributes.id.value"
+            employee_id = employee_id.get('value')
+        else:
+            json_path = json_path or f"{key}.attributes.id"
+        ids[position] = employee_id
+
+    if all(employee_id is None for employee_id in ids):
+        return df, column_mapping
+
+    column_name = f"{label or 'ID'} ({json_path})"
+    name_column = column_mapping.get(f"{key}.attributes")
+    position = df.columns.get_loc(name_column) + 1 if name_column in df.columns else len(df.columns)
+    df = df.copy()
+    df.insert(position, column_name, _to_column(ids))
+
+    column_mapping = dict(column_mapping)
+    column_mapping[json_path] = column_name
+    return df, column_mapping
 
 
 def process_attribute(key, value, path_prefix=""):
@@ -0,0 +1,450 @@
+"""
+Local Personio mock server for offline tests and benchmarks.
+
+Serves synthetic employees, time-offs and attendances in the payload shapes
+of the Personio v1 API (records of `{type, attributes}` with `{label, value}`
+attributes and nested Employee/Department/TimeOffType objects), with
+limit/offset pagination, date filters, OAuth2 tokens, artificial latency,
+a per-window rate limit and optional transient errors. Standard library
+only, so it runs without Personio credentials or extra dependencies:
+
+    python -m src.helpers.personio.mock_server --employees 2000 --latency 0.05 --rate-limit 300
+
+Point a client at it with PersonioAPIClient(..., base_url=server.url).
+"""
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Page size limit of the Personio v1 API
+MAX_PAGE_LIMIT = 200
+
+_FIRST_NAMES = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Lea",
+                "Lukas", "Marie", "Noah", "Paul", "Sophie", "Tim"]
+_LAST_NAMES = ["Becker", "Fischer", "Hoffmann", "Koch", "Meyer", "Müller", "Richter", "Schmidt",
+               "Schneider", "Schulz", "Wagner", "Weber"]
+_DEPARTMENTS = ["Beratung", "Entwicklung", "Design", "Vertrieb", "Verwaltung", "Projektmanagement"]
+_POSITIONS = ["Junior", "Consultant", "Senior", "Lead", "Director"]
+_TIME_OFF_TYPES = [(1, "Urlaub", "paid_vacation"), (2, "Krankheit", "sick_leave"),
+                   (3, "Fortbildung", "training"), (4, "Sonderurlaub", "special_leave")]
+
+
+@dataclass
+class MockConfig:
+    """
+    Scale and behavior of the mock server.
+
+    Attributes:
+        employees: Number of employees
+        absences_per_employee: Time-off periods per employee
+        start_date: First day of generated absences and attendances (YYYY-MM-DD)
+        days: Number of days covered (attendances on every weekday)
+        latency: Seconds added to every API response
+        rate_limit: Requests per rate window (0: unlimited)
+        rate_window: Length of the rate window in seconds
+        error_rate: Share of data requests answered with 503 (0-1)
+        token_ttl: Token lifetime in seconds
+        seed: Random seed of the synthetic data
+    """
+    employees: int = 200
+    absences_per_employee: int = 6
+    start_date: str = "2024-01-01"
+    days: int = 365
+    latency: float = 0.0
+    rate_limit: int = 0
+    rate_window: float = 60.0
+    error_rate: float = 0.0
+    token_ttl: int = 3600
+    seed: int = 42
+
+
+def _attribute(label: str, value, attr_type: str = "standard") -> Dict:
+    """Personio attribute object."""
+    return {"label": label, "value": value, "type": attr_type, "universal_id": None}
+
+
+def _timestamp(day: date) -> str:
+    """Personio date-time representation of a day."""
+    return f"{day.isoformat()}T00:00:00+01:00"
+
+
+def _employee_reference(employee: Dict) -> Dict:
+    """Nested Employee object as embedded in time-offs."""
+    attributes = employee["attributes"]
+    return {
+        "type": "Employee",
+        "attributes": {key: attributes[key] for key in ("id", "first_name", "last_name", "email")},
+    }
+
+
+def generate_dataset(config: MockConfig) -> Dict[str, List[Dict]]:
+    """
+    Generate synthetic Personio records.
+
+    Args:
+        config: Scale and seed
+
+    Returns:
+        Dict with 'employees', 'time-offs' and 'attendances' record lists
+    """
+    rng = random.Random(config.seed)
+    start = datetime.strptime(config.start_date, "%Y-%m-%d").date()
+    end = start + timedelta(days=config.days - 1)
+    updated_at = _timestamp(start)
+
+    employees = []
+    for employee_id in range(1, config.employees + 1):
+        first_name, last_name = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        department_id = rng.randrange(len(_DEPARTMENTS))
+        supervisor = None
+        if employee_id > 1:
+            supervisor_id = rng.randint(1, min(employee_id - 1, 20))
+            supervisor = {"type": "Employee", "attributes": {
+                "id": _attribute("ID", supervisor_id, "integer"),
+                "first_name": _attribute("Vorname", employees[supervisor_id - 1]["attributes"]["first_name"]["value"]),
+                "last_name": _attribute("Nachname", employees[supervisor_id - 1]["attributes"]["last_name"]["value"]),
+            }}
+
+        employees.append({"type": "Employee", "attributes": {
+            "id": _attribute("ID", employee_id, "integer"),
+            "first_name": _attribute("Vorname", first_name),
+            "last_name": _attribute("Nachname", last_name),
+            "email": _attribute("E-Mail", f"{first_name}.{last_name}.{employee_id}@example.com".lower()),
+            "status": _attribute("Status", rng.choice(["active", "active", "active", "onboarding", "leave"])),
+            "position": _attribute("Position", rng.choice(_POSITIONS)),
+            "department": _attribute("Abteilung", {"type": "Department", "attributes": {
+                "id": department_id + 1, "name": _DEPARTMENTS[department_id]}}),
+            "supervisor": _attribute("Vorgesetzte:r", supervisor),
+            "hire_date": _attribute("Eintrittsdatum", _timestamp(start - timedelta(days=rng.randint(30, 3000))), "date"),
+            "weekly_working_hours": _attribute("Wochenstunden", rng.choice([20, 30, 32, 40])),
+            "cost_centers": _attribute("Kostenstellen", [{"type": "CostCenter", "attributes": {
+                "id": department_id + 100, "name": f"KST {_DEPARTMENTS[department_id]}", "percentage": 100}}]),
+            "absence_entitlement": _attribute("Abwesenheitsanspruch", [{"type": "TimeOffType", "attributes": {
+                "id": 1, "name": "Urlaub", "entitlement": rng.choice([25, 28, 30])}}]),
+            "last_modified_at": _attribute("Zuletzt geändert", updated_at, "date"),
+        }})
+
+    time_offs = []
+    for employee in employees:
+        for _ in range(config.absences_per_employee):
+            type_id, type_name, category = rng.choice(_TIME_OFF_TYPES)
+            first_day = start + timedelta(days=rng.randrange(config.days))
+            last_day = min(end, first_day + timedelta(days=rng.randint(0, 9)))
+            time_offs.append({"type": "TimeOffPeriod", "attributes": {
+                "id": len(time_offs) + 1,
+                "status": "approved",
+                "start_date": _timestamp(first_day),
+                "end_date": _timestamp(last_day),
+                "days_count": float(sum(1 for offset in range((last_day - first_day).days + 1)
+                                        if (first_day + timedelta(days=offset)).weekday() < 5)),
+                "half_day_start": 0,
+                "half_day_end": 0,
+                "time_off_type": {"type": "TimeOffType", "attributes": {
+                    "id": type_id, "name": type_name, "category": category}},
+                "employee": _employee_reference(employee),
+                "created_by": "API",
+                "created_at": updated_at,
+                "updated_at": updated_at,
+            }})
+
+    attendances = []
+    for offset in range(config.days):
+        day = start + timedelta(days=offset)
+        if day.weekday() >= 5:
+            continue
+        for employee_id in range(1, config.employees + 1):
+            attendances.append({"id": len(attendances) + 1, "type": "AttendancePeriod", "attributes": {
+                "employee": employee_id,
+                "date": day.isoformat(),
+                "start_time": f"{rng.randint(7, 9):02d}:00",
+                "end_time": f"{rng.randint(16, 18):02d}:{rng.choice(['00', '30'])}",
+                "break": rng.choice([30, 45, 60]),
+                "comment": "",
+                "updated_at": updated_at,
+                "status": "confirmed",
+                "project": None,
+                "is_holiday": False,
+                "is_on_time_off": False,
+            }})
+
+    return {"employees": employees, "time-offs": time_offs, "attendances": attendances}
+
+
+def _record_range(endpoint: str, record: Dict) -> Tuple[str, str]:
+    """First and last day (YYYY-MM-DD) of a time-off or attendance record."""
+    attributes = record["attributes"]
+    if endpoint == "attendances":
+        return attributes["date"], attributes["date"]
+    return attributes["start_date"][:10], attributes["end_date"][:10]
+
+
+class MockPersonioServer:
+    """
+    Threaded HTTP server answering like the Personio API.
+
+    Use as a context manager or call start()/stop(); `url` is the base URL
+    to pass to PersonioAPIClient.
+    """
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Generate the data and bind the server (port 0 picks a free port).
+
+        Args:
+            config: Scale and behavior (default: MockConfig())
+            host: Interface to listen on
+            port: TCP port
+        """
+        self.config = config or MockConfig()
+        self.data = generate_dataset(self.config)
+        self._tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.config.seed)
+        self._window_start = time.monotonic()
+        self._window_requests = 0
+        self.request_count = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread and return the base URL."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self) -> None:
+        """Serve in the calling thread until stop() or an interrupt."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockPersonioServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def issue_token(self) -> str:
+        """Create an access token valid for config.token_ttl seconds."""
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._tokens[token] = time.monotonic() + self.config.token_ttl
+        return token
+
+    def token_valid(self, authorization: Optional[str]) -> bool:
+        """Check a 'Bearer <token>' header."""
+        if not authorization or not authorization.startswith("Bearer "):
+            return False
+        with self._lock:
+            expires = self._tokens.get(authorization[len("Bearer "):])
+        return expires is not None and time.monotonic() < expires
+
+    def take_rate_slot(self) -> Tuple[bool, Dict[str, str]]:
+        """
+        Count a request against the rate window.
+
+        Returns:
+            Tuple of (allowed, rate limit headers)
+        """
+        config = self.config
+        with self._lock:
+            self.request_count += 1
+            if not config.rate_limit:
+                return True, {}
+
+            now = time.monotonic()
+            if now - self._window_start >= config.rate_window:
+                self._window_start = now
+                self._window_requests = 0
+
+            reset = max(0.0, config.rate_window - (now - self._window_start))
+            allowed = self._window_requests < config.rate_limit
+            if allowed:
+                self._window_requests += 1
+            remaining = max(0, config.rate_limit - self._window_requests)
+
+        headers = {
+            "X-RateLimit-Limit": str(config.rate_limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": f"{reset:.0f}",
+        }
+        if not allowed:
+            headers["Retry-After"] = f"{max(1.0, reset):.0f}"
+        return allowed, headers
+
+    def inject_error(self) -> bool:
+        """Decide whether to answer a data request with a transient 503."""
+        if self.config.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.config.error_rate
+
+    def page(self, endpoint: str, query: Dict[str, List[str]]) -> Dict:
+        """
+        Build a paginated, date-filtered response body.
+
+        Args:
+            endpoint: 'employees', 'time-offs' or 'attendances'
+            query: Parsed query string
+
+        Returns:
+            Response body with success, metadata, offset, limit and data
+        """
+        records = self.data[endpoint]
+
+        start_date = query.get("start_date", [None])[0]
+        end_date = query.get("end_date", [None])[0]
+        if endpoint != "employees" and (start_date or end_date):
+            records = [record for record in records
+                       if (not end_date or _record_range(endpoint, record)[0] <= end_date)
+                       and (not start_date or _record_range(endpoint, record)[1] >= start_date)]
+
+        limit = max(1, min(MAX_PAGE_LIMIT, int(query.get("limit", [MAX_PAGE_LIMIT])[0])))
+        offset = max(0, int(query.get("offset", [0])[0]))
+        total = len(records)
+        return {
+            "success": True,
+            "metadata": {
+                "total_elements": total,
+                "current_page": offset // limit,
+                "total_pages": (total + limit - 1) // limit,
+            },
+            "offset": offset,
+            "limit": limit,
+            "data": records[offset:offset + limit],
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                form = parse_qs(self.rfile.read(length).decode("utf-8"))
+                if urlparse(self.path).path not in ("/v2/auth/token", "/v1/auth"):
+                    self._send(404, {"success": False, "error": {"message": "Not found"}})
+                    return
+                if not form.get("client_id") or not form.get("client_secret"):
+                    self._send(401, {"success": False, "error": {"message": "Invalid credentials"}})
+                    return
+
+                time.sleep(server.config.latency)
+                self._send(200, {
+                    "access_token": server.issue_token(),
+                    "token_type": "Bearer",
+                    "expires_in": server.config.token_ttl,
+                })
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                endpoint = parsed.path[len("/v1/company/"):] if parsed.path.startswith("/v1/company/") else None
+                if endpoint not in server.data:
+                    self._send(404, {"success": False, "error": {"message": "Not found"}})
+                    return
+
+                allowed, headers = server.take_rate_slot()
+                time.sleep(server.config.latency)
+                if not allowed:
+                    self._send(429, {"success": False, "error": {"message": "Too many requests"}}, headers)
+                elif not server.token_valid(self.headers.get("Authorization")):
+                    self._send(401, {"success": False, "error": {"message": "Unauthorized"}}, headers)
+                elif server.inject_error():
+                    self._send(503, {"success": False, "error": {"message": "Service unavailable"}}, headers)
+                else:
+                    self._send(200, server.page(endpoint, parse_qs(parsed.query)), headers)
+
+        return Handler
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the MockConfig options to a parser (shared with the benchmark)."""
+    defaults = MockConfig()
+    parser.add_argument("--employees", type=int, default=defaults.employees, help="Anzahl Mitarbeiter")
+    parser.add_argument("--absences-per-employee", type=int, default=defaults.absences_per_employee,
+                        help="Abwesenheiten pro Mitarbeiter")
+    parser.add_argument("--start-date", default=defaults.start_date, help="Erster Tag (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=defaults.days, help="Abgedeckte Tage")
+    parser.add_argument("--latency", type=float, default=defaults.latency, help="Antwortverzögerung in Sekunden")
+    parser.add_argument("--rate-limit", type=int, default=defaults.rate_limit,
+                        help="Anfragen pro Zeitfenster (0: unbegrenzt)")
+    parser.add_argument("--rate-window", type=float, default=defaults.rate_window, help="Zeitfenster in Sekunden")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Anteil der Anfragen mit 503-Antwort (0-1)")
+    parser.add_argument("--token-ttl", type=int, default=defaults.token_ttl, help="Token-Laufzeit in Sekunden")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Startwert der Zufallsdaten")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    """Build a MockConfig from parsed arguments (shared with the benchmark)."""
+    return MockConfig(
+        employees=args.employees,
+        absences_per_employee=args.absences_per_employee,
+        start_date=args.start_date,
+        days=args.days,
+        latency=args.latency,
+        rate_limit=args.rate_limit,
+        rate_window=args.rate_window,
+        error_rate=args.error_rate,
+        token_ttl=args.token_ttl,
+        seed=args.seed,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the mock server until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m src.helpers.personio.mock_server",
+                                     description="Lokalen Personio-Mock-Server starten")
+    parser.add_argument("--host", default="127.0.0.1", help="Netzwerkschnittstelle")
+    parser.add_argument("--port", type=int, default=8765, help="TCP-Port")
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockPersonioServer(config_from_args(args), args.host, args.port)
+    counts = ", ".join(f"{len(records):,} {name}" for name, records in server.data.items())
+    print(f"Personio-Mock läuft auf {server.url} ({counts})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
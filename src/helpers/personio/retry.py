@@ -0,0 +1,200 @@
+"""
+Retry policy and rate governor for Personio requests.
+
+Rate limited (429) and transient server responses (5xx) as well as
+connection errors are retried with jittered exponential backoff instead of
+failing the whole pull. The governor paces all requests of a client through
+a shared token bucket and pauses every worker when Personio reports an
+exhausted rate limit (Retry-After / X-RateLimit-* headers). Retries, waiting
+time and the effective request rate are counted per pull.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from ..rate_limiting import TokenBucket
+
+# Retries per request and backoff bounds (seconds)
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# X-RateLimit-Reset values above this are Unix timestamps, below are seconds
+_EPOCH_THRESHOLD = 10 ** 9
+
+
+def _header_float(headers, name: str) -> Optional[float]:
+    """Read a numeric response header, None if missing or malformed."""
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    When and how long to wait before repeating a failed request.
+
+    Attributes:
+        max_attempts: Retries per request after the first attempt
+        base_delay: Backoff before the first retry (seconds)
+        max_delay: Upper bound of a single backoff (seconds)
+        retry_statuses: HTTP statuses that are retried
+    """
+    max_attempts: int = RETRY_MAX_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+    retry_statuses: frozenset = RETRYABLE_STATUSES
+
+    def should_retry(self, status: Optional[int], attempt: int) -> bool:
+        """
+        Decide whether to retry.
+
+        Args:
+            status: HTTP status, or None for connection errors and timeouts
+            attempt: 1-based number of the retry that would follow
+
+        Returns:
+            True if the request should be repeated
+        """
+        if attempt > self.max_attempts:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt: int, headers=None) -> float:
+        """
+        Seconds to wait before a retry.
+
+        A Retry-After header (seconds) is honored; otherwise the delay grows
+        exponentially with jitter (between half and the full delay).
+
+        Args:
+            attempt: 1-based retry number
+            headers: Response headers of the failed request, if any
+
+        Returns:
+            Delay in seconds
+        """
+        retry_after = _header_float(headers, 'Retry-After') if headers is not None else None
+        if retry_after is not None:
+            return min(self.max_delay, max(0.0, retry_after))
+
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * (0.5 + random.random() / 2)
+
+
+class RateGovernor:
+    """
+    Thread-safe pacing of all requests of one client.
+
+    Requests take a token from a shared bucket. When a response reports
+    that the rate limit is used up (or a 429 arrives), all workers pause
+    until the limit resets. Counts requests, retries and waiting time since
+    the last reset_stats().
+    """
+
+    def __init__(self, rate: float):
+        """
+        Create a governor.
+
+        Args:
+            rate: Sustained requests per second
+        """
+        self._bucket = TokenBucket(rate)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Start counting a new pull."""
+        with self._lock:
+            self._started = time.monotonic()
+            self._requests = 0
+            self._retries = 0
+            self._wait_seconds = 0.0
+
+    def _add_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._wait_seconds += seconds
+
+    def wait(self) -> None:
+        """Block until the next request may be sent."""
+        with self._lock:
+            pause = self._paused_until - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            self._add_wait(pause)
+
+        self._add_wait(self._bucket.acquire())
+        with self._lock:
+            self._requests += 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold back all workers for the given time."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe(self, headers) -> None:
+        """
+        Pause all workers if the response reports an exhausted rate limit.
+
+        Args:
+            headers: Response headers (X-RateLimit-Remaining / X-RateLimit-Reset)
+        """
+        remaining = _header_float(headers, 'X-RateLimit-Remaining')
+        if remaining is None or remaining > 0:
+            return
+
+        reset = _header_float(headers, 'X-RateLimit-Reset')
+        if reset is None:
+            return
+        if reset > _EPOCH_THRESHOLD:
+            reset -= time.time()
+        if reset > 0:
+            self.pause(min(reset, RETRY_MAX_DELAY))
+
+    def backoff(self, seconds: float, rate_limited: bool = False) -> None:
+        """
+        Wait before a retry and count it.
+
+        Args:
+            seconds: Backoff delay
+            rate_limited: The request was rejected by the rate limit (pauses all workers)
+        """
+        with self._lock:
+            self._retries += 1
+
+        if rate_limited:
+            self.pause(seconds)
+            return
+
+        time.sleep(seconds)
+        self._add_wait(seconds)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Counters since the last reset_stats().
+
+        Returns:
+            Dict with requests, retries, wait_seconds, elapsed_seconds and
+            requests_per_second (effective rate)
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started
+            return {
+                'requests': self._requests,
+                'retries': self._retries,
+                'wait_seconds': self._wait_seconds,
+                'elapsed_seconds': elapsed,
+                'requests_per_second': self._requests / elapsed if elapsed > 0 else 0.0,
+            }
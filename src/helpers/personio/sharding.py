@@ -0,0 +1,139 @@
+"""
+Date-range sharding for Personio absence and attendance queries.
+
+Long date ranges are split into month or week windows that are fetched in
+parallel and merged. Records reported in two windows (e.g. absences crossing
+a month boundary) are de-duplicated by id, and a failed window can be
+retried on its own.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..concurrency import ordered_map
+
+# Window sizes
+SHARD_MONTH = 'month'
+SHARD_WEEK = 'week'
+
+# Windows fetched concurrently and retries of a failed window
+SHARD_MAX_WORKERS = 3
+SHARD_RETRIES = 2
+
+DateWindow = Tuple[str, str]
+
+
+def _parse_date(value) -> date:
+    """Parse a YYYY-MM-DD string (or pass through a date)."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value), '%Y-%m-%d').date()
+
+
+def split_date_range(start_date, end_date, shard_by: str = SHARD_MONTH) -> List[DateWindow]:
+    """
+    Split an inclusive date range into consecutive windows.
+
+    Month windows follow calendar months, week windows start on Mondays;
+    the first and last window are clipped to the range.
+
+    Args:
+        start_date: Range start (YYYY-MM-DD or date)
+        end_date: Range end, inclusive (YYYY-MM-DD or date)
+        shard_by: SHARD_MONTH or SHARD_WEEK
+
+    Returns:
+        List of (start, end) pairs in YYYY-MM-DD format
+    """
+    start, end = _parse_date(start_date), _parse_date(end_date)
+    if start > end:
+        return []
+
+    windows = []
+    current = start
+    while current <= end:
+        if shard_by == SHARD_WEEK:
+            window_end = current + timedelta(days=6 - current.weekday())
+        elif shard_by == SHARD_MONTH:
+            next_month = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+            window_end = next_month - timedelta(days=1)
+        else:
+            raise ValueError(f"Unknown shard size: {shard_by}")
+
+        window_end = min(window_end, end)
+        windows.append((current.isoformat(), window_end.isoformat()))
+        current = window_end + timedelta(days=1)
+
+    return windows
+
+
+def record_id(record: Dict) -> Optional[Any]:
+    """Return the id of a Personio record (top level or in its attributes)."""
+    if record.get('id') is not None:
+        return record['id']
+
+    attribute = (record.get('attributes') or {}).get('id')
+    if isinstance(attribute, dict):
+        return attribute.get('value')
+    return attribute
+
+
+def merge_window_records(pages: Iterable[List[Dict]]) -> List[Dict]:
+    """
+    Merge the records of all windows, keeping the first occurrence of each id.
+
+    Records without id are always kept.
+
+    Args:
+        pages: Record lists of the windows, in window order
+
+    Returns:
+        Merged record list
+    """
+    seen = set()
+    merged = []
+    for records in pages:
+        for record in records:
+            key = record_id(record)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(record)
+    return merged
+
+
+def fetch_sharded(fetch_window: Callable[[DateWindow], Tuple[Optional[List], Optional[str]]],
+                  windows: List[DateWindow], max_workers: int = SHARD_MAX_WORKERS,
+                  retries: int = SHARD_RETRIES) -> Tuple[Optional[List], Optional[str]]:
+    """
+    Fetch all windows in parallel, retry failed windows on their own and merge.
+
+    Args:
+        fetch_window: Called with a (start, end) window, returns (records, error)
+        windows: Windows from split_date_range
+        max_workers: Windows fetched concurrently
+        retries: Additional attempts per failed window
+
+    Returns:
+        Tuple of (merged records, error) - the error names windows that still
+        failed after all retries
+    """
+    results = list(ordered_map(fetch_window, windows, max_workers))
+
+    failed = []
+    for position, (window, (records, error)) in enumerate(zip(windows, results)):
+        for _ in range(retries):
+            if not error:
+                break
+            records, error = fetch_window(window)
+        results[position] = (records, error)
+        if error:
+            failed.append(f"{window[0]} bis {window[1]}: {error}")
+
+    if failed:
+        return None, f"Zeitraum konnte nicht vollständig abgerufen werden ({'; '.join(failed)})"
+
+    return merge_window_records(records for records, _ in results), None
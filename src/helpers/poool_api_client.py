@@ -5,11 +5,39 @@ A centralized API client for the Poool CRM that handles authentication,
 base URL management, and common API operations.
 """
 
+import time
 import requests
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from urllib.parse import urlparse
 
+from .request_metrics import RequestMetrics, get_request_metrics
+
+
+def resolve_base_url(environment: str = "production", custom_url: Optional[str] = None) -> str:
+    """
+    Return the API base URL of an environment.
+
+    Args:
+        environment: "production", "staging", or "custom"
+        custom_url: Custom base URL when environment is "custom"
+
+    Returns:
+        Base URL ending with /api/2
+    """
+    if environment == "staging":
+        return "https://staging-app.poool.rocks/api/2"
+    elif environment == "custom" and custom_url:
+        # Ensure custom URL ends with /api/2 if not already present
+        if not custom_url.endswith('/api/2'):
+            if custom_url.endswith('/'):
+                return f"{custom_url}api/2"
+            else:
+                return f"{custom_url}/api/2"
+        return custom_url
+    else:  # production (default)
+        return "https://app.poool.cc/api/2"
+
 
 class PooolAPIClient:
     """
@@ -37,21 +65,27 @@ class PooolAPIClient:
             "Content-Type": "application/json",
             "Accept": "application/json"
         }
+        self._metrics = get_request_metrics(self._base_url)
 
     def _get_base_url(self) -> str:
         """Get the appropriate base URL for the configured environment."""
-        if self.environment == "staging":
-            return "https://staging-app.poool.rocks/api/2"
-        elif self.environment == "custom" and self.custom_url:
-            # Ensure custom URL ends with /api/2 if not already present
-            if not self.custom_url.endswith('/api/2'):
-                if self.custom_url.endswith('/'):
-                    return f"{self.custom_url}api/2"
-                else:
-                    return f"{self.custom_url}/api/2"
-            return self.custom_url
-        else:  # production (default)
-            return "https://app.poool.cc/api/2"
+        return resolve_base_url(self.environment, self.custom_url)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request and record its latency in the request metrics."""
+        started = time.perf_counter()
+        status_code = None
+        try:
+            response = requests.request(method, url, **kwargs)
+            status_code = response.status_code
+            return response
+        finally:
+            self._metrics.record(method, status_code, time.perf_counter() - started)
+
+    @property
+    def metrics(self) -> RequestMetrics:
+        """Latency metrics of the requests sent to this client's base URL."""
+        return self._metrics
 
     @property
     def base_url(self) -> str:
@@ -124,7 +158,7 @@ class PooolAPIClient:
     def test_connection(self) -> Tuple[bool, str]:
         """Test API connection by trying to fetch contact types."""
         try:
-            response = requests.get(f"{self._base_url}/contact_types", headers=self._headers, timeout=10)
+            response = self._request("GET", f"{self._base_url}/contact_types", headers=self._headers, timeout=10)
 
             if response.status_code == 200:
                 return True, "Verbindung erfolgreich"
@@ -156,10 +190,10 @@ class PooolAPIClient:
                 'per_page': 5  # Limit results for performance
             }
 
-            response = requests.get(f"{self._base_url}/companies",
-                                  headers=self._headers,
-                                  params=params,
-                                  timeout=30)
+            response = self._request("GET", f"{self._base_url}/companies",
+                                     headers=self._headers,
+                                     params=params,
+                                     timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -192,10 +226,10 @@ class PooolAPIClient:
             company_data["type"] = "company"
             payload = {"data": company_data}
 
-            response = requests.post(f"{self._base_url}/companies",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("POST", f"{self._base_url}/companies",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "company")
 
@@ -208,10 +242,10 @@ class PooolAPIClient:
             # Wrap in data object (same pattern as companies)
             payload = {"data": person_data}
 
-            response = requests.post(f"{self._base_url}/persons",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("POST", f"{self._base_url}/persons",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "person")
 
@@ -237,7 +271,7 @@ class PooolAPIClient:
                 url = f"{self._base_url}/countries"
                 params = {"page": page}
 
-                response = requests.get(url, headers=self._headers, params=params, timeout=30)
+                response = self._request("GET", url, headers=self._headers, params=params, timeout=30)
 
                 if response.status_code != 200:
                     return {}, f"Fehler beim Abrufen der Länder: {response.status_code} - {response.text}"
@@ -309,7 +343,7 @@ class PooolAPIClient:
                 }
             }
 
-            response = requests.post(url, headers=self._headers, json=country_data, timeout=30)
+            response = self._request("POST", url, headers=self._headers, json=country_data, timeout=30)
 
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -340,7 +374,7 @@ class PooolAPIClient:
                 url = f"{self._base_url}/tags"
                 params = {"page": page}
 
-                response = requests.get(url, headers=self._headers, params=params)
+                response = self._request("GET", url, headers=self._headers, params=params)
 
                 if response.status_code != 200:
                     return {}, f"Fehler beim Abrufen der Tags: {response.status_code} - {response.text}"
@@ -415,7 +449,7 @@ class PooolAPIClient:
                 }
             }
 
-            response = requests.post(url, headers=self._headers, json=tag_data)
+            response = self._request("POST", url, headers=self._headers, json=tag_data)
 
             if response.status_code in [200, 201]:
                 result = response.json()
@@ -437,10 +471,10 @@ class PooolAPIClient:
             company_data["type"] = "company"
             payload = {"data": company_data}
 
-            response = requests.put(f"{self._base_url}/companies/{company_id}",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("PUT", f"{self._base_url}/companies/{company_id}",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "company")
 
@@ -452,10 +486,10 @@ class PooolAPIClient:
         try:
             payload = {"data": client_data}
 
-            response = requests.put(f"{self._base_url}/clients/{client_id}",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("PUT", f"{self._base_url}/clients/{client_id}",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "client")
 
@@ -467,10 +501,10 @@ class PooolAPIClient:
         try:
             payload = {"data": supplier_data}
 
-            response = requests.put(f"{self._base_url}/suppliers/{supplier_id}",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("PUT", f"{self._base_url}/suppliers/{supplier_id}",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "supplier")
 
@@ -484,9 +518,9 @@ class PooolAPIClient:
         """
         try:
             # First, fetch number_range_groups to find the right group
-            groups_response = requests.get(f"{self._base_url}/number_range_groups",
-                                          headers=self._headers,
-                                          timeout=30)
+            groups_response = self._request("GET", f"{self._base_url}/number_range_groups",
+                                            headers=self._headers,
+                                            timeout=30)
 
             if groups_response.status_code != 200:
                 return None, f"Failed to fetch number range groups: HTTP {groups_response.status_code}"
@@ -505,9 +539,9 @@ class PooolAPIClient:
                 return None, f"No number range group found for type: {for_type}"
 
             # Now fetch number_ranges and filter by group
-            response = requests.get(f"{self._base_url}/number_ranges",
-                                   headers=self._headers,
-                                   timeout=30)
+            response = self._request("GET", f"{self._base_url}/number_ranges",
+                                     headers=self._headers,
+                                     timeout=30)
 
             if response.status_code != 200:
                 return None, f"Failed to fetch number ranges: HTTP {response.status_code}"
@@ -547,10 +581,10 @@ class PooolAPIClient:
                 client_data["number_unique"] = client_data["number"]
 
             payload = {"data": client_data}
-            response = requests.post(f"{self._base_url}/clients",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("POST", f"{self._base_url}/clients",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
             return self._handle_api_response(response, "client")
         except Exception as e:
             return None, f"Fehler beim Erstellen des Kunden: {str(e)}"
@@ -565,10 +599,10 @@ class PooolAPIClient:
                 supplier_data["number_range_id"] = number_range_id
 
             payload = {"data": supplier_data}
-            response = requests.post(f"{self._base_url}/suppliers",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("POST", f"{self._base_url}/suppliers",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
             return self._handle_api_response(response, "supplier")
         except Exception as e:
             return None, f"Fehler beim Erstellen des Lieferanten: {str(e)}"
@@ -578,10 +612,10 @@ class PooolAPIClient:
         try:
             payload = {"data": person_data}
 
-            response = requests.put(f"{self._base_url}/persons/{person_id}",
-                                   headers=self._headers,
-                                   json=payload,
-                                   timeout=30)
+            response = self._request("PUT", f"{self._base_url}/persons/{person_id}",
+                                     headers=self._headers,
+                                     json=payload,
+                                     timeout=30)
 
             return self._handle_api_response(response, "person")
 
@@ -591,9 +625,9 @@ class PooolAPIClient:
     def get_company_by_id(self, company_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get a specific company by ID."""
         try:
-            response = requests.get(f"{self._base_url}/companies/{company_id}",
-                                   headers=self._headers,
-                                   timeout=30)
+            response = self._request("GET", f"{self._base_url}/companies/{company_id}",
+                                     headers=self._headers,
+                                     timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -612,10 +646,10 @@ class PooolAPIClient:
             # Use search parameter for flexible searching
             params = {'search': value, 'per_page': 10}
 
-            response = requests.get(f"{self._base_url}/companies",
-                                  headers=self._headers,
-                                  params=params,
-                                  timeout=30)
+            response = self._request("GET", f"{self._base_url}/companies",
+                                     headers=self._headers,
+                                     params=params,
+                                     timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -629,9 +663,9 @@ class PooolAPIClient:
     def get_person_by_id(self, person_id: int) -> Tuple[Optional[Dict], Optional[str]]:
         """Get a specific person by ID."""
         try:
-            response = requests.get(f"{self._base_url}/persons/{person_id}",
-                                   headers=self._headers,
-                                   timeout=30)
+            response = self._request("GET", f"{self._base_url}/persons/{person_id}",
+                                     headers=self._headers,
+                                     timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -650,10 +684,10 @@ class PooolAPIClient:
             # Use search parameter for flexible searching
             params = {'search': value, 'per_page': 10}
 
-            response = requests.get(f"{self._base_url}/persons",
-                                  headers=self._headers,
-                                  params=params,
-                                  timeout=30)
+            response = self._request("GET", f"{self._base_url}/persons",
+                                     headers=self._headers,
+                                     params=params,
+                                     timeout=30)
 
             if response.status_code == 200:
                 data = response.json()
@@ -688,12 +722,10 @@ class PooolAPIClient:
 
         try:
             while True:
-                response = requests.get(
-                    f"{self._base_url}/companies",
-                    headers=self._headers,
-                    params={"page": page, "per_page": 100},
-                    timeout=30
-                )
+                response = self._request("GET", f"{self._base_url}/companies",
+                                         headers=self._headers,
+                                         params={"page": page, "per_page": 100},
+                                         timeout=30)
 
                 if response.status_code != 200:
                     return [], f"Fehler beim Abrufen der Firmen: HTTP {response.status_code}"
@@ -718,6 +750,48 @@ class PooolAPIClient:
         except Exception as e:
             return [], f"Fehler beim Abrufen aller Firmen: {str(e)}"
 
+    def get_all_persons(self) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch ALL persons with automatic pagination handling.
+
+        Returns:
+            Tuple of (persons_list, error_message)
+                persons_list: List of person dictionaries
+                error_message: None if successful, error string otherwise
+        """
+        persons = []
+        page = 1
+
+        try:
+            while True:
+                response = self._request("GET", f"{self._base_url}/persons",
+                                         headers=self._headers,
+                                         params={"page": page, "per_page": 100},
+                                         timeout=30)
+
+                if response.status_code != 200:
+                    return [], f"Fehler beim Abrufen der Personen: HTTP {response.status_code}"
+
+                data = response.json()
+                page_persons = data.get('data', [])
+
+                if not page_persons:
+                    break
+
+                persons.extend(page_persons)
+
+                # Check if there's a next page
+                links = data.get('links', {})
+                if not links.get('next'):
+                    break
+
+                page += 1
+
+            return persons, None
+
+        except Exception as e:
+            return [], f"Fehler beim Abrufen aller Personen: {str(e)}"
+
     def find_similar_companies_by_name(
         self,
         search_name: str,
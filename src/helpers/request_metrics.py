@@ -0,0 +1,109 @@
+"""
+Request latency metrics for API clients.
+
+Every request sent by a PooolAPIClient is timed and recorded in a
+thread-safe rolling window per API base URL, so latencies of staging, custom
+and production environments do not mix. Planning code (e.g. the pre-flight
+request budget of imports) uses the recent latencies to estimate run durations.
+"""
+
+import threading
+from collections import deque
+from statistics import median
+from typing import Deque, Dict, Optional, Tuple
+
+# Number of recent requests kept for latency statistics
+METRICS_WINDOW = 500
+
+
+class RequestMetrics:
+    """
+    Thread-safe rolling window of request latencies.
+
+    Each sample holds the HTTP method, the status code (None for requests that
+    raised) and the elapsed time in seconds.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW):
+        """
+        Create an empty metrics window.
+
+        Args:
+            window: Number of most recent requests to keep
+        """
+        self._samples: Deque[Tuple[str, Optional[int], float]] = deque(maxlen=window)
+        self._total_requests = 0
+        self._lock = threading.Lock()
+
+    def record(self, method: str, status_code: Optional[int], elapsed: float) -> None:
+        """Record a single request."""
+        with self._lock:
+            self._samples.append((method.upper(), status_code, elapsed))
+            self._total_requests += 1
+
+    def recent_latency(self, method: Optional[str] = None) -> Optional[float]:
+        """
+        Median latency of the recent requests.
+
+        Args:
+            method: Only consider requests with this HTTP method (e.g. "POST")
+
+        Returns:
+            Median latency in seconds, or None if no matching requests were recorded
+        """
+        with self._lock:
+            latencies = [elapsed for m, _, elapsed in self._samples if method is None or m == method.upper()]
+        return median(latencies) if latencies else None
+
+    def summary(self) -> Dict:
+        """
+        Summarize the recorded requests.
+
+        Returns:
+            Dict with 'total_requests' (since creation), 'window' (samples kept),
+            'errors' (status >= 400 or no response), 'median_latency' and
+            'median_latency_by_method'
+        """
+        with self._lock:
+            samples = list(self._samples)
+            total = self._total_requests
+
+        by_method: Dict[str, list] = {}
+        for method, _, elapsed in samples:
+            by_method.setdefault(method, []).append(elapsed)
+
+        return {
+            'total_requests': total,
+            'window': len(samples),
+            'errors': sum(1 for _, status, _ in samples if status is None or status >= 400),
+            'median_latency': median(e for _, _, e in samples) if samples else None,
+            'median_latency_by_method': {m: median(values) for m, values in by_method.items()},
+        }
+
+    def reset(self) -> None:
+        """Drop all recorded requests."""
+        with self._lock:
+            self._samples.clear()
+            self._total_requests = 0
+
+
+# Shared by all clients of the process with the same base URL (clients are created per operation)
+_metrics_by_base_url: Dict[str, RequestMetrics] = {}
+_metrics_lock = threading.Lock()
+
+
+def get_request_metrics(base_url: str) -> RequestMetrics:
+    """
+    Return the request metrics of an API base URL (created on first use).
+
+    Args:
+        base_url: API base URL of the client (e.g. PooolAPIClient.base_url)
+
+    Returns:
+        RequestMetrics shared by all clients of that base URL
+    """
+    key = base_url.rstrip('/')
+    with _metrics_lock:
+        if key not in _metrics_by_base_url:
+            _metrics_by_base_url[key] = RequestMetrics()
+        return _metrics_by_base_url[key]
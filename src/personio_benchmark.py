@@ -0,0 +1,136 @@
+"""
+End-to-end benchmark of the Personio pipeline against the local mock server.
+
+Fetches employees, absences and attendances (pagination, sharding, rate
+limiting, retries), flattens them into DataFrames and exports them as CSV
+and Excel, timing each stage:
+
+    python -m src.personio_benchmark --employees 1000 --latency 0.05
+    python -m src.personio_benchmark --url http://127.0.0.1:8765 --shard-by week
+
+Without --url a mock server with the given scale is started in-process.
+"""
+
+import argparse
+import io
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional
+
+import pandas as pd
+
+from src.helpers.personio import (
+    PersonioAPIClient,
+    process_employees_data,
+    process_absences_data,
+    process_attendances_data,
+    SHARD_MONTH,
+    SHARD_WEEK,
+)
+from src.helpers.personio.api_client import PERSONIO_REQUESTS_PER_SECOND
+from src.helpers.personio.mock_server import MockPersonioServer, add_mock_arguments, config_from_args
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (mock scale and behavior plus benchmark options)."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.personio_benchmark",
+        description="Personio-Abruf, Aufbereitung und Export gegen den lokalen Mock messen"
+    )
+    parser.add_argument("--url", default=None, help="Laufender Mock-Server (Standard: eigenen Mock starten)")
+    parser.add_argument("--shard-by", default=SHARD_MONTH, choices=[SHARD_MONTH, SHARD_WEEK, "none"],
+                        help=f"Zeitfenster für Abwesenheiten und Anwesenheiten (Standard: {SHARD_MONTH})")
+    parser.add_argument("--client-rate", type=float, default=PERSONIO_REQUESTS_PER_SECOND,
+                        help=f"Anfragen pro Sekunde des Clients (Standard: {PERSONIO_REQUESTS_PER_SECOND})")
+    parser.add_argument("--skip-export", action="store_true", help="CSV-/Excel-Export nicht messen")
+    add_mock_arguments(parser)
+    return parser
+
+
+def _timed(func: Callable):
+    """Run func and return (result, seconds)."""
+    started = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - started
+
+
+def _export_seconds(df: pd.DataFrame) -> float:
+    """Seconds to export a DataFrame as CSV and Excel (in memory)."""
+    def export():
+        df.to_csv(index=False)
+        with pd.ExcelWriter(io.BytesIO(), engine='xlsxwriter',
+                            engine_kwargs={'options': {'nan_inf_to_errors': True}}) as writer:
+            df.to_excel(writer, index=False, sheet_name='Data')
+
+    return _timed(export)[1]
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the benchmark from parsed arguments.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    server = None
+    if args.url:
+        base_url = args.url
+    else:
+        server, setup_seconds = _timed(lambda: MockPersonioServer(config_from_args(args)))
+        base_url = server.start()
+        counts = ", ".join(f"{len(records):,} {name}" for name, records in server.data.items())
+        print(f"Mock gestartet auf {base_url} ({counts}, {setup_seconds:.1f} s)", file=sys.stderr)
+
+    try:
+        client = PersonioAPIClient("benchmark", "benchmark", base_url=base_url,
+                                   requests_per_second=args.client_rate)
+        _, _, error = client.authenticate()
+        if error:
+            print(f"Fehler: Authentifizierung am Mock fehlgeschlagen: {error}", file=sys.stderr)
+            return 1
+
+        start_date = args.start_date
+        end_date = (datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=args.days - 1)).strftime("%Y-%m-%d")
+        shard_by = None if args.shard_by == "none" else args.shard_by
+
+        datasets = [
+            ("Mitarbeiter", client.get_employees, process_employees_data),
+            ("Abwesenheiten", lambda: client.get_absences(start_date, end_date, shard_by), process_absences_data),
+            ("Anwesenheiten", lambda: client.get_attendances(start_date, end_date, shard_by), process_attendances_data),
+        ]
+
+        print(f"{'Datensatz':<14} {'Zeilen':>8} {'Abruf':>8} {'Anfr./s':>8} {'Wdh.':>5} "
+              f"{'Warten':>8} {'Aufber.':>8} {'Export':>8}")
+        for label, fetch, process in datasets:
+            (data, error), fetch_seconds = _timed(fetch)
+            if error:
+                print(f"Fehler beim Abruf ({label}): {error}", file=sys.stderr)
+                return 1
+            stats = client.pull_stats()
+
+            (df, _, error), process_seconds = _timed(lambda: process(data))
+            if error:
+                print(f"Fehler bei der Aufbereitung ({label}): {error}", file=sys.stderr)
+                return 1
+
+            export = "-" if args.skip_export else f"{_export_seconds(df):.2f} s"
+            print(f"{label:<14} {len(df):>8,} {fetch_seconds:>6.2f} s {stats['requests_per_second']:>8.1f} "
+                  f"{stats['retries']:>5} {stats['wait_seconds']:>6.2f} s {process_seconds:>6.2f} s {export:>8}")
+    finally:
+        if server:
+            server.stop()
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Error classification of CRM client messages (see result_store.classify_error).
+
+The network failures below are the texts of real requests/urllib3 exceptions
+as embedded by PooolAPIClient; they contain numbers (ports, errno) that must
+not be read as HTTP status codes.
+"""
+
+import pytest
+
+pytest.importorskip("pyarrow")
+pytest.importorskip("requests")
+
+from src.helpers.crm.result_store import (  # noqa: E402
+    ERROR_CLASS_PERMANENT,
+    ERROR_CLASS_TRANSIENT,
+    ERROR_CLASS_UNCERTAIN,
+    classify_error,
+    extract_error_code,
+)
+
+READ_TIMEOUT = "HTTPSConnectionPool(host='app.poool.cc', port=443): Read timed out. (read timeout=30)"
+CONNECT_TIMEOUT = (
+    "HTTPSConnectionPool(host='app.poool.cc', port=443): Max retries exceeded with url: /api/v1/persons "
+    "(Caused by ConnectTimeoutError(<urllib3.connection.HTTPSConnection object at 0x7f3a2c1d5e50>, "
+    "'Connection to app.poool.cc timed out. (connect timeout=30)'))"
+)
+CONNECTION_REFUSED = (
+    "HTTPSConnectionPool(host='app.poool.cc', port=443): Max retries exceeded with url: /api/v1/companies "
+    "(Caused by NewConnectionError('<urllib3.connection.HTTPSConnection object at 0x7f3a2c1d5e50>: "
+    "Failed to establish a new connection: [Errno 111] Connection refused'))"
+)
+NETWORK_FAILURES = [READ_TIMEOUT, CONNECT_TIMEOUT, CONNECTION_REFUSED]
+
+
+@pytest.mark.parametrize("exception_text", NETWORK_FAILURES)
+def test_network_failures_have_no_status_code(exception_text):
+    assert extract_error_code(f"Fehler beim Aktualisieren der Firma: {exception_text}") is None
+
+
+@pytest.mark.parametrize("exception_text", NETWORK_FAILURES)
+def test_update_network_failures_are_transient(exception_text):
+    message = f"Fehler beim Aktualisieren der Firma: {exception_text}"
+    assert classify_error(message) == ERROR_CLASS_TRANSIENT
+
+
+@pytest.mark.parametrize("message", [
+    f"Company creation failed: Fehler beim Erstellen der Firma: {READ_TIMEOUT}",
+    f"Company creation failed: Fehler beim Erstellen der Firma: {CONNECTION_REFUSED}",
+    f"Fehler beim Erstellen der Person: {CONNECT_TIMEOUT}",
+])
+def test_create_network_failures_are_uncertain(message):
+    assert classify_error(message, create=True) == ERROR_CLASS_UNCERTAIN
+
+
+@pytest.mark.parametrize("message, code", [
+    ("Serverfehler (500): Internal Server Error", 500),
+    ("API-Fehler (502): Bad Gateway", 502),
+    ("HTTP 504: Unbekannter Fehler", 504),
+    ("Ungültige Anfrage (422): Ungültiges Datenformat", 422),
+    ("Fehler beim Abrufen der Tags: 503 - Service Unavailable", 503),
+    ("Validierungsfehler: name: The name field is required.", 422),
+    ("Ratenlimit überschritten: Bitte warten Sie, bevor Sie es erneut versuchen", 429),
+])
+def test_status_codes_from_client_messages(message, code):
+    assert extract_error_code(message) == code
+
+
+@pytest.mark.parametrize("message", [
+    "Company creation failed: Serverfehler (500): Internal Server Error",
+    "Company creation failed: API-Fehler (502): Bad Gateway",
+    "Fehler beim Erstellen der Person: HTTP 504: Unbekannter Fehler",
+])
+def test_create_server_errors_are_uncertain(message):
+    assert classify_error(message, create=True) == ERROR_CLASS_UNCERTAIN
+
+
+def test_create_rate_limit_is_transient():
+    message = "Company creation failed: Ratenlimit überschritten: Bitte warten Sie, bevor Sie es erneut versuchen"
+    assert classify_error(message, create=True) == ERROR_CLASS_TRANSIENT
+
+
+def test_update_server_error_is_transient():
+    assert classify_error("API-Fehler (502): Bad Gateway") == ERROR_CLASS_TRANSIENT
+
+
+def test_validation_error_is_permanent():
+    assert classify_error("Validierungsfehler: email: The email must be valid.", create=True) == ERROR_CLASS_PERMANENT
+
+
+def test_no_error_has_no_class():
+    assert classify_error(None) is None
+    assert classify_error("") is None